@@ -1,32 +1,74 @@
-def display_intro():
-    intro_text = """
+import functools
+from utils.constants import INTRO_BANNER
+from utils.render import terminal_width, write_screen
 
-**********************************************************************************************************************************************************************    
+CLEAR_SCREEN = "\x1b[H\x1b[2J"  # home the cursor and clear, without forking `clear`
 
-                             ___                    ___                    ___                                         ___                    ___     
-                            /\__\                  /\  \                  /\  \                                       /\  \                  /\  \    
-      ___                  /:/ _/_                /::\  \                |::\  \                ___                   \:\  \                /::\  \   
-     /\__\                /:/ /\__\              /:/\:\__\               |:|:\  \              /\__\                   \:\  \              /:/\:\  \  
-    /:/  /               /:/ /:/ _/_            /:/ /:/  /             __|:|\:\  \            /:/__/               _____\:\  \            /:/ /::\  \ 
-   /:/__/               /:/_/:/ /\__\          /:/_/:/__/___          /::::|_\:\__\          /::\  \              /::::::::\__\          /:/_/:/\:\__\ 
+FULL_BANNER = r"""
+
+**********************************************************************************************************************************************************************
+
+                             ___                    ___                    ___                                         ___                    ___
+                            /\__\                  /\  \                  /\  \                                       /\  \                  /\  \
+      ___                  /:/ _/_                /::\  \                |::\  \                ___                   \:\  \                /::\  \
+     /\__\                /:/ /\__\              /:/\:\__\               |:|:\  \              /\__\                   \:\  \              /:/\:\  \
+    /:/  /               /:/ /:/ _/_            /:/ /:/  /             __|:|\:\  \            /:/__/               _____\:\  \            /:/ /::\  \
+   /:/__/               /:/_/:/ /\__\          /:/_/:/__/___          /::::|_\:\__\          /::\  \              /::::::::\__\          /:/_/:/\:\__\
   /::\  \               \:\/:/ /:/  /          \:\/:::::/  /          \:\~~\  \/__/          \/\:\  \__           \:\~~\~~\/__/          \:\/:/  \/__/
- /:/\:\  \               \::/_/:/  /            \::/~~/~~~~            \:\  \                 ~~\:\/\__\           \:\  \                 \::/__/     
- \/__\:\  \               \:\/:/  /              \:\~~\                 \:\  \                   \::/  /            \:\  \                 \:\  \     
-      \:\__\               \::/  /                \:\__\                 \:\__\                  /:/  /              \:\__\                 \:\__\    
-       \/__/                \/__/                  \/__/                  \/__/                  \/__/                \/__/                  \/__/    
+ /:/\:\  \               \::/_/:/  /            \::/~~/~~~~            \:\  \                 ~~\:\/\__\           \:\  \                 \::/__/
+ \/__\:\  \               \:\/:/  /              \:\~~\                 \:\  \                   \::/  /            \:\  \                 \:\  \
+      \:\__\               \::/  /                \:\__\                 \:\__\                  /:/  /              \:\__\                 \:\__\
+       \/__/                \/__/                  \/__/                  \/__/                  \/__/                \/__/                  \/__/
+
+
 
-       
-       
 **********************************************************************************************************************************************************************
 
 
-Welcome to Termina!
+"""
+
+# For terminals narrower than the full banner
+COMPACT_BANNER = r"""
+ _____                   _
+|_   _|__ _ __ _ __ ___ (_)_ __   __ _
+  | |/ _ \ '__| '_ ` _ \| | '_ \ / _` |
+  | |  __/ |  | | | | | | | | | | (_| |
+  |_|\___|_|  |_| |_| |_|_|_| |_|\__,_|
+
+"""
+
+WELCOME = """Welcome to Termina!
 
 Your personal Unix-style shell for seamless music playback.
  -----------------------------------------
  Type 'help' to see available commands.
-    """
-    print(intro_text)
+
+"""
+
+
+def _width(block):
+    return max(len(line.rstrip()) for line in block.splitlines())
+
+
+@functools.lru_cache(maxsize=8)
+def render_intro(width, banner=INTRO_BANNER):
+    # The intro screen for a terminal `width` columns wide. "auto" picks the
+    # widest banner that fits, and no banner at all below the compact one.
+    if banner == "auto":
+        if width > _width(FULL_BANNER):
+            banner = "full"
+        elif width > _width(COMPACT_BANNER):
+            banner = "compact"
+    if banner == "full":
+        return FULL_BANNER + WELCOME
+    if banner == "compact":
+        return COMPACT_BANNER + WELCOME
+    return "\n" + WELCOME
+
+
+def display_intro(clear=False):
+    # Sent as one write, together with the clear sequence when there is one
+    write_screen((CLEAR_SCREEN if clear else "") + render_intro(terminal_width(), INTRO_BANNER))
 
 if __name__ == "__main__":
     display_intro()
@@ -0,0 +1,45 @@
+"""
+Compare sequential vs. fanned-out listing requests against a slow stub API.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_fanout [--latency 0.05] [--rounds 20]
+"""
+
+import argparse
+import time
+
+import utils.api as api
+from benchmarks.stub_server import start_stub_server
+
+
+def _time_rounds(rounds, fn):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="artificial per-request latency (s)")
+    parser.add_argument("--rounds", type=int, default=20, help="iterations per mode")
+    parser.add_argument("--library-size", type=int, default=500, help="synthetic library size")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(library_size=args.library_size, latency=args.latency)
+    api._client = api.ApiClient(base_url=base_url)
+    try:
+        sequential = _time_rounds(args.rounds, lambda: (api.get_all_songs(), api.current_song()))
+        concurrent = _time_rounds(args.rounds, lambda: api.fetch_concurrently(api.get_all_songs, api.current_song))
+    finally:
+        api.close_client()
+        server.shutdown()
+
+    print(f"latency per request: {args.latency * 1000:.1f} ms, rounds: {args.rounds}")
+    print(f"sequential songs+current: {sequential * 1000:8.2f} ms/round")
+    print(f"concurrent songs+current: {concurrent * 1000:8.2f} ms/round")
+    print(f"speedup:                  {sequential / concurrent:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
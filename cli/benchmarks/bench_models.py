@@ -0,0 +1,116 @@
+"""
+Decode time, memory and render time of a `songs` listing as dicts vs. a SongList.
+
+Each measurement runs in a fresh interpreter so peak RSS is not inherited
+from the previous one. "dicts" is what response.json() gave the CLI before;
+the orjson rows only appear when orjson is installed.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_models [--sizes 10000 100000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.stub_server import make_library
+from commands.songs import _row
+from utils import models
+
+VARIANTS = ("dicts", "dicts+orjson", "songlist", "songlist+orjson")
+
+
+def _decoder(variant):
+    if variant.endswith("+orjson"):
+        if models.orjson is None:
+            return None
+        loads = models.orjson.loads
+    else:
+        loads = json.loads
+    if variant.startswith("songlist"):
+        return lambda content: models.SongList.from_dicts(loads(content))
+    return loads
+
+
+def _render(listing):
+    if isinstance(listing, models.SongList):
+        rows = zip(range(len(listing)), listing.titles, listing.durations, listing.artists)
+        return [_row(i, title, duration, artist, False) for i, title, duration, artist in rows]
+    return [_row(i, song["title"], song["duration"], song["artist"], False) for i, song in enumerate(listing)]
+
+
+def _peak_rss():
+    # Bytes. ru_maxrss survives exec, so it can still hold the parent's peak;
+    # the kernel's per-process high-water mark is used where there is one
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _child(variant, path):
+    # One measurement; prints a JSON result line for the parent
+    decode = _decoder(variant)
+    with open(path, "rb") as payload_file:
+        content = payload_file.read()
+    gc.collect()
+    rss_before = _peak_rss()
+    start = time.perf_counter()
+    listing = decode(content)
+    decode_ms = (time.perf_counter() - start) * 1000
+    rss_peak = _peak_rss()
+    start = time.perf_counter()
+    _render(listing)
+    render_ms = (time.perf_counter() - start) * 1000
+    del listing
+    gc.collect()
+    # Python-level allocations: what is kept, and the high-water mark while decoding
+    tracemalloc.start()
+    listing = decode(content)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(json.dumps({"decode_ms": decode_ms, "render_ms": render_ms, "retained": retained,
+                      "peak": peak, "rss_delta": rss_peak - rss_before}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--child", nargs=2, metavar=("VARIANT", "PAYLOAD"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        _child(*args.child)
+        return
+
+    variants = [variant for variant in VARIANTS if _decoder(variant) is not None]
+    print(f"{'tracks':>8} {'variant':<16} {'decode ms':>10} {'render ms':>10} "
+          f"{'kept MiB':>9} {'peak MiB':>9} {'RSS +MiB':>9}")
+    for size in args.sizes:
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as payload_file:
+            payload_file.write(json.dumps(make_library(size)).encode("utf-8"))
+        try:
+            for variant in variants:
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.bench_models", "--child", variant, payload_file.name],
+                    capture_output=True, text=True, check=True).stdout
+                result = json.loads(output.strip().splitlines()[-1])
+                print(f"{size:>8} {variant:<16} {result['decode_ms']:>10.1f} {result['render_ms']:>10.1f} "
+                      f"{result['retained'] / 2**20:>9.1f} {result['peak'] / 2**20:>9.1f} "
+                      f"{result['rss_delta'] / 2**20:>9.1f}")
+        finally:
+            os.unlink(payload_file.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Micro-benchmark for utils.sanitization.sanitize_input against the original
+multi-pass implementation.
+
+The reference implementation and the differential check that both agree on
+every input live in tests/test_sanitization.py; this only times them.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_sanitizer [--number 200]
+"""
+
+import argparse
+import timeit
+
+from tests.test_sanitization import legacy_sanitize_input
+from utils.sanitization import sanitize_input
+
+
+def benchmark(label, inputs, number):
+    for name, fn in (("legacy", legacy_sanitize_input), ("current", sanitize_input)):
+        seconds = timeit.timeit(lambda: [fn(value) for value in inputs], number=number)
+        per_call = seconds / (number * len(inputs)) * 1e6
+        print(f"{label:<22} {name:<8} {per_call:8.2f} us/call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=200, help="timing repetitions")
+    args = parser.parse_args()
+
+    benchmark("command words", ["play", "next", "current", "songs", "ls", "history"], args.number)
+    benchmark("commands with options", ["songs --page 2 --size 20", "history grep or"], args.number)
+    benchmark("hostile input", ["<script>x</script>; `rm` $(id) || 1' OR '1'='1"], args.number)
+
+
+if __name__ == "__main__":
+    main()
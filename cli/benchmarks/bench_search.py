@@ -0,0 +1,94 @@
+"""
+Build and query times of the `find` search index against a linear scan.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_search [--sizes 1000 10000 100000] [--repeat 20]
+"""
+
+import argparse
+import random
+import statistics
+import time
+
+from utils.models import SongList
+from utils.search import SearchIndex, normalize, parse_query, search_index_for
+
+SYLLABLES = ("ka", "lo", "mi", "ra", "ne", "to", "su", "vi", "an", "el", "or", "us", "da", "be", "qu")
+
+# Query text -> what it exercises
+QUERIES = {
+    "love": "one common word",
+    "midnight train": "two words",
+    "artist:kalomi": "artist filter",
+    "mindight": "typo, trigram fuzzy match",
+    "lov": "prefix",
+    "duration>5:00 love": "word + duration filter",
+}
+
+
+def make_library(size, seed=0):
+    # Titles and artists drawn from a Zipf-like vocabulary, like real tags
+    rng = random.Random(seed)
+    words = ["love", "midnight", "train", "heart", "river", "night"] + [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    artists = ["".join(rng.choice(SYLLABLES) for _ in range(3)) for _ in range(max(10, size // 50))]
+    artists[0] = "kalomi"
+    return SongList.from_dicts([
+        {
+            "title": " ".join(rng.choices(words, weights, k=rng.randint(1, 4))).title(),
+            "filePath": f"/music/{i:06d}.mp3",
+            "duration": f"{rng.randint(1, 8)}:{rng.randint(0, 59):02d}",
+            "artist": rng.choice(artists).title(),
+        }
+        for i in range(size)
+    ])
+
+
+def linear_scan(songs, text):
+    # What `songs | grep` amounts to: a substring test on every row
+    needle = normalize(text)
+    return [position for position, (title, artist) in enumerate(zip(songs.titles, songs.artists))
+            if needle in normalize(title) or needle in normalize(artist)]
+
+
+def _median_ms(fn, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=20, help="runs per query (median is reported)")
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        songs = make_library(size)
+        start = time.perf_counter()
+        index = SearchIndex(songs)
+        build_ms = (time.perf_counter() - start) * 1000
+        # A listing with 1% more songs appended extends the index in place
+        grown = songs + make_library(max(1, size // 100), seed=1)
+        search_index_for(songs)
+        start = time.perf_counter()
+        search_index_for(grown)
+        extend_ms = (time.perf_counter() - start) * 1000
+        scan_ms = _median_ms(lambda: linear_scan(songs, "love"), max(1, args.repeat // 4))
+
+        print(f"{size} tracks: build {build_ms:.0f} ms, extend by 1% {extend_ms:.1f} ms, "
+              f"linear substring scan {scan_ms:.1f} ms")
+        print(f"  {'query':<22} {'matches':>8} {'ms':>8}  what")
+        for text, description in QUERIES.items():
+            query = parse_query(text)
+            matches = index.search(query, limit=20)[0]
+            elapsed = _median_ms(lambda: index.search(query, limit=20), args.repeat)
+            print(f"  {text:<22} {matches:>8} {elapsed:>8.2f}  {description}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Cold-start import report for the Termina CLI, in the style of `python -X importtime`.
+
+Imports termina_cli in fresh interpreters (the work done before the first
+`Termina>` prompt, minus the banner), reports the median wall time, the
+heaviest modules by cumulative import time, and whether `requests` was loaded.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_startup [--runs 10] [--top 15]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+CLI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_import(extra_flags=()):
+    # Run from a scratch directory so the log file the CLI creates lands there
+    env = dict(os.environ, PYTHONPATH=CLI_DIR)
+    with tempfile.TemporaryDirectory() as scratch:
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, *extra_flags, "-c", "import termina_cli"],
+            cwd=scratch, env=env, capture_output=True, text=True, check=True,
+        )
+        return time.perf_counter() - start, result.stderr
+
+
+def parse_importtime(stderr):
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules.append((name.strip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="interpreter launches to time")
+    parser.add_argument("--top", type=int, default=15, help="modules to list")
+    args = parser.parse_args()
+
+    baseline = statistics.median(_time_bare_interpreter() for _ in range(args.runs))
+    timings = [_run_import()[0] for _ in range(args.runs)]
+    _, stderr = _run_import(("-X", "importtime"))
+    modules = parse_importtime(stderr)
+
+    print(f"bare interpreter:     {baseline * 1000:7.1f} ms (median of {args.runs})")
+    print(f"import termina_cli:   {statistics.median(timings) * 1000:7.1f} ms (median of {args.runs})")
+    print(f"requests imported:    {'yes' if any(name == 'requests' for name, _, _ in modules) else 'no'}")
+    print(f"\n{'cumulative us':>14} {'self us':>9}  module")
+    for name, self_us, cumulative_us in sorted(modules, key=lambda m: m[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us:>14} {self_us:>9}  {name}")
+
+
+def _time_bare_interpreter():
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    main()
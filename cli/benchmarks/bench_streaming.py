@@ -0,0 +1,57 @@
+"""
+Time-to-first-page and peak memory of `songs --page 1` vs. a full listing.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.bench_streaming [--sizes 1000 10000 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from itertools import islice
+
+import utils.api as api
+from benchmarks.stub_server import start_stub_server
+from utils.constants import SONGS_PAGE_SIZE
+
+
+def _measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def _first_page_streamed():
+    stream = api.iter_songs()
+    try:
+        return list(islice(stream, SONGS_PAGE_SIZE))
+    finally:
+        stream.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'tracks':>8} {'full ms':>9} {'full KiB':>9} {'page1 ms':>9} {'page1 KiB':>10}")
+    for size in args.sizes:
+        server, base_url = start_stub_server(library_size=size)
+        # No cache, so both modes hit the network every time
+        api._client = api.ApiClient(base_url=base_url)
+        try:
+            full_time, full_peak = _measure(lambda: api.send_request("songs")[:SONGS_PAGE_SIZE])
+            page_time, page_peak = _measure(_first_page_streamed)
+        finally:
+            api.close_client()
+            server.shutdown()
+        print(f"{size:>8} {full_time * 1000:>9.1f} {full_peak / 1024:>9.0f} "
+              f"{page_time * 1000:>9.1f} {page_peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+Load generator for the Music API: throughput, latency percentiles and errors.
+
+Drives a weighted mix of the CLI's own API calls (utils.api) from a pool of
+worker threads. Without --url it starts the bundled stub server, so the tool
+can be exercised without the .NET backend.
+
+Usage (from the cli/ directory):
+    python -m benchmarks.loadgen [--concurrency 8] [--duration 10]
+        [--mix current=50,songs=15,list=15,next=10,play=10]
+        [--url http://localhost:5000/api/Music] [--output run.json] [--compare base.json]
+"""
+
+import argparse
+import datetime
+import json
+import random
+import threading
+import time
+
+import utils.api as api
+from benchmarks.stub_server import start_stub_server
+from utils.metrics import LatencyHistogram, metrics
+from utils.output import capture
+
+# Load generator operation -> the CLI helper that issues it
+OPERATIONS = {
+    "play": api.play,
+    "pause": api.pause,
+    "stop": api.stop,
+    "next": api.next_song,
+    "previous": api.previous_song,
+    "current": api.fetch_current_song,
+    "songs": api.get_all_songs,
+    "list": api.list_songs,
+}
+
+DEFAULT_MIX = "current=50,songs=15,list=15,next=10,play=10"
+
+
+def parse_mix(text):
+    # "current=50,songs=10" -> (["current", "songs"], [50.0, 10.0])
+    names, weights = [], []
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"unknown operation '{name}' (choose from {', '.join(OPERATIONS)})")
+        try:
+            weight = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"weight for '{name}' must be a number")
+        if weight < 0:
+            raise argparse.ArgumentTypeError(f"weight for '{name}' must not be negative")
+        names.append(name)
+        weights.append(weight)
+    if not any(weights):
+        raise argparse.ArgumentTypeError("the mix needs at least one positive weight")
+    return names, weights
+
+
+def _worker(seed, mix, deadline, budget, stop_event):
+    names, weights = mix
+    rng = random.Random(seed)
+    calls = [OPERATIONS[name] for name in names]
+    # Error messages printed by the API layer are counted through the metrics
+    # registry; discard the text instead of flooding the terminal
+    with capture():
+        while not stop_event.is_set() and time.perf_counter() < deadline:
+            if budget is not None and not budget.take():
+                break
+            rng.choices(calls, weights)[0]()
+
+
+def run_load(mix, concurrency, duration, warmup=0.0, max_requests=None, seed=0):
+    """
+    Run the mix from `concurrency` workers and summarise what was recorded.
+
+    Args:
+        mix: (names, weights) as returned by parse_mix
+        concurrency: Number of worker threads, each with requests in flight one at a time
+        duration: Seconds of measured load (after warmup)
+        warmup: Seconds of load before measurement starts
+        max_requests: Stop early after this many requests in total
+        seed: Base seed for the per-worker operation choice
+
+    Returns:
+        Dict with throughput, error rate and latency percentiles, overall and per endpoint
+    """
+    stop_event = threading.Event()
+    budget = _Budget() if max_requests is not None else None
+    deadline = time.perf_counter() + warmup + duration
+    workers = [threading.Thread(target=_worker, args=(seed + i, mix, deadline, budget, stop_event), daemon=True)
+               for i in range(concurrency)]
+    for worker in workers:
+        worker.start()
+    start = None  # set when measurement begins, after the warmup
+    try:
+        time.sleep(warmup)
+        metrics.reset()
+        if budget is not None:
+            budget.limit(max_requests)  # warmup requests do not count
+        start = time.perf_counter()
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        stop_event.set()
+        for worker in workers:
+            worker.join()
+    if start is None:
+        metrics.reset()  # interrupted during the warmup: nothing was measured
+        return summarise(metrics, 0.0)
+    return summarise(metrics, time.perf_counter() - start)
+
+
+class _Budget:
+    # Request allowance shared by all workers; unlimited until limit() is called
+    def __init__(self):
+        self.remaining = None
+        self.lock = threading.Lock()
+
+    def limit(self, remaining):
+        with self.lock:
+            self.remaining = remaining
+
+    def take(self):
+        with self.lock:
+            if self.remaining is None:
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+def summarise(registry, elapsed):
+    overall = LatencyHistogram()
+    errors = 0
+    endpoints = []
+    with registry._lock:
+        series_items = sorted(registry.requests.items())
+        for (method, endpoint), series in series_items:
+            overall.merge(series.latency)
+            errors += series.errors
+            endpoints.append(dict(method=method, endpoint=endpoint,
+                                  throughput_rps=_rate(series.latency.count, elapsed),
+                                  **series.summary()))
+    total = overall.count
+    return {
+        "elapsed_s": round(elapsed, 3),
+        "requests": total,
+        "errors": errors,
+        "error_rate": round(errors / total, 4) if total else 0.0,
+        "throughput_rps": _rate(total, elapsed),
+        "latency_ms": {
+            "p50": _ms(overall.quantile(0.50)),
+            "p95": _ms(overall.quantile(0.95)),
+            "p99": _ms(overall.quantile(0.99)),
+            "max": _ms(overall.max_ms if total else None),
+            "mean": _ms(overall.total_ms / total if total else None),
+        },
+        "endpoints": endpoints,
+    }
+
+
+def _rate(count, elapsed):
+    return round(count / elapsed, 1) if elapsed > 0 else 0.0
+
+
+def _ms(value):
+    return None if value is None else round(value, 2)
+
+
+def print_report(result):
+    latency = result["latency_ms"]
+    print(f"requests: {result['requests']} in {result['elapsed_s']:.1f}s "
+          f"({result['throughput_rps']:.1f} req/s), errors: {result['errors']} "
+          f"({result['error_rate'] * 100:.2f}%)")
+    print(f"latency ms: p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    print(f"{'endpoint':<16} {'count':>8} {'req/s':>9} {'err':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for row in result["endpoints"]:
+        name = f"{row['method']} {row['endpoint']}"
+        print(f"{name:<16} {row['count']:>8} {row['throughput_rps']:>9.1f} {row['errors']:>6} "
+              f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['p99_ms']:>8}")
+
+
+def print_comparison(result, baseline):
+    # Relative change of the headline numbers against an earlier run
+    def change(new, old):
+        if new is None or not old:
+            return "n/a"
+        return f"{(new - old) / old * 100:+.1f}%"
+
+    print(f"vs. baseline from {baseline.get('timestamp', 'unknown time')}:")
+    print(f"  throughput: {baseline['throughput_rps']} -> {result['throughput_rps']} req/s "
+          f"({change(result['throughput_rps'], baseline['throughput_rps'])})")
+    for key in ("p50", "p95", "p99"):
+        old, new = baseline["latency_ms"][key], result["latency_ms"][key]
+        print(f"  {key}: {old} -> {new} ms ({change(new, old)})")
+    print(f"  error rate: {baseline['error_rate'] * 100:.2f}% -> {result['error_rate'] * 100:.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", action="append",
+                        help="Music API base URL; repeat to spread reads over several backends "
+                             "(default: start the bundled stub server)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"weighted operations (default: {DEFAULT_MIX})")
+    parser.add_argument("--concurrency", type=int, default=8, help="worker threads")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=1.0, help="unmeasured seconds before the run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--retries", type=int, default=0, help="client retries per request (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the operation mix")
+    parser.add_argument("--latency", type=float, default=0.0, help="stub server: artificial latency (s)")
+    parser.add_argument("--library-size", type=int, default=500, help="stub server: synthetic library size")
+    parser.add_argument("--output", metavar="PATH", help="save the results as JSON")
+    parser.add_argument("--compare", metavar="PATH", help="compare with an earlier --output file")
+    args = parser.parse_args()
+
+    server = None
+    base_urls = args.url
+    if not base_urls:
+        server, stub_url = start_stub_server(library_size=args.library_size, latency=args.latency)
+        base_urls = [stub_url]
+    # No library cache: every songs/list call must reach the backend
+    api._client = api.ApiClient(base_urls=base_urls, pool_connections=len(base_urls),
+                                pool_maxsize=args.concurrency, max_retries=args.retries)
+    names, weights = args.mix
+    print(f"load: {args.concurrency} workers for {args.duration:g}s against {', '.join(base_urls)}")
+    try:
+        result = run_load(args.mix, args.concurrency, args.duration, warmup=args.warmup,
+                          max_requests=args.requests, seed=args.seed)
+    finally:
+        api.close_client()
+        if server is not None:
+            server.shutdown()
+
+    result = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "config": {
+            "url": args.url or "stub",
+            "mix": dict(zip(names, weights)),
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "retries": args.retries,
+            "stub_latency_s": None if args.url else args.latency,
+            "stub_library_size": None if args.url else args.library_size,
+        },
+        **result,
+    }
+    print_report(result)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as baseline_file:
+            print_comparison(result, json.load(baseline_file))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(result, output_file, indent=2)
+        print(f"results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+In-process Music API for the CLI benchmarks.
+
+A thin wrapper around the reference server (reference_server/) with the
+fixed library and settings the benchmarks were calibrated on: plain
+"Track 00000" songs, the first one playing, and a fixed artificial latency
+on every request. Listing routes carry an ETag and answer If-None-Match
+with 304.
+
+Run it on its own (from the cli/ directory) to serve a real port, e.g. for
+the load generator in a separate process:
+    python -m benchmarks.stub_server [--port 5000] [--latency 0.01]
+For synthetic libraries, failures or event streams use the reference server
+directly: python -m reference_server --help
+"""
+
+import argparse
+import threading
+
+from reference_server.server import Faults, start_in_thread
+
+
+def make_library(size):
+    return [
+        {
+            "title": f"Track {i:05d}",
+            "filePath": f"/music/track_{i:05d}.mp3",
+            "duration": f"{(i % 7) + 2:02d}:{i % 60:02d}",
+            "artist": f"Artist {i % 97}",
+        }
+        for i in range(size)
+    ]
+
+
+def start_stub_server(library_size=50, latency=0.0, port=0):
+    """
+    Start the stub API on a background thread.
+
+    Args:
+        library_size: Number of synthetic tracks to serve
+        latency: Seconds of artificial delay added to every request
+        port: TCP port to bind (0 picks a free one)
+
+    Returns:
+        Tuple of (server, base_url); call server.shutdown() when done
+    """
+    server = start_in_thread(make_library(library_size), port=port,
+                             faults=Faults(latency=latency), playing=True)
+    return server, server.url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the stub Music API until interrupted.")
+    parser.add_argument("--port", type=int, default=5000, help="TCP port to bind")
+    parser.add_argument("--latency", type=float, default=0.0, help="artificial per-request latency (s)")
+    parser.add_argument("--library-size", type=int, default=500, help="synthetic library size")
+    args = parser.parse_args()
+
+    server, base_url = start_stub_server(library_size=args.library_size, latency=args.latency, port=args.port)
+    print(f"stub Music API at {base_url} (Ctrl+C to stop)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,9 @@
-def display_about():
-    about_text = """
+import functools
+import textwrap
+from utils.constants import ABOUT_MAX_WIDTH
+from utils.render import terminal_width, write_screen
+
+ABOUT_TEXT = """
     Termina: Your Personal Unix-style Shell for Seamless Music Playback
 
     Version: 1.0.0
@@ -16,20 +20,23 @@ def display_about():
     For more information, visit our website: github.com/asadw1
 
     Thank you for using Termina!
-    """
-
-    def wrap_text(text, width=100):
-        lines = text.split('\n')
-        wrapped_lines = []
-        for line in lines:
-            while len(line) > width:
-                wrapped_lines.append(line[:width])
-                line = line[width:]
-            wrapped_lines.append(line)
-        return '\n'.join(wrapped_lines)
-
-    wrapped_about_text = wrap_text(about_text)
-    print(wrapped_about_text)
+"""
+
+@functools.lru_cache(maxsize=4)
+def render_about(width):
+    # Wrapped once per terminal width; lines keep their indentation, and
+    # list items continue under their text
+    lines = []
+    for line in ABOUT_TEXT.split("\n"):
+        indent = line[:len(line) - len(line.lstrip())]
+        hanging = indent + "  " if line.lstrip().startswith("- ") else indent
+        lines.append(textwrap.fill(line.strip(), width, initial_indent=indent, subsequent_indent=hanging)
+                     if line.strip() else "")
+    return "\n".join(lines) + "\n"
+
+def display_about():
+    # One column short of the terminal, so no line ends exactly at its edge
+    write_screen(render_about(max(20, min(ABOUT_MAX_WIDTH, terminal_width() - 1))))
 
 if __name__ == "__main__":
     display_about()
@@ -5,6 +5,8 @@ def clear_screen():
     # Check the operating system
     if os.name == 'nt':  # For Windows
         _ = os.system('cls')
+        display_intro()
     else:  # For Mac and Linux (posix)
-        _ = os.system('clear')
-    display_intro()  # Display the intro message after clearing the screen
+        # The clear sequence goes out in the same write as the banner, so the
+        # screen is never left blank between the two
+        display_intro(clear=True)
@@ -0,0 +1,55 @@
+import html
+from utils.api import get_all_songs
+from utils.constants import FIND_RESULT_LIMIT
+from utils.outcome import fail
+from utils.search import parse_query, search_index_for
+from commands.songs import format_row, table_layout, write_rows
+
+USAGE = 'Usage: find <words> [artist:NAME] [title:WORD] [duration>M:SS] [--limit N]'
+
+def split_limit(args):
+    # Pull "--limit N" / "-n N" out of the query. Sanitization strips the
+    # "--", so a bare "limit" or "n" is only taken as the flag when a number
+    # follows; otherwise it is a search word ("rock n roll").
+    limit = FIND_RESULT_LIMIT
+    terms = []
+    tokens = list(args)
+    while tokens:
+        token = tokens.pop(0)
+        name = token.lstrip("-")
+        if name in ("limit", "n") and tokens and (token != name or tokens[0].isdigit()):
+            value = tokens.pop(0)
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError("'limit' must be a positive number")
+            limit = int(value)
+        else:
+            terms.append(token)
+    return terms, limit
+
+def execute(args=None):
+    try:
+        terms, limit = split_limit(args or [])
+        # Input sanitization HTML-escapes '>', '<' and quotes; undo it here
+        query = parse_query(html.unescape(" ".join(terms)))
+        if not query:
+            fail(USAGE)
+            return None
+        songs = get_all_songs()
+        if not songs:
+            print("No songs found")
+            return None
+        total, matches = search_index_for(songs).search(query, limit=limit)
+        if not matches:
+            print("No matching songs.")
+            return []
+        layout = table_layout()
+        write_rows([f"{total} matching song{'s' if total != 1 else ''}:\n", layout.header])
+        write_rows([format_row(position, song, False, layout) for position, song in matches])
+        if total > len(matches):
+            print(f"   ... {total - len(matches)} more (use --limit N to see them)")
+        return [song for _, song in matches]
+    except ValueError as ve:
+        fail(f"Invalid query: {ve}")
+        print(USAGE)
+    except Exception as e:
+        fail(f"An unexpected error occurred while executing 'find' command: {e}")
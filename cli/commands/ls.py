@@ -1,26 +1,33 @@
 from utils.api import list_songs
 from utils.api import current_song
+from utils.api import get_all_songs
+from utils.api import fetch_concurrently
 from utils.constants import ERROR_COMMAND_FAILED
+from utils.library_index import index_for
+from utils.outcome import fail, served_offline
 
 def execute():
     try:
-        titles = list_songs()
-        current = current_song()
+        titles, current = fetch_concurrently(list_songs, current_song)
         current_index = None
         
-        # Find current song index by title match
+        # Find current song index by title; duplicate titles are resolved
+        # against the full (usually cached) listing, which shares its order
         if current and titles:
-            for i, title in enumerate(titles):
-                if title == current['title']:
-                    current_index = i
-                    break
+            index = index_for(titles)
+            current_index = index.position_of(current)
+            if current_index is None and index.is_ambiguous(current):
+                songs = get_all_songs()
+                if songs and len(songs) == len(titles):
+                    current_index = index_for(songs).position_of(current)
         
         if titles:
-            print(f"{len(titles)} songs:{' LIVE' if current else ''}")
+            print(f"{len(titles)} songs:{' LIVE' if current and not served_offline('current') else ''}")
             for i, title in enumerate(titles):
                 marker = "▶ " if i == current_index else "  "
                 print(f"   {marker}{i:2d}. {title}")
+            return titles
         else:
             print("No songs found")
     except Exception as e:
-        print(f"Error: {e}")
+        fail(f"Error: {e}")
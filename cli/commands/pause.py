@@ -1,16 +1,18 @@
 from utils.api import pause
 from utils.constants import ERROR_COMMAND_FAILED
 from utils.helpers import pretty_print_json
+from utils.outcome import fail
 
 def execute():
     try:
         result = pause()
         if result:
             pretty_print_json(result)
+            return result
         else:
-            print(ERROR_COMMAND_FAILED.format('pause'))
+            fail(ERROR_COMMAND_FAILED.format('pause'))
     except Exception as e:
-        print(f"An unexpected error occurred while executing 'pause' command: {e}")
+        fail(f"An unexpected error occurred while executing 'pause' command: {e}")
 
 if __name__ == "__main__":
     execute()
@@ -1,16 +1,18 @@
 from utils.api import play
 from utils.constants import ERROR_COMMAND_FAILED
 from utils.helpers import pretty_print_json
+from utils.outcome import fail
 
 def execute():
     try:
         result = play()
         if result:
             pretty_print_json(result)
+            return result
         else:
-            print(ERROR_COMMAND_FAILED.format('play'))
+            fail(ERROR_COMMAND_FAILED.format('play'))
     except Exception as e:
-        print(f"An unexpected error occurred while executing 'play' command: {e}")
+        fail(f"An unexpected error occurred while executing 'play' command: {e}")
 
 if __name__ == "__main__":
     execute()
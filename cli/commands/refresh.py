@@ -0,0 +1,12 @@
+from utils.api import invalidate_library_cache
+from utils.outcome import fail
+
+def execute():
+    try:
+        invalidate_library_cache()
+        print("Library cache cleared. The next 'songs' or 'ls' will fetch a fresh listing.")
+    except Exception as e:
+        fail(f"An unexpected error occurred while executing 'refresh' command: {e}")
+
+if __name__ == "__main__":
+    execute()
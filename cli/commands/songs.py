@@ -1,27 +1,146 @@
-from utils.api import get_all_songs, current_song
-from utils.constants import ERROR_COMMAND_FAILED
+import functools
+import sys
+from itertools import islice
+from utils.api import get_all_songs, current_song, fetch_concurrently, iter_songs
+from utils.cancellation import check
+from utils.constants import ERROR_COMMAND_FAILED, SONGS_PAGE_SIZE, TABLE_TITLE_MIN, TABLE_TITLE_MAX
+from utils.library_index import index_for
+from utils.outcome import fail, served_offline
+from utils.render import terminal_width
+from utils.repl import ask
 
-def execute():
+USAGE = "Usage: songs [--page N] [--size M] [--limit K] [--pager]"
+
+class TableLayout:
+    __slots__ = ("title_width", "header")
+
+    def __init__(self, title_width, width):
+        self.title_width = title_width
+        # The rule stops short of the right edge so it never wraps
+        self.header = (
+            f"   ID  {'Title':<{title_width - 1}}Duration Artist\n"
+            f"   {'-' * min(title_width + 36, width - 4)}\n"
+        )
+
+@functools.lru_cache(maxsize=4)
+def _layout_for(width):
+    # The title column takes what the fixed columns and a typical artist name
+    # leave over: 42 at 80 columns, which is also what piped output gets
+    return TableLayout(max(TABLE_TITLE_MIN, min(TABLE_TITLE_MAX, width - 38)), width)
+
+def table_layout():
+    # Column widths for the terminal as it is now
+    return _layout_for(terminal_width())
+
+# Option names are matched with their dashes stripped, which also accepts the
+# form left behind by input sanitization ("songs page 2 size 20")
+OPTION_ALIASES = {
+    "page": "page", "p": "page",
+    "size": "size", "s": "size",
+    "limit": "limit", "n": "limit",
+    "pager": "pager", "more": "pager",
+}
+
+def parse_options(args):
+    options = {"page": None, "size": SONGS_PAGE_SIZE, "limit": None, "pager": False}
+    tokens = list(args)
+    while tokens:
+        name, _, value = tokens.pop(0).lstrip("-").partition("=")
+        key = OPTION_ALIASES.get(name)
+        if key is None:
+            raise ValueError(f"unknown option '{name}'")
+        if key == "pager":
+            options["pager"] = True
+            continue
+        if not value:
+            if not tokens:
+                raise ValueError(f"'{name}' needs a number")
+            value = tokens.pop(0)
+        if not value.isdigit() or int(value) < 1:
+            raise ValueError(f"'{name}' must be a positive number")
+        options[key] = int(value)
+    return options
+
+def format_row(i, song, is_current, layout=None):
+    return _row(i, song.title, song.duration, song.artist, is_current, (layout or table_layout()).title_width)
+
+def _row(i, title, duration, artist, is_current, title_width=42):
+    marker = "▶ " if is_current else "  "
+    return f"   {marker}{i:2d}. {title[:title_width]:<{title_width}} {duration:<6} {artist}\n"
+
+def _live(current):
+    # Only backend-confirmed player state is LIVE, not the replica's copy
+    return " LIVE" if current and not served_offline("current") else ""
+
+def write_rows(rows):
+    # One buffered write per page instead of one print per row
+    check()
+    sys.stdout.write("".join(rows))
+    sys.stdout.flush()
+
+def show_full_listing():
+    songs, current = fetch_concurrently(get_all_songs, current_song)
+    current_index = None
+
+    # Find current song index by file path (falls back to title+artist)
+    if current and songs:
+        current_index = index_for(songs).position_of(current)
+
+    if songs:
+        layout = table_layout()
+        write_rows([f"{len(songs)} songs in library:{_live(current)}\n", layout.header])
+        for start in range(0, len(songs), SONGS_PAGE_SIZE):
+            # Rows come straight from the listing's columns; no Song is built
+            stop = start + SONGS_PAGE_SIZE
+            write_rows([_row(i, title, duration, artist, i == current_index, layout.title_width)
+                        for i, title, duration, artist in zip(range(start, stop), songs.titles[start:stop],
+                                                              songs.durations[start:stop], songs.artists[start:stop])])
+        return songs
+    else:
+        print("No songs found")
+
+def show_paged_listing(options):
+    size = options["size"]
+    start = (options["page"] - 1) * size if options["page"] else 0
+    if options["page"] and not options["pager"]:
+        stop = start + size
+    else:
+        stop = None
+    if options["limit"]:
+        stop = start + options["limit"] if stop is None else min(stop, start + options["limit"])
+
+    # Rows are decoded from the streamed response as they arrive, so only the
+    # requested window is ever materialised
+    stream = iter_songs()
+    rows = enumerate(islice(stream, start, stop), start)
     try:
-        songs = get_all_songs()
-        current = current_song()
-        current_index = None
-        
-        # Find current song index by title match
-        if current and songs:
-            for i, song in enumerate(songs):
-                if song['title'] == current['title']:
-                    current_index = i
-                    break
-        
-        if songs:
-            print(f"{len(songs)} songs in library:{' LIVE' if current else ''}")
-            print("   ID  Title                                    Duration Artist")
-            print("   " + "-" * 78)
-            for i, song in enumerate(songs):
-                marker = "▶ " if i == current_index else "  "
-                print(f"   {marker}{i:2d}. {song['title'][:42]:<42} {song['duration']:<6} {song['artist']}")
-        else:
+        first_page, current = fetch_concurrently(lambda: list(islice(rows, size)), current_song)
+        if not first_page:
             print("No songs found")
+            return
+        current_path = current.file_path if current else None
+
+        layout = table_layout()
+        write_rows([f"Songs from #{start}:{_live(current)}\n", layout.header])
+        page = first_page
+        while page:
+            write_rows([format_row(i, song, song.file_path == current_path, layout)
+                        for i, song in page])
+            page = list(islice(rows, size))
+            if page and options["pager"] and sys.stdin.isatty() and sys.stdout.isatty():
+                if ask("-- More -- [Enter: next page, q: quit] ").strip().lower() == "q":
+                    break
+    finally:
+        stream.close()
+
+def execute(args=None):
+    try:
+        options = parse_options(args or [])
+        if args:
+            return show_paged_listing(options)
+        return show_full_listing()
+    except ValueError as ve:
+        fail(f"Invalid option: {ve}")
+        print(USAGE)
     except Exception as e:
-        print(f"Error: {e}")
+        fail(f"Error: {e}")
@@ -0,0 +1,41 @@
+import sys
+from utils.metrics import metrics
+from utils.outcome import fail
+
+USAGE = "Usage: stats [json | prometheus | reset]"
+
+def _format_ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+def _format_table(title, label, rows, show_bytes):
+    lines = [f"{title}:", f"  {label:<22} {'count':>6} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} "
+                          f"{'p99 ms':>8} {'max ms':>8}" + (f" {'bytes in':>10}" if show_bytes else "")]
+    for name, row in rows:
+        line = (f"  {name:<22} {row['count']:>6} {row['errors']:>6} {_format_ms(row['p50_ms']):>8} "
+                f"{_format_ms(row['p95_ms']):>8} {_format_ms(row['p99_ms']):>8} {_format_ms(row['max_ms']):>8}")
+        if show_bytes:
+            line += f" {row['bytes_received']:>10}"
+        lines.append(line)
+    if not rows:
+        lines.append("  (nothing recorded yet)")
+    return lines
+
+def execute(args=None):
+    mode = args[0] if args else None
+    if mode == "json":
+        print(metrics.to_json())
+    elif mode in ("prometheus", "prom"):
+        sys.stdout.write(metrics.to_prometheus())
+    elif mode == "reset":
+        metrics.reset()
+        print("Statistics cleared.")
+    elif mode is None:
+        snapshot = metrics.snapshot()
+        lines = _format_table("Backend requests", "endpoint",
+                              [(f"{row['method']} {row['endpoint']}", row) for row in snapshot["requests"]], True)
+        lines.append("")
+        lines += _format_table("Commands", "command",
+                               [(row["command"], row) for row in snapshot["commands"]], False)
+        sys.stdout.write("\n".join(lines) + "\n")
+    else:
+        fail(USAGE)
@@ -0,0 +1,156 @@
+import time
+from utils.api import fetch_current_song, current_song_events
+from utils.cancellation import sleep
+from utils.constants import (
+    WATCH_MIN_INTERVAL,
+    WATCH_MAX_INTERVAL,
+    WATCH_BACKOFF,
+    WATCH_BOUNDARY_WINDOW,
+)
+from utils.helpers import parse_duration
+from utils.live_view import LiveView
+from utils.outcome import fail
+from utils.output import capture
+
+USAGE = "Usage: watch [--interval S] [--count N]"
+
+class AdaptivePoller:
+    """
+    Picks the delay before the next poll of the current song.
+
+    The delay starts at the minimum after every track change and grows by the
+    backoff factor while nothing changes (or nothing is playing), up to the
+    maximum. While a track is playing, polls are also scheduled to land on its
+    expected end and stay at the minimum for a short window after it, so the
+    switch to the next track shows up promptly.
+    """
+
+    def __init__(self, min_interval=WATCH_MIN_INTERVAL, max_interval=WATCH_MAX_INTERVAL,
+                 backoff=WATCH_BACKOFF, boundary_window=WATCH_BOUNDARY_WINDOW):
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.backoff = backoff
+        self.boundary_window = boundary_window
+        self.interval = min_interval
+        self.track_key = None
+        self.track_started = None
+        self.track_length = None
+
+    def observe(self, song, now):
+        # Record a poll result; returns True when the track changed
+        key = (song.get("filePath"), song.get("title")) if song else None
+        if key == self.track_key:
+            self.back_off()
+            return False
+        self.track_key = key
+        # The API reports no position, so a track is assumed to start when we
+        # first see it. For the track already playing at startup this errs late,
+        # which the interval ceiling bounds.
+        self.track_started = now
+        self.track_length = parse_duration(song.get("duration")) if song else None
+        self.interval = self.min_interval
+        return True
+
+    def back_off(self):
+        self.interval = min(self.max_interval, self.interval * self.backoff)
+
+    def next_delay(self, now):
+        delay = self.interval
+        if self.track_key is not None and self.track_length:
+            remaining = self.track_started + self.track_length - now
+            if remaining > 0:
+                delay = min(delay, max(self.min_interval, remaining))
+            elif -remaining < self.boundary_window:
+                delay = self.min_interval
+        return delay
+
+def parse_options(args):
+    options = {"interval": WATCH_MIN_INTERVAL, "count": None}
+    tokens = list(args)
+    while tokens:
+        name, _, value = tokens.pop(0).lstrip("-").partition("=")
+        if name in ("interval", "i"):
+            key, kind = "interval", float
+        elif name in ("count", "n"):
+            key, kind = "count", int
+        else:
+            raise ValueError(f"unknown option '{name}'")
+        if not value:
+            if not tokens:
+                raise ValueError(f"'{name}' needs a number")
+            value = tokens.pop(0)
+        try:
+            options[key] = kind(value)
+        except ValueError:
+            raise ValueError(f"'{name}' must be a number")
+        if options[key] <= 0:
+            raise ValueError(f"'{name}' must be positive")
+    return options
+
+def render(song, status):
+    # Always five lines, so updates only repaint the fields that changed
+    if song:
+        return [
+            f"Now playing: {song.get('title')}",
+            f"  Artist:   {song.get('artist')}",
+            f"  Duration: {song.get('duration')}",
+            f"  FilePath: {song.get('filePath')}",
+            f"  {status}",
+        ]
+    return ["Now playing: nothing", "", "", "", f"  {status}"]
+
+def poll():
+    # Errors from the API layer are captured for the status line instead of
+    # being printed through the live block
+    with capture() as errors:
+        song = fetch_current_song()
+    return song, errors.getvalue().strip()
+
+def watch_events(view, events, count):
+    updates = 0
+    for song in events:
+        view.update(render(song, "Live updates from the backend"))
+        updates += 1
+        if count and updates >= count:
+            break
+    return updates
+
+def watch_polling(view, options, updates=0):
+    poller = AdaptivePoller(min_interval=options["interval"])
+    while not options["count"] or updates < options["count"]:
+        song, error = poll()
+        now = time.monotonic()
+        if error:
+            poller.back_off()
+        else:
+            poller.observe(song, now)
+        delay = poller.next_delay(now)
+        state = error or ("Playing" if song else "Stopped")
+        view.update(render(None if error else song, f"{state}, next check in {delay:.1f}s"))
+        updates += 1
+        if options["count"] and updates >= options["count"]:
+            break
+        sleep(delay)
+
+def execute(args=None):
+    try:
+        options = parse_options(args or [])
+    except ValueError as ve:
+        fail(f"Invalid option: {ve}")
+        print(USAGE)
+        return
+    print("Watching the current song (Ctrl+C to stop)")
+    view = LiveView()
+    try:
+        updates = 0
+        events = current_song_events()
+        if events is not None:
+            updates = watch_events(view, events, options["count"])
+            events.close()
+        if not options["count"] or updates < options["count"]:
+            # No push transport, or the stream ended: poll instead
+            watch_polling(view, options, updates)
+    except KeyboardInterrupt:
+        print("Stopped watching.")
+    except Exception as e:
+        fail(f"An unexpected error occurred while executing 'watch' command: {e}")
@@ -0,0 +1,84 @@
+"""
+Reference Music API server: the /api/Music/* contract of MusicShellApi in
+pure Python, backed by a synthetic library, with injectable latency and
+failures. Lets the CLI be run, tested and benchmarked without the .NET
+backend or a music folder.
+
+Usage (from the cli/ directory):
+    python -m reference_server [--port 5000] [--library-size 10000] [--latency 0.05]
+    python -m reference_server --failure-rate 0.1 --fault-routes songs,list
+    python -m reference_server --library songs.json --events --time-scale 60
+
+Faults and the library can also be changed while it runs:
+    curl -X POST localhost:5000/_control -d '{"latency": 0.5, "drop_rate": 0.2}'
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from reference_server.library import generate_library
+from reference_server.server import Faults, MusicApiServer, serve
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=5000, help="TCP port (default: 5000, like the backend)")
+    library = parser.add_mutually_exclusive_group()
+    library.add_argument("--library-size", type=int, default=500, help="songs in the synthetic library")
+    library.add_argument("--library", metavar="FILE", help="serve the songs in this JSON file instead")
+    parser.add_argument("--seed", type=int, default=0, help="synthetic library seed")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every API request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="up to this many random extra seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="share of requests answered with 500")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="share of requests whose connection is closed without an answer")
+    parser.add_argument("--fault-routes", default="",
+                        help="comma-separated routes the faults apply to (default: all)")
+    parser.add_argument("--events", action="store_true",
+                        help="also serve current/events (Server-Sent Events) for `watch`")
+    parser.add_argument("--time-scale", type=float, default=1.0,
+                        help="playback clock speed-up, e.g. 60 plays a 3-minute track in 3 s")
+    parser.add_argument("--playing", action="store_true", help="start with the first song playing")
+    return parser.parse_args(argv)
+
+
+def load_songs(path):
+    with open(path, "r", encoding="utf-8") as library_file:
+        songs = json.load(library_file)
+    if not isinstance(songs, list) or not all(isinstance(song, dict) and "title" in song for song in songs):
+        raise ValueError("expected a JSON array of song objects with at least a 'title'")
+    return songs
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        songs = load_songs(args.library) if args.library else generate_library(args.library_size, args.seed)
+        faults = Faults(routes=args.fault_routes.split(",") if args.fault_routes else ())
+        faults.update({"latency": args.latency, "jitter": args.jitter,
+                       "failure_rate": args.failure_rate, "drop_rate": args.drop_rate})
+        if args.time_scale <= 0:
+            raise ValueError("'time_scale' must be above 0")
+    except (OSError, ValueError) as e:
+        sys.exit(f"reference_server: {e}")
+    server = MusicApiServer(songs, faults=faults, events=args.events,
+                            time_scale=args.time_scale, playing=args.playing)
+    server.seed = args.seed
+
+    def started(address):
+        print(f"Music API at http://{address[0]}:{address[1]}/api/Music "
+              f"({len(songs)} songs; Ctrl+C to stop)", flush=True)
+
+    try:
+        asyncio.run(serve(server, args.host, args.port, on_start=started))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        sys.exit(f"reference_server: {e}")
+
+
+if __name__ == "__main__":
+    main()
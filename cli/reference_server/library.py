@@ -0,0 +1,41 @@
+# Synthetic music libraries for the reference server
+
+import random
+
+SYLLABLES = ("ka", "lo", "mi", "ra", "ne", "to", "su", "vi", "an", "el", "or", "us", "da", "be", "qu")
+COMMON_WORDS = ("love", "night", "heart", "river", "midnight", "train", "blue", "home", "fire", "dream")
+
+
+def format_duration(seconds):
+    # The backend's DurationFormatter: "mm:ss" from the minutes and seconds
+    # components, so hours are dropped as they are there
+    return f"{(seconds // 60) % 60:02d}:{seconds % 60:02d}"
+
+
+def generate_library(size, seed=0, min_seconds=90, max_seconds=480):
+    """
+    Build `size` songs shaped like the backend's SongInfoDto.
+
+    Titles and artists are drawn from a Zipf-like vocabulary, so common
+    words repeat across the library the way real tags do, and about one
+    artist in fifty songs. The same size and seed always give the same
+    library.
+    """
+    rng = random.Random(seed)
+    words = list(COMMON_WORDS) + [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(5000)]
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    artists = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+               + " " + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).title()
+               for _ in range(max(1, size // 50))]
+    songs = []
+    for i in range(size):
+        title = " ".join(rng.choices(words, weights, k=rng.randint(1, 4))).title()
+        artist = rng.choice(artists)
+        songs.append({
+            "title": title,
+            "filePath": f"/music/{artist}/{i:06d} {title}.mp3",
+            "duration": format_duration(rng.randint(min_seconds, max_seconds)),
+            "artist": artist,
+        })
+    return songs
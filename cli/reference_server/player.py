@@ -0,0 +1,109 @@
+# The backend's playback state machine, without the audio
+
+import time
+
+PLAYING = "playing"
+PAUSED = "paused"
+STOPPED = "stopped"
+
+
+def _seconds(duration):
+    try:
+        minutes, seconds = str(duration).split(":")
+        return max(1, int(minutes) * 60 + int(seconds))
+    except ValueError:
+        return 1
+
+
+class Player:
+    """
+    Mirrors MusicService: a selected position in the library, and a player
+    that is playing, paused or stopped.
+
+    play restarts the selected track from the beginning (also after a
+    pause); next/previous move the selection with wrap-around and play it;
+    stop and pause keep it. A playing track moves on to the next one when
+    it ends, except after the last track, where playback stops. That
+    happens lazily, whenever the state is looked at, on a clock sped up by
+    `time_scale`.
+    """
+
+    def __init__(self, songs, clock=time.monotonic, time_scale=1.0):
+        self.clock = clock
+        self.time_scale = time_scale
+        self.state = STOPPED
+        self.index = 0
+        self.started_at = None  # clock time the playing track started
+        self.load(songs)
+
+    def load(self, songs):
+        self.songs = songs
+        self.lengths = [_seconds(song.get("duration")) for song in songs]
+        self.index = 0
+        self.state = STOPPED
+
+    def play(self):
+        self._catch_up()
+        if not self.songs:
+            return "No songs available."
+        if self.index >= len(self.songs):
+            self.index = 0  # safety reset, as in the backend
+        self.state = PLAYING
+        self.started_at = self.clock()
+        return f"Playing: {self.songs[self.index]['title']}"
+
+    def pause(self):
+        self._catch_up()
+        if self.state == PLAYING:
+            self.state = PAUSED
+        return "Music paused."
+
+    def stop(self):
+        self._catch_up()
+        self.state = STOPPED
+        return "Music stopped."
+
+    def next(self):
+        return self._skip(1)
+
+    def previous(self):
+        return self._skip(-1)
+
+    def _skip(self, step):
+        self.stop()
+        if not self.songs:
+            return "No songs available."
+        self.index = (self.index + step) % len(self.songs)
+        return self.play()
+
+    def current(self):
+        """
+        The playing or paused song. Raises LookupError with the backend's
+        message when there is none.
+        """
+        self._catch_up()
+        if not self.songs:
+            raise LookupError("No songs available in the playlist.")
+        if self.state == STOPPED:
+            raise LookupError("No song is currently playing or paused.")
+        return self.songs[self.index]
+
+    def seconds_to_track_end(self):
+        # Wall-clock seconds until the playing track ends, or None
+        self._catch_up()
+        if self.state != PLAYING:
+            return None
+        return max(0.0, self.started_at + self.lengths[self.index] / self.time_scale - self.clock())
+
+    def _catch_up(self):
+        # Auto-advance over every track that has ended since the last look
+        now = self.clock()
+        while self.state == PLAYING:
+            ends_at = self.started_at + self.lengths[self.index] / self.time_scale
+            if now < ends_at:
+                return
+            if self.index < len(self.songs) - 1:
+                self.index += 1
+                self.started_at = ends_at
+            else:
+                self.state = STOPPED
@@ -0,0 +1,465 @@
+# Pure-Python implementation of the Music API (/api/Music/*) on asyncio
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+from email.utils import formatdate
+from urllib.parse import unquote, urlsplit
+from reference_server.library import generate_library
+from reference_server.player import Player
+
+API_PREFIX = "/api/music/"  # matched case-insensitively, like ASP.NET routes
+CONTROL_PATH = "/_control"
+TRANSPORT_ACTIONS = ("play", "pause", "stop", "next", "previous")
+GET_ROUTES = ("songs", "list", "current")
+
+JSON_TYPE = "application/json; charset=utf-8"
+TEXT_TYPE = "text/plain; charset=utf-8"
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+MAX_BODY_BYTES = 1 << 20
+EVENTS_HEARTBEAT = 15.0  # seconds between keep-alive comments on an idle event stream
+
+# Settings accepted by configure() and POST /_control
+FAULT_SETTINGS = ("latency", "jitter", "failure_rate", "drop_rate", "routes")
+LIBRARY_SETTINGS = ("library_size", "seed", "time_scale")
+
+
+class Faults:
+    """
+    Latency and failures injected into API requests.
+
+    Every request to a covered route (all of them when `routes` is empty)
+    first waits latency + up to `jitter` seconds. Then, with probability
+    `drop_rate`, its connection is closed without an answer. Failing that,
+    with probability `failure_rate`, it gets the backend's 500 "Internal
+    server error".
+    """
+
+    __slots__ = ("latency", "jitter", "failure_rate", "drop_rate", "routes", "rng")
+
+    def __init__(self, latency=0.0, jitter=0.0, failure_rate=0.0, drop_rate=0.0, routes=(), seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.routes = tuple(route.strip().lower() for route in routes or ())
+        self.rng = random.Random(seed)
+
+    def covers(self, route):
+        # "songs" covers "songs/3", "current" covers "current/events"
+        return not self.routes or route.split("/", 1)[0] in self.routes
+
+    def delay(self):
+        return self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def drops(self):
+        return self.drop_rate > 0 and self.rng.random() < self.drop_rate
+
+    def fails(self):
+        return self.failure_rate > 0 and self.rng.random() < self.failure_rate
+
+    def update(self, settings):
+        for name in ("latency", "jitter"):
+            if name in settings:
+                setattr(self, name, _number(settings, name, 0.0))
+        for name in ("failure_rate", "drop_rate"):
+            if name in settings:
+                setattr(self, name, _number(settings, name, 0.0, 1.0))
+        if "routes" in settings:
+            routes = settings["routes"] or ()
+            if isinstance(routes, str):
+                routes = [route for route in routes.split(",") if route]
+            if not all(isinstance(route, str) for route in routes):
+                raise ValueError("'routes' must be a list of route names")
+            self.routes = tuple(route.strip().lower() for route in routes)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in FAULT_SETTINGS[:-1]} | {"routes": list(self.routes)}
+
+
+def _number(settings, name, low, high=None):
+    value = settings[name]
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"'{name}' must be a number")
+    if value < low or (high is not None and value > high):
+        bounds = f"between {low:g} and {high:g}" if high is not None else f"at least {low:g}"
+        raise ValueError(f"'{name}' must be {bounds}")
+    return float(value)
+
+
+class _BadRequest(Exception):
+    pass
+
+
+class MusicApiServer:
+    """
+    The MusicShellApi contract, served from a synthetic (or given) library.
+
+    Routes under /api/Music/ answer like the .NET controller: `songs`,
+    `songs/{index}` (400 when out of range), `list` (500 when the library is
+    empty), `current` (404 with a message when nothing is playing or
+    paused) and POST play/pause/stop/next/previous with {"message": ...}.
+    Listings carry an ETag and answer a matching If-None-Match with 304.
+    With `events`, `current/events` pushes the current song as Server-Sent
+    Events whenever it changes.
+
+    Faults are injected into /api/Music/ requests only. GET /_control shows
+    the fault and library settings; POST /_control with a JSON object
+    changes them at runtime (see configure()).
+    """
+
+    def __init__(self, songs=None, faults=None, events=False, time_scale=1.0, playing=False):
+        self.faults = faults or Faults()
+        self.events = events
+        self.seed = 0
+        self.player = Player([], time_scale=time_scale)
+        self._changed = None
+        self._server = None
+        self._connections = {}  # writer -> task serving it
+        self.load(generate_library(500) if songs is None else songs)
+        if playing:
+            self.player.play()
+
+    # --- library and settings ---
+
+    def load(self, songs):
+        self.player.load(songs)
+        self.encoded_songs = json.dumps(songs).encode("utf-8")
+        self.encoded_list = json.dumps([song["title"] for song in songs]).encode("utf-8")
+        # Listings are encoded once per library, so serving one allocates nothing
+        self.etag = f'"{hashlib.sha1(self.encoded_songs).hexdigest()[:16]}"'
+        self._notify()
+
+    def configure(self, settings):
+        """
+        Change fault and library settings; returns the resulting settings.
+
+        Accepts latency, jitter (seconds), failure_rate, drop_rate (0-1),
+        routes (names the faults are limited to; empty for all),
+        library_size and seed (regenerates the library, which stops
+        playback) and time_scale (playback clock speed-up). Raises
+        ValueError for anything else, leaving the settings unchanged.
+        """
+        if not isinstance(settings, dict):
+            raise ValueError("settings must be a JSON object")
+        unknown = set(settings) - set(FAULT_SETTINGS) - set(LIBRARY_SETTINGS)
+        if unknown:
+            raise ValueError(f"unknown setting(s): {', '.join(sorted(unknown))}")
+        faults = Faults(**{name: getattr(self.faults, name) for name in FAULT_SETTINGS})
+        faults.rng = self.faults.rng
+        faults.update(settings)
+        library_size = seed = time_scale = None
+        if "library_size" in settings:
+            library_size = int(_number(settings, "library_size", 0))
+        if "seed" in settings:
+            seed = int(_number(settings, "seed", 0))
+        if "time_scale" in settings:
+            time_scale = _number(settings, "time_scale", 0.0)
+            if not time_scale:
+                raise ValueError("'time_scale' must be above 0")
+        self.faults = faults
+        if time_scale is not None:
+            self.player.time_scale = time_scale
+        if library_size is not None or seed is not None:
+            self.seed = self.seed if seed is None else seed
+            size = len(self.player.songs) if library_size is None else library_size
+            self.load(generate_library(size, seed=self.seed))
+        return self.settings()
+
+    def settings(self):
+        return self.faults.to_dict() | {
+            "library_size": len(self.player.songs),
+            "seed": self.seed,
+            "time_scale": self.player.time_scale,
+            "events": self.events,
+            "player": self.player.state,
+            "index": self.player.index,
+        }
+
+    def _notify(self):
+        # Wake event streams waiting for a change
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = asyncio.Event()
+
+    # --- serving ---
+
+    async def start(self, host="127.0.0.1", port=5000):
+        self._changed = asyncio.Event()
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            tasks = list(self._connections.values())
+            for task in tasks:
+                task.cancel()  # idle keep-alive connections and event streams
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve_connection(self, reader, writer):
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                try:
+                    request = await _read_request(reader)
+                except _BadRequest as e:
+                    writer.write(_head(400 if str(e) != "too large" else 413, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                if not await self._handle(writer, *request):
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            pass  # the client went away, or the server is closing
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    async def _handle(self, writer, method, target, version, headers, body):
+        # Answers one request; returns False when the connection must close
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        path = unquote(urlsplit(target).path)
+        if path.rstrip("/") == CONTROL_PATH:
+            status, content_type, payload = self._control(method, body)
+            writer.write(_head(status, content_type, len(payload), keep_alive=keep_alive) + payload)
+            return keep_alive
+        route = path[len(API_PREFIX):].strip("/").lower() if path.lower().startswith(API_PREFIX) else None
+        if route is not None and self.faults.covers(route):
+            delay = self.faults.delay()
+            if delay:
+                await asyncio.sleep(delay)
+            if self.faults.drops():
+                return False  # closed without an answer: a transport error for the client
+            if self.faults.fails():
+                payload = b"Internal server error"
+                writer.write(_head(500, TEXT_TYPE, len(payload), keep_alive=keep_alive) + payload)
+                return keep_alive
+        if route == "current/events" and method == "GET" and self.events:
+            await self._stream_events(writer)
+            return False
+        status, content_type, payload, extra = self._route(method, route, headers)
+        if status == 304:
+            payload = b""
+        writer.write(_head(status, content_type, len(payload), extra, keep_alive))
+        if payload:
+            writer.write(payload)
+        return keep_alive
+
+    def _route(self, method, route, headers):
+        # -> (status, content type, body, extra header lines)
+        known = route in GET_ROUTES or route in TRANSPORT_ACTIONS or (
+            route is not None and route.startswith("songs/") and "/" not in route[6:])
+        if not known:
+            return 404, None, b"", ()
+        expected = "POST" if route in TRANSPORT_ACTIONS else "GET"
+        if method != expected:
+            return 405, None, b"", (f"Allow: {expected}",)
+        if route in TRANSPORT_ACTIONS:
+            message = getattr(self.player, route)()
+            self._notify()
+            return 200, JSON_TYPE, _json({"message": message}), ()
+        if route == "songs":
+            return self._listing(self.encoded_songs, headers)
+        if route == "list":
+            if not self.player.songs:
+                return 500, TEXT_TYPE, b"Error listing songs.", ()
+            return self._listing(self.encoded_list, headers)
+        if route == "current":
+            try:
+                return 200, JSON_TYPE, _json(self.player.current()), ()
+            except LookupError as e:
+                return 404, JSON_TYPE, _json({"message": str(e)}), ()
+        return self._song_at(route[len("songs/"):])
+
+    def _listing(self, payload, headers):
+        etag = (f"ETag: {self.etag}",)
+        if headers.get("if-none-match") == self.etag:
+            return 304, None, b"", etag
+        return 200, JSON_TYPE, payload, etag
+
+    def _song_at(self, segment):
+        try:
+            index = int(segment)
+        except ValueError:
+            # ASP.NET's automatic model validation answer
+            return 400, "application/problem+json; charset=utf-8", _json({
+                "type": "https://tools.ietf.org/html/rfc9110#section-15.5.1",
+                "title": "One or more validation errors occurred.",
+                "status": 400,
+                "errors": {"index": [f"The value '{segment}' is not valid."]},
+            }), ()
+        songs = self.player.songs
+        if not 0 <= index < len(songs):
+            message = f"Index {index} out of range (0-{len(songs) - 1}) (Parameter 'index')"
+            return 400, TEXT_TYPE, message.encode("utf-8"), ()
+        return 200, JSON_TYPE, _json(songs[index]), ()
+
+    def _control(self, method, body):
+        if method == "GET":
+            return 200, JSON_TYPE, _json(self.settings())
+        if method != "POST":
+            return 405, TEXT_TYPE, b"GET or POST"
+        try:
+            settings = self.configure(json.loads(body or b"{}"))
+        except ValueError as e:
+            return 400, TEXT_TYPE, str(e).encode("utf-8")
+        return 200, JSON_TYPE, _json(settings)
+
+    async def _stream_events(self, writer):
+        # The current song (null when stopped) now and after every change,
+        # until the client disconnects. The body has no length, so the
+        # connection is closed after it.
+        writer.write(_head(200, "text/event-stream", None, ("Cache-Control: no-cache",), keep_alive=False))
+        sent, last = False, None
+        try:
+            while not writer.is_closing():
+                try:
+                    song = self.player.current()
+                except LookupError:
+                    song = None
+                if not sent or song is not last:
+                    writer.write(b"data: " + _json(song) + b"\n\n")
+                    sent, last = True, song
+                else:
+                    writer.write(b": keep-alive\n\n")
+                await writer.drain()
+                changed = self._changed
+                # Also wake when the playing track ends and the next one starts
+                until_end = self.player.seconds_to_track_end()
+                timeout = EVENTS_HEARTBEAT if until_end is None else min(until_end + 0.01, EVENTS_HEARTBEAT)
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except ConnectionError:
+            pass  # disconnected
+
+
+def _json(payload):
+    return json.dumps(payload).encode("utf-8")
+
+
+def _head(status, content_type=None, length=0, extra=(), keep_alive=True):
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+             f"Date: {formatdate(usegmt=True)}",
+             "Server: termina-reference"]
+    if content_type is not None:
+        lines.append(f"Content-Type: {content_type}")
+    if length is not None:
+        lines.append(f"Content-Length: {length}")
+    lines.extend(extra)
+    if not keep_alive:
+        lines.append("Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+
+async def _read_request(reader):
+    # -> (method, target, version, headers, body), or None at end of stream
+    try:
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise _BadRequest("malformed request line")
+        method, target, version = parts
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if not line.strip():
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+    except ValueError:
+        raise _BadRequest("too large")  # a line over the stream's limit
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise _BadRequest("bad content length")
+    if length > MAX_BODY_BYTES:
+        raise _BadRequest("too large")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), target, version, headers, body
+
+
+class ServerThread:
+    """
+    A MusicApiServer on an event loop of its own, for tests and benchmarks
+    that drive it from ordinary threads.
+
+    Attributes:
+        server: The MusicApiServer (only touch it through configure())
+        url: Base URL of the API, e.g. http://127.0.0.1:43127/api/Music
+    """
+
+    def __init__(self, server, host="127.0.0.1", port=0):
+        self.server = server
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        failure = []
+
+        def run():
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.address = self.loop.run_until_complete(server.start(host, port))
+            except OSError as e:
+                failure.append(e)
+                started.set()
+                return
+            started.set()
+            self.loop.run_forever()
+            self.loop.run_until_complete(server.close())
+            self.loop.close()
+
+        self.thread = threading.Thread(target=run, name="termina-reference-server", daemon=True)
+        self.thread.start()
+        started.wait()
+        if failure:
+            raise failure[0]
+        self.url = f"http://{self.address[0]}:{self.address[1]}/api/Music"
+
+    def configure(self, **settings):
+        # Thread-safe configure(); raises ValueError like it
+        async def apply():
+            return self.server.configure(settings)
+        return asyncio.run_coroutine_threadsafe(apply(), self.loop).result()
+
+    def shutdown(self):
+        if self.thread.is_alive():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+
+
+def start_in_thread(songs=None, host="127.0.0.1", port=0, **options):
+    """
+    Start a reference server on a background thread.
+
+    Args:
+        songs: Library to serve (default: a synthetic one of 500 songs)
+        host: Interface to bind
+        port: TCP port (0 picks a free one)
+        **options: faults, events, time_scale and playing for MusicApiServer
+
+    Returns:
+        The running ServerThread; call shutdown() when done
+    """
+    return ServerThread(MusicApiServer(songs, **options), host, port)
+
+
+async def serve(server, host="127.0.0.1", port=5000, on_start=None):
+    # Run `server` until cancelled
+    address = await server.start(host, port)
+    if on_start is not None:
+        on_start(address)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
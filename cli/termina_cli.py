@@ -1,20 +1,102 @@
 import argparse
+import atexit
+import os
+import sys
+import time
+from utils.config import ConfigError, add_config_arguments
+try:
+    import utils.constants  # applies the config file, TERMINA_* variables and --set flags
+except ConfigError as config_error:
+    sys.exit(f"Configuration error: {config_error}")
+from utils.render import watch_resize
+watch_resize()  # before readline is imported, so it chains its own resize handling to ours
 from ascii.intro import display_intro
 from utils.logging_config import logger
 from utils.sanitization import sanitize_input
 from utils.command_handler import handle_command
+from utils.history import enable_persistence
+from utils.constants import LAUNCHER_READY_ENV, LAUNCHER_READY_TIMEOUT, LAUNCHER_READY_POLL, REPL_ASYNC
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Termina: your personal Unix-style shell for music playback.",
+        epilog="Without -c or -f, commands are read from stdin when it is not a terminal.",
+    )
+    parser.add_argument("-c", "--command", metavar="COMMANDS",
+                        help='run commands separated by ";" and exit, e.g. "next; current"')
+    parser.add_argument("-f", "--file", metavar="SCRIPT",
+                        help="run commands from a script file ('-' for stdin) and exit")
+    parser.add_argument("--json", action="store_true",
+                        help="batch mode: print one JSON object per command")
+    parser.add_argument("--sequential", action="store_true",
+                        help="batch mode: do not run read-only commands concurrently")
+    parser.add_argument("--metrics-out", metavar="PATH",
+                        help="write request/command statistics to PATH on exit")
+    parser.add_argument("--metrics-format", choices=("json", "prometheus"), default="json",
+                        help="format for --metrics-out (default: json)")
+    add_config_arguments(parser)
+    return parser.parse_args(argv)
+
+def register_metrics_export(args):
+    if args.metrics_out:
+        from utils.metrics import export_metrics
+        atexit.register(export_metrics, args.metrics_out, args.metrics_format)
+
+def read_script(args):
+    # Returns the batch script text, or None for the interactive shell
+    if args.command is not None:
+        return args.command
+    if args.file == "-" or (args.file is None and not sys.stdin.isatty()):
+        return sys.stdin.read()
+    if args.file is not None:
+        with open(args.file, "r", encoding="utf-8") as script:
+            return script.read()
+    return None
+
+def run_batch_mode(script, args):
+    from utils.batch import run_batch, split_script
+    return run_batch(split_script(script), json_output=args.json, concurrent=not args.sequential)
+
+def wait_for_launcher():
+    # When termina_runner.py starts the shell alongside a booting backend, it
+    # names a file that appears once the backend answers. Everything above the
+    # prompt is already loaded by then, so the wait overlaps with our startup.
+    ready_file = os.environ.get(LAUNCHER_READY_ENV)
+    if not ready_file:
+        return
+    from utils.api import get_client
+    get_client()  # build the HTTP session and load the library cache meanwhile
+    deadline = time.monotonic() + LAUNCHER_READY_TIMEOUT
+    if not os.path.exists(ready_file):
+        print("Waiting for the backend to start...")
+    while not os.path.exists(ready_file):
+        if time.monotonic() >= deadline:
+            print("The backend is taking long to start; commands may fail until it is up.")
+            return
+        time.sleep(LAUNCHER_READY_POLL)
+    with open(ready_file, "r", encoding="utf-8") as status:
+        if status.read().strip() != "ready":
+            print("The backend did not start; commands will fail until it is running.")
 
 def main():
     display_intro()  # Display the intro text first
-    
+    enable_persistence()  # Restore history from earlier sessions
+    wait_for_launcher()
+    from utils.api import start_replica_sync
+    start_replica_sync()  # keep the offline copy of the library current
+    if REPL_ASYNC:
+        from utils.repl import run_shell
+        run_shell()
+        return
+
     while True:
         try:
             command = input("Termina> ").strip().lower()
             command = sanitize_input(command)
-            
+
             if not handle_command(command):
                 break
-        
+
         except ValueError as ve:
             print(f"Invalid input: {ve}")
             logger.error(f"Invalid input: {ve}")
@@ -28,6 +110,11 @@ def main():
             logger.error(f"An unexpected error occurred: {e}")
 
 if __name__ == "__main__":
+    cli_args = parse_args()
+    register_metrics_export(cli_args)
+    script = read_script(cli_args)
+    if script is not None:
+        sys.exit(run_batch_mode(script, cli_args))
     try:
         main()
     except Exception as e:
@@ -0,0 +1,10 @@
+# Shared fixtures for the unit tests
+
+
+class FakeClock:
+    # A monotonic clock that only moves when a test sets `now`
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
@@ -0,0 +1,125 @@
+"""
+Tests for the circuit breaker and backend pool.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from helpers import FakeClock
+from utils.backends import BackendPool, CircuitBreaker
+
+
+class CircuitBreakerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5, clock=self.clock)
+
+    def test_opens_after_threshold_failures(self):
+        self.breaker.record_failure()
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.assertFalse(self.breaker.available())
+
+    def test_success_resets_failure_count(self):
+        self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_single_trial_after_reset_timeout(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 5
+        self.assertTrue(self.breaker.available())
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())  # the trial is taken
+        self.assertFalse(self.breaker.available())
+
+    def test_available_claims_nothing(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 5
+        self.breaker.available()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertTrue(self.breaker.allow())
+
+    def test_trial_outcome_closes_or_reopens(self):
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.clock.now = 5
+        self.breaker.allow()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow())
+        self.clock.now = 10
+        self.breaker.allow()
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+
+class BackendPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.pool = BackendPool(["http://a/api/Music", "http://b/api/Music/"],
+                                failure_threshold=1, reset_timeout=5)
+        for backend in self.pool.backends:
+            backend.breaker.clock = self.clock
+        self.a, self.b = self.pool.backends
+
+    def test_requires_a_backend(self):
+        with self.assertRaises(ValueError):
+            BackendPool([])
+
+    def test_primary_is_first_and_urls_are_normalised(self):
+        self.assertIs(self.pool.primary, self.a)
+        self.assertEqual(self.b.url, "http://b/api/Music")
+
+    def test_picks_faster_of_two(self):
+        self.a.observe_latency(10)
+        self.b.observe_latency(5)
+        self.assertEqual({self.pool.pick() for _ in range(4)}, {self.b})
+
+    def test_skips_excluded_and_open_backends(self):
+        self.assertIs(self.pool.pick(exclude=[self.a]), self.b)
+        self.b.breaker.record_failure()
+        self.assertIs(self.pool.pick(exclude=[self.a]), None)
+        self.assertIs(self.pool.pick_for_read(), self.a)
+
+    def test_unpicked_candidate_keeps_its_trial(self):
+        # A is due a trial but slower than B: comparing must not leave it
+        # half-open, or it would never be picked again
+        self.a.observe_latency(10)
+        self.b.observe_latency(5)
+        self.a.breaker.record_failure()
+        self.clock.now = 6
+        for _ in range(4):
+            self.assertIs(self.pool.pick(), self.b)
+        self.assertEqual(self.a.breaker.state, CircuitBreaker.OPEN)
+        self.assertIs(self.pool.pick(exclude=[self.b]), self.a)
+        self.assertEqual(self.a.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.a.breaker.record_success()
+        self.assertIs(self.pool.pick(exclude=[self.b]), self.a)
+
+    def test_available_has_no_side_effects(self):
+        self.a.breaker.record_failure()
+        self.assertTrue(self.pool.available())
+        self.assertFalse(self.pool.available(exclude=[self.b]))
+        self.clock.now = 6
+        self.assertTrue(self.pool.available(exclude=[self.b]))
+        self.assertEqual(self.a.breaker.state, CircuitBreaker.OPEN)
+
+    def test_all_open_falls_back_to_primary_for_reads(self):
+        self.a.breaker.record_failure()
+        self.b.breaker.record_failure()
+        self.assertFalse(self.pool.available())
+        self.assertIsNone(self.pool.pick())
+        self.assertIs(self.pool.pick_for_read(), self.pool.primary)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+"""
+Tests for the library listing cache and its persistence.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from utils.cache import LibraryCache
+
+SONGS = [{"title": "Track 0", "filePath": "/music/0.mp3", "duration": "03:00", "artist": "A"}]
+KEY = "http://localhost:5000/api/Music/songs"
+
+
+class LibraryCacheTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "library_cache.json")
+
+    def test_store_does_not_write_on_the_request_path(self):
+        cache = LibraryCache(60, persist_path=self.path, save_delay=60)
+        self.addCleanup(cache.close)
+        cache.store(KEY, SONGS, etag='"v1"')
+        cache.store(KEY, SONGS, etag='"v2"')
+        self.assertFalse(os.path.exists(self.path))
+        cache.close()
+        warm = LibraryCache(60, persist_path=self.path)
+        self.assertEqual(warm.get(KEY).etag, '"v2"')
+        self.assertEqual(list(warm.get(KEY).data), SONGS)
+
+    def test_changes_are_written_after_the_delay(self):
+        cache = LibraryCache(60, persist_path=self.path, save_delay=0.05)
+        self.addCleanup(cache.close)
+        cache.store(KEY, SONGS)
+        deadline = time.monotonic() + 5
+        while not os.path.exists(self.path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+
+    def test_invalidate_is_persisted(self):
+        cache = LibraryCache(60, persist_path=self.path, save_delay=60)
+        cache.store(KEY, SONGS)
+        cache.invalidate()
+        cache.close()
+        self.assertIsNone(LibraryCache(60, persist_path=self.path).get(KEY))
+
+    def test_freshness_and_validators(self):
+        cache = LibraryCache(60)
+        cache.store(KEY, SONGS, etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        entry = cache.get(KEY)
+        self.assertTrue(entry.is_fresh(60))
+        self.assertFalse(entry.is_fresh(0))
+        self.assertEqual(entry.validators(), {"If-None-Match": '"v1"',
+                                              "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for cooperative cancellation of shell commands.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import asyncio
+import contextvars
+import io
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from utils.cancellation import Cancelled, cancellable, cancelled, check, sleep
+from utils.repl import Shell
+
+
+class CheckpointTests(unittest.TestCase):
+    def test_no_op_outside_a_command(self):
+        self.assertFalse(cancelled())
+        check()
+        sleep(0)
+
+    def test_checkpoints_raise_once_cancelled(self):
+        event = threading.Event()
+        with cancellable(event):
+            check()
+            event.set()
+            with self.assertRaises(Cancelled):
+                check()
+        check()  # the event only applies inside the block
+
+    def test_sleep_ends_early(self):
+        event = threading.Event()
+        threading.Timer(0.05, event.set).start()
+        start = time.monotonic()
+        with cancellable(event), self.assertRaises(Cancelled):
+            sleep(10)
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_worker_threads_see_the_cancel(self):
+        event = threading.Event()
+        event.set()
+        with cancellable(event), ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(contextvars.copy_context().run, check)
+            with self.assertRaises(Cancelled):
+                future.result()
+
+
+class ShellCancelTests(unittest.TestCase):
+    def test_cancel_stops_the_command_at_a_checkpoint(self):
+        unwound = threading.Event()
+
+        def command(_):
+            try:
+                sleep(10)
+            finally:
+                unwound.set()
+            return True
+
+        async def scenario():
+            shell = Shell(terminal=io.StringIO())
+            shell.loop = asyncio.get_running_loop()
+            with mock.patch("utils.repl.handle_command", command):
+                job = shell.start("watch")
+                shell.cancel(job)
+                self.assertTrue(await job.future)
+                await asyncio.to_thread(job.thread.join, 5)
+            self.assertFalse(job.thread.is_alive())
+            self.assertIn("'watch' cancelled.", shell.terminal.getvalue())
+
+        asyncio.run(scenario())
+        self.assertTrue(unwound.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
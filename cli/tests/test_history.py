@@ -0,0 +1,35 @@
+"""
+Tests for the command history.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from utils.history import CommandHistory
+
+
+class CommandHistoryTests(unittest.TestCase):
+    def setUp(self):
+        self.history = CommandHistory(size=3)
+        for command in ("play", "next", "current", "songs"):
+            self.history.add(command)
+
+    def test_keeps_the_newest_entries(self):
+        self.assertEqual(self.history.tail(), [(2, "next"), (3, "current"), (4, "songs")])
+        self.assertIsNone(self.history.get(1))
+        self.assertEqual(self.history.last(), "songs")
+
+    def test_tail(self):
+        self.assertEqual(self.history.tail(2), [(3, "current"), (4, "songs")])
+        self.assertEqual(self.history.tail(10), self.history.tail())
+        self.assertEqual(self.history.tail(0), [])
+
+    def test_search(self):
+        self.assertEqual(self.history.search("curr"), [(3, "current")])
+        self.assertEqual(self.history.search("play"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
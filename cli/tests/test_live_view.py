@@ -0,0 +1,58 @@
+"""
+Tests for the in-place terminal block used by `watch`.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import io
+import re
+import unittest
+from unittest import mock
+
+from utils.live_view import LiveView
+
+ESCAPES = re.compile(r"\x1b\[\d*[A-Za-z]|\r")
+
+
+class FakeTerminal(io.StringIO):
+    def isatty(self):
+        return True
+
+
+def rows(text):
+    # The text each escape-separated piece of a frame puts on screen
+    return [piece for piece in ESCAPES.split(text.replace("\n", "\x1b[n")) if piece]
+
+
+class LiveViewTests(unittest.TestCase):
+    def test_long_lines_are_cut_to_the_terminal_width(self):
+        terminal = FakeTerminal()
+        view = LiveView(terminal)
+        with mock.patch("utils.live_view.terminal_width", return_value=20):
+            view.update(["Now playing: x", "  FilePath: " + "/very/long/path" * 5])
+            view.update(["Now playing: y", "  FilePath: " + "/other/long/path" * 5])
+        self.assertTrue(rows(terminal.getvalue()))
+        for row in rows(terminal.getvalue()):
+            self.assertLessEqual(len(row), 19)
+
+    def test_only_changed_lines_are_rewritten(self):
+        terminal = FakeTerminal()
+        view = LiveView(terminal)
+        with mock.patch("utils.live_view.terminal_width", return_value=80):
+            view.update(["a", "b", "c"])
+            terminal.seek(0)
+            terminal.truncate()
+            view.update(["a", "B", "c"])
+        self.assertEqual(rows(terminal.getvalue()), ["B"])
+
+    def test_plain_output_when_not_a_terminal(self):
+        stream = io.StringIO()
+        view = LiveView(stream)
+        view.update(["x" * 200])
+        view.update(["x" * 200])
+        self.assertEqual(stream.getvalue(), "x" * 200 + "\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""
+Tests for per-command outcomes and the offline record batch mode reports.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import contextvars
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.batch import BatchResult
+from utils.outcome import report_offline, served_offline, track
+
+
+class OfflineTests(unittest.TestCase):
+    def test_each_command_is_told_once(self):
+        for _ in range(2):
+            with track() as outcome:
+                self.assertTrue(report_offline("list", "backend unreachable", 200.0))
+                self.assertFalse(report_offline("current", "backend unreachable", 100.0))
+            self.assertEqual(outcome.offline, "backend unreachable")
+            self.assertEqual(outcome.synced_at, 100.0)
+
+    def test_always_told_outside_a_command(self):
+        self.assertTrue(report_offline("list", "backend unreachable", 0.0))
+        self.assertTrue(report_offline("list", "backend unreachable", 0.0))
+        self.assertFalse(served_offline("list"))
+
+    def test_worker_threads_report_to_their_command(self):
+        with track() as outcome:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                executor.submit(contextvars.copy_context().run, report_offline,
+                                "current", "backend slow", 50.0).result()
+            self.assertTrue(served_offline("current"))
+            self.assertFalse(served_offline("list"))
+        self.assertEqual(outcome.offline, "backend slow")
+        self.assertFalse(served_offline("current"))
+
+
+class BatchRecordTests(unittest.TestCase):
+    def test_offline_fields_only_when_served_offline(self):
+        result = BatchResult("ls")
+        self.assertNotIn("offline", json.loads(result.to_json()))
+        result.offline, result.synced_at = "backend unreachable", 0.0
+        record = json.loads(result.to_json())
+        self.assertEqual(record["offline"], "backend unreachable")
+        self.assertEqual(record["synced_at"], "1970-01-01T00:00:00+00:00")
+
+
+if __name__ == "__main__":
+    unittest.main()
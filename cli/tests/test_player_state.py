@@ -0,0 +1,86 @@
+"""
+Tests for the local player model and how ApiClient feeds it.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from helpers import FakeClock
+from utils.api import ApiClient
+from utils.player_state import PAUSED, PLAYING, UNKNOWN, PlayerState
+
+SONGS = [{"title": f"Track {i}", "filePath": f"/music/{i}.mp3", "duration": "03:00", "artist": "A"}
+         for i in range(3)]
+
+
+class PlayerStateTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.player = PlayerState(ttl=15, clock=self.clock)
+
+    def test_unknown_until_confirmed(self):
+        self.assertIs(self.player.current(), UNKNOWN)
+        self.player.observe(SONGS[0], SONGS)
+        self.assertEqual(self.player.current(), SONGS[0])
+
+    def test_next_is_predicted_and_confirmed_by_the_reply(self):
+        self.player.observe(SONGS[2], SONGS)
+        intent = self.player.begin("next", SONGS)
+        self.player.settle(intent, {"message": "Playing: Track 0"})  # wraps around
+        self.assertEqual(self.player.current(), SONGS[0])
+        self.assertEqual(self.player.status, PLAYING)
+
+    def test_stale_reply_does_not_undo_a_newer_command(self):
+        self.player.observe(SONGS[0], SONGS)
+        first = self.player.begin("play", SONGS)
+        second = self.player.begin("pause", SONGS)
+        self.player.settle(second, {"message": "Music paused."})
+        self.player.settle(first, {"message": "Playing: Track 0"})
+        self.assertEqual(self.player.status, PAUSED)
+
+    def test_observe_is_ignored_while_a_command_is_in_flight(self):
+        self.player.observe(SONGS[0], SONGS)
+        intent = self.player.begin("stop", SONGS)
+        self.player.observe(SONGS[0], SONGS)
+        self.assertIsNone(self.player.current())
+        self.player.settle(intent, {"message": "Music stopped."})
+
+    def test_expires_after_ttl(self):
+        self.player.observe(SONGS[0], SONGS)
+        self.clock.now = 14
+        self.assertEqual(self.player.current(), SONGS[0])
+        self.clock.now = 15
+        self.assertIs(self.player.current(), UNKNOWN)
+
+    def test_expires_at_the_end_of_the_track(self):
+        self.player.ttl = 600
+        self.player.observe(SONGS[0], SONGS)
+        self.clock.now = 179
+        self.assertEqual(self.player.current(), SONGS[0])
+        self.clock.now = 180
+        self.assertIs(self.player.current(), UNKNOWN)
+
+
+class InterruptedRequestTests(unittest.TestCase):
+    def test_interrupted_command_is_settled(self):
+        player = PlayerState()
+        client = ApiClient("http://127.0.0.1:9/api/Music", player=player)
+
+        def interrupted(*args, **kwargs):
+            raise KeyboardInterrupt
+
+        client._exchange = interrupted
+        try:
+            with self.assertRaises(KeyboardInterrupt):
+                client.request("next", method="POST")
+            self.assertEqual(player._in_flight, 0)
+            player.observe(SONGS[1], SONGS)  # no longer dropped
+            self.assertEqual(player.current(), SONGS[1])
+        finally:
+            client.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Differential test of utils.sanitization.sanitize_input against the original
+multi-pass implementation, which is kept below as the reference.
+
+Every input in the corpus (hand-picked edge cases plus seeded random strings
+built from the characters and words the patterns care about) must produce
+the same output, or raise the same exception, in both implementations.
+benchmarks/bench_sanitizer.py times the two.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import html
+import random
+import re
+import unicodedata
+import unittest
+
+from utils.sanitization import sanitize_input
+
+RANDOM_SAMPLES = 20000
+SEED = 1337
+
+
+# --- Reference implementation (verbatim behaviour of the original module) ---
+
+def legacy_sanitize_sql(input_string):
+    sql_patterns = [
+        re.compile(r'--'),
+        re.compile(r';'),
+        re.compile(r'\'"'),
+        re.compile(r'`'),
+        re.compile(r'\bOR\b', re.IGNORECASE),
+        re.compile(r'\bAND\b', re.IGNORECASE)
+    ]
+    sanitized_string = input_string
+    for pattern in sql_patterns:
+        sanitized_string = pattern.sub("", sanitized_string)
+    return sanitized_string
+
+
+def legacy_sanitize_code(input_string):
+    code_patterns = [
+        re.compile(r'<script\b[^<]*(?:(?!<\/script>)<[^<]*)*<\/script>', re.IGNORECASE),
+        re.compile(r'<[^>]+>'),
+        re.compile(r'&lt;[^&gt;]+&gt;'),
+        re.compile(r'`'),
+        re.compile(r'\$\('),
+        re.compile(r';'),
+        re.compile(r'\|\|'),
+        re.compile(r'\&\&'),
+        re.compile(r'\|'),
+    ]
+    sanitized_string = input_string
+    for pattern in code_patterns:
+        sanitized_string = pattern.sub("", sanitized_string)
+    return sanitized_string
+
+
+def legacy_sanitize_input(input_string):
+    try:
+        input_string.encode('utf-8').decode('utf-8')
+        valid = True
+    except UnicodeDecodeError:
+        valid = False
+    if not valid:
+        raise ValueError("Input contains invalid Unicode characters.")
+    input_string = ''.join(c for c in input_string if unicodedata.category(c) != 'Cn')
+    input_string = html.escape(input_string)
+    input_string = legacy_sanitize_sql(input_string)
+    input_string = legacy_sanitize_code(input_string)
+    return input_string
+
+
+# --- Corpus ---
+
+EDGE_CASES = [
+    "", "play", "songs --page 2 --size 20", "history", "cls", "exit",
+    "o--r", "a;nd", "-;-", "---", "----", "$(ls)", "$$((", "$;(", "$|(", "||", "|||",
+    "&&", "a && b || c", "x or y", "X OR Y and z", "orchestra", "band", "or", "AND",
+    "<script>alert(1)</script>", "<b>bold</b>", "&lt;b&gt;", "'\"", "`rm -rf`",
+    "1' OR '1'='1", "robert'); drop table students;--", "café", "͸x͸",
+    " or ", "naïve and", "\ud800", "emoji \U0001f3b5 or", "ÓR",
+]
+
+FRAGMENTS = [
+    "-", "--", ";", "`", "'", '"', "<", ">", "&", "$", "(", ")", "|", " ", "_",
+    "or", "OR", "Or", "and", "AND", "script", "/script", "lt", "gt", "amp", "#x27",
+    "a", "z", "9", "é", "͸", " ", "\U0001f3b5",
+]
+
+
+def build_corpus(samples, seed):
+    rng = random.Random(seed)
+    corpus = list(EDGE_CASES)
+    for _ in range(samples):
+        corpus.append("".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 16))))
+    return corpus
+
+
+def _outcome(fn, value):
+    try:
+        return ("ok", fn(value))
+    except Exception as e:
+        return ("error", type(e).__name__, str(e))
+
+
+class DifferentialTests(unittest.TestCase):
+    def assert_same(self, corpus):
+        for value in corpus:
+            expected = _outcome(legacy_sanitize_input, value)
+            self.assertEqual(_outcome(sanitize_input, value), expected, f"input {value!r}")
+
+    def test_edge_cases(self):
+        self.assert_same(EDGE_CASES)
+
+    def test_random_corpus(self):
+        self.assert_same(build_corpus(RANDOM_SAMPLES, SEED)[len(EDGE_CASES):])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Tests for `find` query parsing and the search index.
+
+Run from the cli/ directory:
+    python -m unittest discover tests
+"""
+
+import unittest
+
+from utils.search import SearchIndex, parse_query
+
+SONGS = [
+    {"title": "Don't Stop Me Now", "filePath": "/music/0.mp3", "duration": "03:29", "artist": "Queen"},
+    {"title": "Baba O'Riley", "filePath": "/music/1.mp3", "duration": "05:08", "artist": "The Who"},
+    {"title": "Stop", "filePath": "/music/2.mp3", "duration": "04:15", "artist": "Spice Girls"},
+]
+
+
+def titles(query, limit=10):
+    _, matches = SearchIndex(SONGS).search(parse_query(query), limit=limit)
+    return [song["title"] for _, song in matches]
+
+
+class ParseQueryTests(unittest.TestCase):
+    def test_apostrophes_are_not_quotes(self):
+        query = parse_query("don't stop")
+        self.assertEqual(query.words, [(None, "don"), (None, "t"), (None, "stop")])
+
+    def test_double_quotes_group_a_phrase(self):
+        query = parse_query('artist:"the who" baba')
+        self.assertEqual(query.words, [("artist", "the"), ("artist", "who"), (None, "baba")])
+        self.assertEqual(query.phrases, [("artist", "the who")])
+
+    def test_unclosed_quote_runs_to_the_end(self):
+        self.assertEqual(parse_query('"stop me').phrases, [(None, "stop me")])
+
+    def test_duration_filter(self):
+        self.assertEqual(parse_query("duration>4:00").duration_filters, [(">", 240)])
+        with self.assertRaises(ValueError):
+            parse_query("duration>soon")
+
+
+class SearchTests(unittest.TestCase):
+    def test_apostrophe_query_finds_the_title(self):
+        self.assertEqual(titles("don't stop")[0], "Don't Stop Me Now")
+        self.assertEqual(titles("o'riley"), ["Baba O'Riley"])
+
+    def test_field_and_duration(self):
+        self.assertEqual(titles("artist:queen"), ["Don't Stop Me Now"])
+        self.assertEqual(titles("stop duration>4:00"), ["Stop"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,31 +1,592 @@
+import contextvars
+import json
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
 import requests
-from utils.constants import API_URL, ERROR_UNABLE_TO_CONNECT, ERROR_HTTP, ERROR_REQUEST
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.backends import BackendPool
+from utils.cache import LibraryCache
+from utils.cancellation import check
+from utils.json_stream import iter_json_array
+from utils.logging_config import logger
+from utils.metrics import metrics
+from utils.models import Song, decode_payload
+from utils.outcome import fail, report_failure, report_offline, track
+from utils.player_state import ACTIONS as PLAYER_ACTIONS, UNKNOWN, PlayerState
+from utils.output import capture
+from utils.replica import LibraryReplica, format_age
+from utils.constants import (
+    API_URL,
+    API_URLS,
+    API_READ_ENDPOINTS,
+    API_HEDGE_DELAY,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_POOL_CONNECTIONS,
+    API_POOL_MAXSIZE,
+    API_MAX_RETRIES,
+    API_RETRY_BACKOFF,
+    API_RETRY_STATUSES,
+    API_FANOUT_WORKERS,
+    API_STREAM_CHUNK_SIZE,
+    API_EVENT_READ_TIMEOUT,
+    WATCH_EVENTS_ENDPOINT,
+    CACHED_ENDPOINTS,
+    LIBRARY_CACHE_TTL,
+    LIBRARY_CACHE_FILE,
+    LIBRARY_CACHE_PERSIST,
+    LIBRARY_SAFE_MUTATIONS,
+    REPLICA_ENABLED,
+    REPLICA_FILE,
+    REPLICA_ENDPOINTS,
+    REPLICA_SLOW_AFTER,
+    REPLICA_REFRESH_INTERVAL,
+    ERROR_UNABLE_TO_CONNECT,
+    ERROR_TIMEOUT,
+    ERROR_HTTP,
+    ERROR_REQUEST,
+)
 
-def send_request(endpoint, method='GET', data=None):
-    try:
-        url = f"{API_URL}/{endpoint}"
-        if method == 'POST':
-            response = requests.post(url, json=data)
+
+class ApiClient:
+    """
+    Persistent HTTP client for the Music API.
+
+    Holds a single requests.Session so every command reuses pooled keep-alive
+    connections instead of paying TCP setup per call. Connect/read timeouts are
+    always applied, and failed connects or idempotent GETs are retried a bounded
+    number of times with exponential backoff. Transport POSTs are never retried
+    once the request has reached the backend.
+
+    When a LibraryCache is attached, GETs for the listing endpoints are served
+    from it and revalidated conditionally once their TTL has expired.
+
+    With several backends, the first is the primary and takes every mutating
+    call. Reads (API_READ_ENDPOINTS) rotate over the backends whose circuit
+    breaker is closed, fail over to the next one on a transport error or 5xx,
+    and are hedged: a read still unanswered after `hedge_delay` is also sent
+    to a second backend, and the first good answer wins.
+
+    With a LibraryReplica attached, every answer for the library and the
+    current song is copied into it, and REPLICA_ENDPOINTS are answered from it
+    (with a staleness notice) when no backend can answer or the answer takes
+    longer than `replica_slow_after` (when set).
+
+    Answers for `songs` and `current` are decoded into a SongList and a Song
+    (utils.models) rather than plain dicts.
+
+    With a PlayerState attached, transport commands update it optimistically
+    and settle it from their replies, and every `current` answer refreshes it.
+    """
+
+    def __init__(self, base_url=API_URL, connect_timeout=API_CONNECT_TIMEOUT,
+                 read_timeout=API_READ_TIMEOUT, pool_connections=API_POOL_CONNECTIONS,
+                 pool_maxsize=API_POOL_MAXSIZE, max_retries=API_MAX_RETRIES,
+                 backoff_factor=API_RETRY_BACKOFF, cache=None, base_urls=None,
+                 hedge_delay=API_HEDGE_DELAY, replica=None, replica_slow_after=REPLICA_SLOW_AFTER,
+                 player=None):
+        self.pool = BackendPool(list(base_urls) if base_urls else [base_url])
+        # Cache keys always use the primary, whichever backend answered
+        self.base_url = self.pool.primary.url
+        self.timeout = (connect_timeout, read_timeout)
+        self.cache = cache
+        self.hedge_delay = hedge_delay
+        self._hedge_executor = None
+        self.replica = replica
+        self.replica_slow_after = replica_slow_after
+        self._replica_executor = None
+        self.player = player
+        self.session = requests.Session()
+
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=API_RETRY_STATUSES,
+            allowed_methods=frozenset({'GET'}),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=retry,
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        # Reads that fail on a secondary backend fail over to another one, so
+        # retrying them in place would only delay that
+        for backend in self.pool.backends[1:]:
+            self.session.mount(backend.url + '/', HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize))
+
+    def url_for(self, endpoint):
+        return f"{self.base_url}/{endpoint}"
+
+    def request(self, endpoint, method='GET', data=None):
+        if method == 'GET':
+            if self.replica is not None and endpoint in REPLICA_ENDPOINTS:
+                return self._replicated_get(endpoint)
+            return self._get(endpoint)[0]
+        intent = None
+        if method == 'POST' and self.player is not None and endpoint in PLAYER_ACTIONS:
+            intent = self.player.begin(endpoint, self.cached_listing())
+        response = payload = None
+        try:
+            response, payload = self._exchange(endpoint, method=method, data=data)
+        finally:
+            # Also when the exchange is interrupted (Ctrl+C, a cancelled job):
+            # an unsettled intent would keep observe() ignoring `current`
+            if intent is not None:
+                self.player.settle(intent, payload if response is not None else None)
+        if (method == 'POST' and response is not None and self.cache is not None
+                and endpoint not in LIBRARY_SAFE_MUTATIONS):
+            self.cache.invalidate()
+        return payload
+
+    def cached_listing(self):
+        # The cached `songs` listing, however old, without touching the network
+        entry = self.cache.get(self.url_for("songs")) if self.cache is not None else None
+        return entry.data if entry is not None else None
+
+    def _get(self, endpoint):
+        # Returns (payload, as_of): as_of is when the backend last vouched for
+        # the payload, or None when no backend gave a usable answer
+        if self.cache is not None and endpoint in CACHED_ENDPOINTS:
+            payload, as_of = self._cached_get(endpoint)
         else:
-            response = requests.get(url)
-        # --- NEW LOGIC START ---
-        # If it's a 404, we just return None silently without raising an error.
-        # This handles the "nothing is playing" state.
-        if response.status_code == 404:
+            response, payload = self._exchange(endpoint)
+            as_of = time.time() if response is not None else None
+        if as_of is not None and self.replica is not None:
+            self.replica.record(endpoint, payload, as_of)
+        if as_of is not None and endpoint == "current" and self.player is not None:
+            self.player.observe(payload, self.cached_listing())
+        return payload, as_of
+
+    def _cached_get(self, endpoint):
+        key = self.url_for(endpoint)
+        entry = self.cache.get(key)
+        if entry is not None and entry.is_fresh(self.cache.ttl):
+            return entry.data, entry.fetched_at
+
+        # Stale or missing: revalidate with whatever validators we hold
+        headers = entry.validators() if entry is not None else None
+        response, payload = self._exchange(endpoint, headers=headers)
+        if response is None:
+            return None, None
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            return entry.data, time.time()
+        if payload is not None:
+            self.cache.store(key, payload,
+                             etag=response.headers.get('ETag'),
+                             last_modified=response.headers.get('Last-Modified'))
+        return payload, time.time()
+
+    def _replicated_get(self, endpoint):
+        # A read the replica can stand in for. With every backend ejected it
+        # answers at once; otherwise the backend is asked first and its error
+        # messages are only shown when the replica has nothing to offer
+        # instead. With replica_slow_after set, a backend that has not
+        # answered after that many seconds is also passed over.
+        if not self.replica.has(endpoint):
+            return self._get(endpoint)[0]
+        if not self.pool.available():
+            return self._from_replica(endpoint, "backend unreachable")
+        if not self.replica_slow_after:
+            with capture() as errors:
+                payload, as_of, error = self._get_detached(endpoint)
+            return payload if as_of is not None else self._fall_back(endpoint, errors, error)
+        if self._replica_executor is None:
+            self._replica_executor = ThreadPoolExecutor(max_workers=API_FANOUT_WORKERS,
+                                                        thread_name_prefix='termina-replica-read')
+        with capture() as errors:
+            # A read abandoned as too slow finishes in the background and
+            # still refreshes the cache and the replica; its output is dropped
+            future = self._replica_executor.submit(contextvars.copy_context().run, self._get_detached, endpoint)
+        try:
+            payload, as_of, error = future.result(timeout=self.replica_slow_after)
+        except FutureTimeout:
+            return self._from_replica(endpoint, "backend slow")
+        return payload if as_of is not None else self._fall_back(endpoint, errors, error)
+
+    def _fall_back(self, endpoint, errors, error):
+        # The backend failed: the replica's copy, or the backend's errors
+        served = self._from_replica(endpoint, "backend unreachable")
+        if served is None:
+            sys.stdout.write(errors.getvalue())
+            report_failure(error)
+        return served
+
+    def _get_detached(self, endpoint):
+        # _get for _replicated_get: failures are not the command's unless the
+        # replica cannot stand in, and a read abandoned as too slow must not
+        # mark whatever runs when it finally fails
+        with track() as outcome:
+            payload, as_of = self._get(endpoint)
+        return payload, as_of, outcome.error
+
+    def _from_replica(self, endpoint, reason):
+        snapshot = self.replica.read(endpoint)
+        if snapshot is None:
             return None
-        # --- NEW LOGIC END ---
-        response.raise_for_status()
-        return response.json()
-    except requests.exceptions.ConnectionError:
-        print(ERROR_UNABLE_TO_CONNECT)
-        return None
-    except requests.exceptions.HTTPError as http_err:
-        print(ERROR_HTTP.format(http_err))
-        return None
-    except requests.exceptions.RequestException as req_err:
-        print(ERROR_REQUEST.format(req_err))
+        payload, synced_at = snapshot
+        # Commands that read several endpoints get one notice, not one each
+        if report_offline(endpoint, reason, synced_at):
+            age = format_age(time.time() - synced_at)
+            if reason == "backend slow":
+                print(f"Backend slow: showing data last synced {age} ago.")
+            else:
+                print(f"Offline ({reason}): showing data last synced {age} ago.")
+        logger.warning("served from the offline replica", extra={"endpoint": endpoint, "reason": reason})
+        return payload
+
+    def _exchange(self, endpoint, method='GET', data=None, headers=None):
+        # Returns (response, parsed JSON). Transport errors are reported here
+        # and come back as (None, None).
+        start = time.perf_counter()
+        try:
+            if method == 'GET' and endpoint in API_READ_ENDPOINTS:
+                response = self._read(endpoint, headers)
+            else:
+                response = self._attempt(self.pool.primary, endpoint, method, data, headers)
+            # If it's a 404, we just return None silently without raising an error.
+            # This handles the "nothing is playing" state.
+            if response.status_code == 404:
+                return response, None
+            response.raise_for_status()
+            if response.status_code == 304:
+                return response, None
+            return response, decode_payload(endpoint, response.content)
+        # Every attempt has already been counted in the metrics by _attempt
+        except requests.exceptions.Timeout:
+            fail(ERROR_TIMEOUT)
+            self._log_failure(endpoint, method, start, "timeout", record=False)
+        except requests.exceptions.ConnectionError:
+            fail(ERROR_UNABLE_TO_CONNECT)
+            self._log_failure(endpoint, method, start, "connection failed", record=False)
+        except requests.exceptions.HTTPError as http_err:
+            fail(ERROR_HTTP.format(http_err))
+            self._log_failure(endpoint, method, start, str(http_err), http_err.response.status_code,
+                              record=False)
+        except (requests.exceptions.RequestException, ValueError) as req_err:
+            fail(ERROR_REQUEST.format(req_err))
+            self._log_failure(endpoint, method, start, str(req_err), record=False)
+        return None, None
+
+    def _attempt(self, backend, endpoint, method='GET', data=None, headers=None):
+        # One request to one backend. Feeds that backend's circuit breaker and
+        # the metrics, and raises transport errors to the caller.
+        check()
+        start = time.perf_counter()
+        url = f"{backend.url}/{endpoint}"
+        try:
+            if method == 'POST':
+                response = self.session.post(url, json=data, headers=headers, timeout=self.timeout)
+            else:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            backend.breaker.record_failure()
+            metrics.record_request(method, endpoint, (time.perf_counter() - start) * 1000, error=True)
+            raise
+        if response.status_code >= 500:
+            backend.breaker.record_failure()
+        else:
+            backend.breaker.record_success()
+            backend.observe_latency((time.perf_counter() - start) * 1000)
+        self._observe(endpoint, method, start, response)
+        return response
+
+    def _read(self, endpoint, headers=None):
+        # Try backends in rotation until one answers below 500. The last
+        # transport error is raised, or the last 5xx response returned, when
+        # none does.
+        hedge = self.hedge_delay > 0 and len(self.pool) > 1
+        tried = []
+        backend = self.pool.pick_for_read()
+        while True:
+            tried.append(backend)
+            failure = None
+            try:
+                if hedge:
+                    response = self._hedged(backend, endpoint, headers, tried)
+                else:
+                    response = self._attempt(backend, endpoint, headers=headers)
+                if response.status_code < 500:
+                    return response
+            except requests.exceptions.RequestException as e:
+                failure = e
+            backend = self.pool.pick(exclude=tried)
+            if backend is None:
+                if failure is not None:
+                    raise failure
+                return response
+
+    def _hedged(self, backend, endpoint, headers, tried):
+        # Send the read to `backend`; if it is still pending after hedge_delay,
+        # send it to one more backend and take whichever answers well first.
+        # Each attempt runs in its own copy of the caller's context.
+        if self._hedge_executor is None:
+            self._hedge_executor = ThreadPoolExecutor(max_workers=2 * API_FANOUT_WORKERS,
+                                                      thread_name_prefix='termina-hedge')
+        submit = lambda target: self._hedge_executor.submit(
+            contextvars.copy_context().run, self._attempt, target, endpoint, 'GET', None, headers)
+        first = submit(backend)
+        try:
+            return first.result(timeout=self.hedge_delay)
+        except FutureTimeout:
+            # At least this slow; steers the next picks away before the
+            # attempt completes and reports its real latency
+            backend.observe_latency(self.hedge_delay * 1000)
+        # Whenever an attempt fails, the next backend in rotation is tried
+        # while the others stay pending, so at most two are in flight
+        failure, fallback = None, None
+        pending = {first}
+        while pending:
+            backup = self.pool.pick(exclude=tried)
+            if backup is not None:
+                tried.append(backup)
+                pending.add(submit(backup))
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    response = future.result()
+                except requests.exceptions.RequestException as e:
+                    failure = e
+                    continue
+                if response.status_code < 500:
+                    return response  # a slower attempt finishes in the background
+                fallback = response
+        if fallback is not None:
+            return fallback
+        raise failure
+
+    def _observe(self, endpoint, method, start, response, bytes_received=None):
+        # Record latency, status and payload sizes for a completed exchange.
+        # A 404 is the normal "nothing playing" answer, not an error.
+        latency_ms = (time.perf_counter() - start) * 1000
+        status = response.status_code
+        if bytes_received is None:
+            bytes_received = len(response.content)
+        body = response.request.body if response.request is not None else None
+        metrics.record_request(method, endpoint, latency_ms,
+                               error=status >= 400 and status != 404,
+                               bytes_received=bytes_received,
+                               bytes_sent=len(body) if body else 0)
+        logger.debug("api request", extra={
+            "endpoint": endpoint, "method": method, "http_status": status,
+            "latency_ms": round(latency_ms, 2), "bytes": bytes_received})
+
+    def _log_failure(self, endpoint, method, start, reason, status=None, record=True):
+        # record=False when _observe already counted the exchange
+        latency_ms = (time.perf_counter() - start) * 1000
+        if record:
+            metrics.record_request(method, endpoint, latency_ms, error=True)
+        logger.error(f"API request failed: {reason}", extra={
+            "endpoint": endpoint, "method": method, "http_status": status,
+            "latency_ms": round(latency_ms, 2)})
+
+    def iter_items(self, endpoint, chunk_size=API_STREAM_CHUNK_SIZE):
+        # Stream a JSON array response element by element. A fresh cached copy
+        # is reused; otherwise the body is decoded incrementally and never held
+        # in memory as a whole. A backend that fails before the first element
+        # is handed out is skipped for the next one; after that the stream
+        # cannot be resumed elsewhere.
+        # When every backend fails before that, the replica stands in.
+        if self.cache is not None and endpoint in CACHED_ENDPOINTS:
+            entry = self.cache.get(self.url_for(endpoint))
+            if entry is not None and entry.is_fresh(self.cache.ttl):
+                yield from entry.data
+                return
+        has_replica = self.replica is not None and endpoint in REPLICA_ENDPOINTS and self.replica.has(endpoint)
+        if has_replica and not self.pool.available():
+            yield from self._from_replica(endpoint, "backend unreachable") or []
+            return
+        tried = []
+        backend = self.pool.pick_for_read()
+        while backend is not None:
+            tried.append(backend)
+            failed_before_data = yield from self._stream_from(backend, endpoint, chunk_size, has_replica)
+            backend = self.pool.pick(exclude=tried) if failed_before_data else None
+            if failed_before_data and backend is None:
+                yield from self._from_replica(endpoint, "backend unreachable") or []
+
+    def _stream_from(self, backend, endpoint, chunk_size, fallback=False):
+        # Returns True if the backend failed before yielding anything and
+        # another backend (or, with `fallback`, the replica) may take over;
+        # errors are reported only when nothing may
+        start = time.perf_counter()
+        received = [0]
+        response = None
+        yielded = False
+
+        def counted(chunks):
+            for chunk in chunks:
+                check()
+                received[0] += len(chunk)
+                yield chunk
+
+        def can_fail_over():
+            if yielded:
+                return False
+            return fallback or self.pool.available(exclude=[backend])
+
+        try:
+            with self.session.get(f"{backend.url}/{endpoint}", stream=True, timeout=self.timeout) as response:
+                try:
+                    if response.status_code >= 500:
+                        backend.breaker.record_failure()
+                    else:
+                        backend.breaker.record_success()
+                    if response.status_code == 404:
+                        return False
+                    response.raise_for_status()
+                    items = iter_json_array(counted(response.iter_content(chunk_size=chunk_size)))
+                    if endpoint == "songs":
+                        items = map(Song.from_dict, items)
+                    for item in items:
+                        yielded = True
+                        yield item
+                finally:
+                    # Measured until the caller stops reading (or the body ends)
+                    self._observe(endpoint, 'GET', start, response, bytes_received=received[0])
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            backend.breaker.record_failure()
+            if can_fail_over():
+                if response is None:
+                    metrics.record_request('GET', endpoint, (time.perf_counter() - start) * 1000, error=True)
+                return True
+            if isinstance(e, requests.exceptions.Timeout):
+                fail(ERROR_TIMEOUT)
+                self._log_failure(endpoint, 'GET', start, "timeout", record=response is None)
+            else:
+                fail(ERROR_UNABLE_TO_CONNECT)
+                self._log_failure(endpoint, 'GET', start, "connection failed", record=response is None)
+        except requests.exceptions.HTTPError as http_err:
+            if http_err.response.status_code >= 500 and can_fail_over():
+                return True
+            fail(ERROR_HTTP.format(http_err))
+            self._log_failure(endpoint, 'GET', start, str(http_err), http_err.response.status_code,
+                              record=False)
+        except (requests.exceptions.RequestException, ValueError) as req_err:
+            fail(ERROR_REQUEST.format(req_err))
+            self._log_failure(endpoint, 'GET', start, str(req_err), record=response is None)
+        return False
+
+    def open_event_stream(self, endpoint, read_timeout=API_EVENT_READ_TIMEOUT):
+        # Open a Server-Sent Events stream and return an iterator of decoded
+        # event payloads, or None when the backend does not offer one
+        try:
+            # Player state follows `current`: spread only when that is
+            backend = self.pool.pick_for_read() if 'current' in API_READ_ENDPOINTS else self.pool.primary
+            response = self.session.get(f"{backend.url}/{endpoint}", stream=True,
+                                        headers={'Accept': 'text/event-stream'},
+                                        timeout=(self.timeout[0], read_timeout))
+        except requests.exceptions.RequestException:
+            return None
+        content_type = response.headers.get('Content-Type', '')
+        if response.status_code != 200 or not content_type.startswith('text/event-stream'):
+            response.close()
+            return None
+        response.encoding = 'utf-8'
+        return self._iter_events(response)
+
+    def _iter_events(self, response):
+        data_lines = []
+        try:
+            with response:
+                # Events are small; read byte-wise so each one is delivered
+                # as soon as it arrives instead of waiting for a full chunk
+                for line in response.iter_lines(chunk_size=1, decode_unicode=True):
+                    check()
+                    if line.startswith('data:'):
+                        data_lines.append(line[6:] if line.startswith('data: ') else line[5:])
+                    elif not line and data_lines:
+                        yield json.loads('\n'.join(data_lines))
+                        data_lines = []
+        except (requests.exceptions.RequestException, ValueError):
+            return  # stream dropped; callers fall back to polling
+
+    def close(self):
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        if self._replica_executor is not None:
+            self._replica_executor.shutdown(wait=False)
+        if self.replica is not None:
+            self.replica.close()  # lets queued writes finish
+        if self.cache is not None:
+            self.cache.close()  # writes a pending change to disk
+        self.session.close()
+
+
+# Shared client used by every command for the lifetime of the shell
+_client = None
+# Worker pool for fanning out independent requests, created on first use
+_executor = None
+
+def get_client():
+    global _client
+    if _client is None:
+        cache = LibraryCache(LIBRARY_CACHE_TTL,
+                             persist_path=LIBRARY_CACHE_FILE if LIBRARY_CACHE_PERSIST else None)
+        replica = LibraryReplica(REPLICA_FILE) if REPLICA_ENABLED else None
+        _client = ApiClient(cache=cache, base_urls=API_URLS or None, replica=replica, player=PlayerState())
+    return _client
+
+def start_replica_sync(interval=REPLICA_REFRESH_INTERVAL):
+    # Keep the offline replica (and the library cache) current from a daemon
+    # thread while the interactive shell waits for input. The first sync runs
+    # at once, so an empty replica is filled early.
+    client = get_client()
+    if client.replica is None or interval <= 0:
         return None
 
+    def sync():
+        while _client is client:
+            with capture():  # errors would land in the middle of the prompt
+                client._get("songs")
+            time.sleep(interval)
+
+    thread = threading.Thread(target=sync, name='termina-replica-sync', daemon=True)
+    thread.start()
+    return thread
+
+def invalidate_library_cache():
+    client = get_client()
+    if client.cache is not None:
+        client.cache.invalidate()
+
+def close_client():
+    global _client, _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def fetch_concurrently(*calls):
+    # Run independent API helpers in parallel so the caller waits for the
+    # slowest round trip rather than the sum of all of them. Results come
+    # back in the same order as the calls.
+    global _executor
+    if len(calls) <= 1:
+        return [call() for call in calls]
+    get_client()  # create the shared session before worker threads race for it
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=API_FANOUT_WORKERS,
+                                       thread_name_prefix='termina-api')
+    # Each call runs in a copy of the caller's context so context-local state
+    # (such as captured batch output) follows it onto the worker thread
+    futures = [_executor.submit(contextvars.copy_context().run, call) for call in calls]
+    return [future.result() for future in futures]
+
+def send_request(endpoint, method='GET', data=None):
+    return get_client().request(endpoint, method=method, data=data)
+
 def play():
     return send_request("play", method='POST')
 
@@ -41,8 +602,23 @@ def next_song():
 def previous_song():
     return send_request("previous", method='POST')
 
-def current_song():  # Remove index parameter
-    return send_request("current")  # NOT "songs/{index}"
+def current_song():
+    # Answered from the local player state while it is fresh, which spares
+    # most commands (ls, songs, current after next/play) a round trip
+    client = get_client()
+    if client.player is not None:
+        song = client.player.current()
+        if song is not UNKNOWN:
+            return song
+    return client.request("current")  # NOT "songs/{index}"
+
+def fetch_current_song():
+    # Always asks the backend, for views that must notice changes made elsewhere
+    return send_request("current")
+
+def current_song_events():
+    # Push updates for the current song, or None if the backend only supports polling
+    return get_client().open_event_stream(WATCH_EVENTS_ENDPOINT)
 
 def get_all_songs():
     return send_request("songs")
@@ -50,5 +626,5 @@ def get_all_songs():
 def list_songs():
     return send_request("list")
 
-
-
+def iter_songs():
+    return get_client().iter_items("songs")
@@ -0,0 +1,138 @@
+# Backend selection for the API client: latency-aware reads, circuit breakers
+
+import threading
+import time
+from utils.constants import API_BREAKER_FAILURES, API_BREAKER_RESET
+
+LATENCY_EWMA_WEIGHT = 0.3  # share of each new sample in a backend's latency average
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker.
+
+    Closed: requests flow. After `failure_threshold` consecutive failures it
+    opens and the backend is skipped. Once `reset_timeout` has passed, one
+    trial request is let through (half-open); its outcome closes the breaker
+    again or re-opens it for another timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold=API_BREAKER_FAILURES, reset_timeout=API_BREAKER_RESET,
+                 clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self):
+        # True if a request may go to this backend now. In the half-open
+        # state only the first caller gets the trial.
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def available(self):
+        # Like allow(), but only looks: no trial is claimed
+        with self._lock:
+            return self.state == self.CLOSED or (
+                self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout)
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+
+class Backend:
+    __slots__ = ("url", "breaker", "latency_ms")
+
+    def __init__(self, url, breaker):
+        self.url = url
+        self.breaker = breaker
+        self.latency_ms = None  # moving average of answered requests
+
+    def observe_latency(self, latency_ms, weight=LATENCY_EWMA_WEIGHT):
+        if self.latency_ms is None:
+            self.latency_ms = latency_ms
+        else:
+            self.latency_ms += weight * (latency_ms - self.latency_ms)
+
+    def __repr__(self):
+        return f"Backend({self.url!r}, {self.breaker.state})"
+
+
+class BackendPool:
+    """
+    The backends a client may talk to. The first one is the primary, which
+    takes every mutating call. Reads go to the faster of the next two
+    backends in rotation whose breakers let them through ("power of two
+    choices"), so a slow backend gets less traffic without starving: it is
+    still measured when it serves as a hedge or is the only choice.
+    """
+
+    def __init__(self, urls, failure_threshold=API_BREAKER_FAILURES, reset_timeout=API_BREAKER_RESET):
+        if not urls:
+            raise ValueError("at least one backend URL is required")
+        self.backends = [Backend(url.rstrip('/'), CircuitBreaker(failure_threshold, reset_timeout))
+                         for url in urls]
+        self.primary = self.backends[0]
+        self._turn = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.backends)
+
+    def pick(self, exclude=()):
+        # Best of the next two eligible backends: not excluded, breaker closed
+        # or due a trial, lower average latency (unmeasured ones first).
+        # Candidates are compared with available(), which has no side
+        # effects; only the backend returned claims its half-open trial.
+        # Returns None when none qualifies.
+        with self._lock:
+            start = self._turn
+            self._turn = (self._turn + 1) % len(self.backends)
+        candidates = [self.backends[(start + offset) % len(self.backends)]
+                      for offset in range(len(self.backends))]
+        exclude = list(exclude)
+        while True:
+            chosen = None
+            for backend in candidates:
+                if backend in exclude or not backend.breaker.available():
+                    continue
+                if chosen is None:
+                    chosen = backend
+                    continue
+                if (backend.latency_ms or 0.0) < (chosen.latency_ms or 0.0):
+                    chosen = backend
+                break
+            if chosen is None or chosen.breaker.allow():
+                return chosen
+            exclude.append(chosen)  # another caller took its trial meanwhile
+
+    def available(self, exclude=()):
+        # False when every breaker (outside `exclude`) is open and none is
+        # due a trial yet
+        return any(backend.breaker.available() for backend in self.backends if backend not in exclude)
+
+    def pick_for_read(self):
+        # Like pick(), but with every breaker open the primary is tried anyway:
+        # failing fast helps nobody when there is nowhere else to go
+        return self.pick() or self.primary
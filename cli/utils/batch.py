@@ -0,0 +1,164 @@
+# Non-interactive execution of command scripts (termina_cli.py -c / -f / stdin)
+
+import contextvars
+import json
+import sys
+import time
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from utils.command_handler import EXIT, lookup
+from utils.constants import BATCH_WORKERS
+from utils.history import add_to_history
+from utils.logging_config import logger
+from utils.metrics import metrics
+from utils.models import to_json
+from utils.outcome import track
+from utils.output import capture, install
+from utils.sanitization import sanitize_input
+
+
+def split_script(text):
+    # Commands are separated by newlines or ';'. Splitting happens before
+    # sanitization, which would otherwise strip the separators. Lines starting
+    # with '#' are comments.
+    commands = []
+    for line in text.splitlines():
+        if line.lstrip().startswith("#"):
+            continue
+        commands.extend(part.strip() for part in line.split(";") if part.strip())
+    return commands
+
+
+class BatchResult:
+    __slots__ = ("command", "ok", "output", "data", "error", "elapsed_ms", "exit", "history_entry",
+                 "offline", "synced_at")
+
+    def __init__(self, command):
+        self.command = command
+        self.ok = True
+        self.output = ""
+        self.data = None
+        self.error = None
+        self.elapsed_ms = 0.0
+        self.exit = False
+        self.history_entry = None  # added to the history by run_batch, in script order
+        self.offline = None        # why the replica answered instead of the backend
+        self.synced_at = None      # when the oldest replica data shown was synced
+
+    def to_json(self):
+        record = {"command": self.command, "ok": self.ok, "elapsed_ms": round(self.elapsed_ms, 2),
+                  "output": self.output}
+        if self.data is not None:
+            record["data"] = self.data
+        if self.error is not None:
+            record["error"] = self.error
+        if self.offline is not None:
+            record["offline"] = self.offline
+            record["synced_at"] = datetime.fromtimestamp(self.synced_at, timezone.utc).isoformat()
+        return json.dumps(record, ensure_ascii=False, default=to_json)
+
+
+def run_one(raw_command):
+    result = BatchResult(raw_command)
+    start = time.perf_counter()
+    with capture() as buffer:
+        try:
+            command = sanitize_input(raw_command.lower())
+            entry, args = lookup(command)
+            if entry is None:
+                result.ok = False
+                result.error = f"Unknown command: {command}"
+            else:
+                command_start = time.perf_counter()
+                failed = True
+                try:
+                    # Handlers print their errors; the outcome says whether they did
+                    with track() as outcome:
+                        value = entry.run(args)
+                    failed = outcome.failed
+                finally:
+                    metrics.record_command(entry.name, (time.perf_counter() - command_start) * 1000,
+                                           error=failed)
+                if outcome.failed:
+                    result.ok = False
+                    result.error = outcome.error
+                result.offline, result.synced_at = outcome.offline, outcome.synced_at
+                if value is EXIT:
+                    result.exit = True
+                else:
+                    result.data = value
+                result.history_entry = command
+        except Exception as e:
+            result.ok = False
+            result.error = str(e)
+            logger.error(f"Batch command '{raw_command}' failed: {e}")
+    result.output = buffer.getvalue()
+    result.elapsed_ms = (time.perf_counter() - start) * 1000
+    logger.info("batch command finished",
+                extra={"command": raw_command, "latency_ms": round(result.elapsed_ms, 2)})
+    return result
+
+
+def plan(commands):
+    # Group consecutive read-only commands so each group can run concurrently;
+    # anything that changes playback state runs alone, in order
+    groups = []
+    for command in commands:
+        try:
+            entry, _ = lookup(sanitize_input(command.lower()))
+        except ValueError:
+            entry = None  # run_one reports the invalid input
+        read_only = entry is not None and entry.read_only
+        if read_only and groups and groups[-1][0]:
+            groups[-1][1].append(command)
+        else:
+            groups.append((read_only, [command]))
+    return groups
+
+
+def emit(result, json_output, stream):
+    if json_output:
+        stream.write(result.to_json() + "\n")
+    else:
+        stream.write(result.output)
+        if result.error and result.error not in result.output:  # handlers print their own
+            stream.write(result.error + "\n")
+    stream.flush()
+
+
+def run_batch(commands, json_output=False, concurrent=True):
+    """
+    Run a list of raw command strings without the interactive prompt.
+
+    Args:
+        commands: Command lines, already split (see split_script)
+        json_output: Emit one JSON object per command instead of plain text
+        concurrent: Run consecutive read-only commands in parallel
+
+    Returns:
+        Process exit code: 0 if every command was recognised and succeeded, else 1
+    """
+    stream = install().stream
+    failed = False
+    executor = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="termina-batch")
+    try:
+        for read_only, group in plan(commands):
+            if concurrent and read_only and len(group) > 1:
+                futures = [executor.submit(contextvars.copy_context().run, run_one, command)
+                           for command in group]
+                results = [future.result() for future in futures]
+            else:
+                results = [run_one(command) for command in group]
+            for result in results:
+                emit(result, json_output, stream)
+                if result.history_entry is not None:
+                    add_to_history(result.history_entry)
+                failed = failed or not result.ok
+                if result.exit:
+                    return 1 if failed else 0
+    finally:
+        executor.shutdown(wait=False)
+        # Batch runs leave playback as-is; only release the shared connection
+        if "utils.api" in sys.modules:
+            sys.modules["utils.api"].close_client()
+    return 1 if failed else 0
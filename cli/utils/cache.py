@@ -0,0 +1,134 @@
+# Client-side cache for the library listing endpoints
+
+import json
+import os
+import threading
+import time
+from utils.constants import LIBRARY_CACHE_SAVE_DELAY
+from utils.models import from_payload, to_json
+
+
+class CacheEntry:
+    __slots__ = ("data", "etag", "last_modified", "fetched_at")
+
+    def __init__(self, data, etag=None, last_modified=None, fetched_at=None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+
+    def is_fresh(self, ttl):
+        return time.time() - self.fetched_at < ttl
+
+    def validators(self):
+        # Conditional request headers, only for validators the server gave us
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self):
+        return {
+            "data": self.data,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "fetched_at": self.fetched_at,
+        }
+
+
+class LibraryCache:
+    """
+    TTL cache for listing responses keyed by endpoint.
+
+    Entries younger than the TTL are served without touching the network.
+    Older entries are kept so they can be revalidated with If-None-Match /
+    If-Modified-Since, which turns an unchanged library into a bodiless 304.
+    When a persist path is given the cache is loaded from and written back to
+    that file, so a new shell starts warm. Writes happen on a timer thread
+    `save_delay` seconds after the first change (and on close()), so the
+    request path never serializes the library and a burst of changes costs
+    one write.
+    """
+
+    def __init__(self, ttl, persist_path=None, save_delay=LIBRARY_CACHE_SAVE_DELAY):
+        self.ttl = ttl
+        self.persist_path = persist_path
+        self.save_delay = save_delay
+        self._entries = {}
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if persist_path:
+            self._load()
+
+    def get(self, endpoint):
+        with self._lock:
+            return self._entries.get(endpoint)
+
+    def store(self, endpoint, data, etag=None, last_modified=None):
+        with self._lock:
+            self._entries[endpoint] = CacheEntry(data, etag, last_modified)
+        self._schedule_save()
+
+    def touch(self, endpoint):
+        # The server confirmed our copy is current (304); restart its TTL
+        with self._lock:
+            entry = self._entries.get(endpoint)
+            if entry is not None:
+                entry.fetched_at = time.time()
+
+    def invalidate(self, endpoint=None):
+        with self._lock:
+            if endpoint is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(endpoint, None)
+        self._schedule_save()
+
+    def _load(self):
+        try:
+            with open(self.persist_path, "r", encoding="utf-8") as cache_file:
+                raw = json.load(cache_file)
+            entries = {endpoint: CacheEntry(**entry) for endpoint, entry in raw.items()}
+            # Keys are URLs; their last segment names the endpoint
+            for endpoint, entry in entries.items():
+                entry.data = from_payload(endpoint.rsplit("/", 1)[-1], entry.data)
+            self._entries = entries
+        except (OSError, ValueError, TypeError):
+            self._entries = {}  # missing or corrupt cache file, start cold
+
+    def _schedule_save(self):
+        if not self.persist_path:
+            return
+        with self._lock:
+            self._dirty = True
+            if self._timer is None:
+                self._timer = threading.Timer(self.save_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        # Write pending changes now: from the timer, or on close()
+        with self._save_lock:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._dirty:
+                    return
+                self._dirty = False
+                snapshot = {endpoint: entry.to_dict() for endpoint, entry in self._entries.items()}
+            try:
+                os.makedirs(os.path.dirname(self.persist_path) or ".", exist_ok=True)
+                temp_path = f"{self.persist_path}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as cache_file:
+                    json.dump(snapshot, cache_file, default=to_json)
+                os.replace(temp_path, self.persist_path)
+            except OSError:
+                pass  # persistence is best-effort; the in-memory cache still works
+
+    def close(self):
+        self.flush()
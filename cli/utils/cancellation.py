@@ -0,0 +1,45 @@
+# Cooperative cancellation of shell commands. A command's thread is never
+# interrupted from outside: the shell sets the command's event, and the
+# command stops at its next checkpoint (before a request, between stream
+# chunks, listing pages and watch refreshes, while the pager waits), where
+# no cache, replica or history write is half done.
+
+import contextvars
+import time
+from contextlib import contextmanager
+
+_event = contextvars.ContextVar("termina_cancel_event", default=None)
+
+
+class Cancelled(KeyboardInterrupt):
+    """Raised at a checkpoint of a cancelled command; unwinds like Ctrl+C."""
+
+
+@contextmanager
+def cancellable(event):
+    # Run the block (and worker threads that copy its context) under `event`
+    token = _event.set(event)
+    try:
+        yield event
+    finally:
+        _event.reset(token)
+
+
+def cancelled():
+    event = _event.get()
+    return event is not None and event.is_set()
+
+
+def check():
+    # A checkpoint; a no-op outside cancellable()
+    if cancelled():
+        raise Cancelled()
+
+
+def sleep(seconds):
+    # time.sleep that a cancel cuts short
+    event = _event.get()
+    if event is None:
+        time.sleep(seconds)
+    elif event.wait(seconds):
+        raise Cancelled()
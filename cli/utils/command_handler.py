@@ -1,65 +1,147 @@
-from commands.play import execute as play
-from commands.pause import execute as pause
-from commands.stop import execute as stop
-from commands.next import execute as next_song
-from commands.previous import execute as previous_song
-from commands.current import execute as current_song
-from commands.about import display_about
-from commands.clear_screen import clear_screen
-from utils.sanitization import sanitize_input
-from utils.history import add_to_history, print_history
-from commands.songs import execute as show_songs
-from commands.ls import execute as list_titles
+import importlib
+import time
+from utils.history import add_to_history, expand_history
+from utils.logging_config import logger
+from utils.metrics import metrics
+from utils.outcome import fail, track
+
+class Command:
+    """
+    One entry in the command registry.
+
+    The handler is named as "module:function" and only imported the first time
+    the command runs, so startup never pays for command modules (or for
+    `requests`, which they pull in through utils.api) that are not used.
+    """
+
+    __slots__ = ("name", "target", "help_text", "aliases", "usage", "takes_args", "read_only", "timeout",
+                 "_handler")
+
+    def __init__(self, name, target, help_text, aliases=(), usage=None, takes_args=False,
+                 read_only=False, timeout=None):
+        self.name = name
+        self.target = target
+        self.help_text = help_text
+        self.aliases = tuple(aliases)
+        self.usage = usage
+        self.takes_args = takes_args
+        self.read_only = read_only  # safe to run concurrently with other read-only commands
+        self.timeout = timeout  # interactive shell deadline in seconds (None: the default, 0: none)
+        self._handler = target if callable(target) else None
+
+    @property
+    def handler(self):
+        if self._handler is None:
+            module_name, _, attribute = self.target.partition(":")
+            self._handler = getattr(importlib.import_module(module_name), attribute)
+        return self._handler
+
+    def run(self, args):
+        if args and not self.takes_args:
+            fail(f"'{self.name}' does not take arguments. Type 'help' to see usage.")
+            return None
+        return self.handler(args) if self.takes_args else self.handler()
+
+
+# Returned by a handler to end the shell
+EXIT = object()
+
+# Registered commands in help order, and every name/alias -> Command
+COMMANDS = []
+COMMAND_LOOKUP = {}
+
+def register(name, target, help_text, aliases=(), usage=None, takes_args=False, read_only=False,
+             timeout=None):
+    command = Command(name, target, help_text, aliases, usage, takes_args, read_only, timeout)
+    COMMANDS.append(command)
+    for key in (name, *command.aliases):
+        COMMAND_LOOKUP[key] = command
+    return command
 
 def stop_playback_on_exit():
     try:
-        stop()
+        importlib.import_module("commands.stop").execute()
     except Exception as e:
         print(f"An unexpected error occurred while stopping playback: {e}")
+    finally:
+        importlib.import_module("utils.api").close_client()
+
+def exit_termina():
+    stop_playback_on_exit()
+    print("Exiting Termina. Goodbye!")
+    return EXIT
+
+def print_help():
+    # Help text is generated from the registry so it never drifts from it
+    labels = ["/".join((command.name, *command.aliases)) for command in COMMANDS]
+    width = max(len(label) for label in labels)
+    print("\nTermina Commands:")
+    for label, command in zip(labels, COMMANDS):
+        print(f"  {label:<{width}}  {command.help_text}")
+        if command.usage:
+            print(f"  {'':<{width}}  {command.usage}")
+    print()
+
+register("current", "commands.current:execute", "Show currently playing song", read_only=True)
+register("songs", "commands.songs:execute", "Full song list w/ current indicator",
+         usage="[--page N] [--size M] [--limit K] [--pager]", takes_args=True, read_only=True,
+         timeout=0)
+register("ls", "commands.ls:execute", "Quick song titles list", read_only=True)
+register("find", "commands.find:execute", "Search titles and artists (typos allowed)",
+         usage="<words> [artist:NAME] [title:WORD] [duration>M:SS] [--limit N]", takes_args=True,
+         read_only=True)
+register("watch", "commands.watch:execute", "Live now-playing view (Ctrl+C to stop)",
+         usage="[--interval S] [--count N]", takes_args=True, timeout=0)
+register("refresh", "commands.refresh:execute", "Drop the cached song listing")
+register("play", "commands.play:execute", "Play current/next song")
+register("pause", "commands.pause:execute", "Pause playback")
+register("stop", "commands.stop:execute", "Stop playback")
+register("next", "commands.next:execute", "Next song")
+register("previous", "commands.previous:execute", "Previous song", aliases=("prev",))
+register("stats", "commands.stats:execute", "Request/command latency and error stats",
+         usage="[json | prometheus | reset]", takes_args=True)
+register("history", "utils.history:print_history", "Command history (re-run with !n or !!)",
+         usage="[N] | grep <term>", takes_args=True)
+register("jobs", "utils.repl:list_jobs", "Background commands (start one with a trailing &)")
+register("cancel", "utils.repl:cancel_job", "Cancel a background command", usage="<job number>",
+         takes_args=True)
+register("about", "commands.about:display_about", "Show Termina info", read_only=True)
+register("cls", "commands.clear_screen:clear_screen", "Clear screen", aliases=("clear",))
+register("help", print_help, "Show this help", read_only=True)
+register("exit", exit_termina, "Stop playback & quit", aliases=("quit",))
+
+def lookup(command):
+    # Split a command line into its registry entry (or None) and arguments
+    name, *args = command.split() or [""]
+    return COMMAND_LOOKUP.get(name), args
 
 def handle_command(command):
-    if command == "play":
-        play()
-    elif command == "pause":
-        pause()
-    elif command == "stop":
-        stop()
-    elif command == "next":
-        next_song()
-    elif command == "previous":
-        previous_song()
-    elif command == "current":
-        current_song()
-    elif command == "songs":
-        show_songs()
-    elif command == "ls":
-        list_titles()
-    elif command == "history":
-        print_history()
-    elif command == "about":
-        display_about()
-    elif command in ["cls", "clear"]:
-        clear_screen()
-    elif command == "help":
-        print("\nTermina Commands:")
-        print("  current    Show currently playing song")
-        print("  songs      Full song list w/ current indicator") 
-        print("  ls         Quick song titles list")
-        print("  play       Play current/next song")
-        print("  pause      Pause playback")
-        print("  stop       Stop playback")
-        print("  next       Next song")
-        print("  previous   Previous song")
-        print("  history    Command history")
-        print("  about      Show Termina info")
-        print("  cls/clear  Clear screen")
-        print("  exit       Stop playback & quit\n")
-    elif command == "exit":
-        stop_playback_on_exit()
-        print("Exiting Termina. Goodbye!")
-        return False
-    else:
+    if command.startswith("!"):
+        expanded = expand_history(command)
+        if expanded is None:
+            print("No such command in history. Type 'history' to see it.")
+            return True
+        print(expanded)
+        command = expanded
+
+    entry, args = lookup(command)
+    if entry is None:
         print("Unknown command. Type 'help' to see available commands.")
-    
+    else:
+        start = time.perf_counter()
+        failed = True
+        try:
+            # Handlers print their errors instead of raising; the outcome
+            # says whether they did
+            with track() as outcome:
+                result = entry.run(args)
+            failed = outcome.failed
+        finally:
+            latency_ms = (time.perf_counter() - start) * 1000
+            metrics.record_command(entry.name, latency_ms, error=failed)
+            logger.info("command finished", extra={"command": entry.name, "latency_ms": round(latency_ms, 2)})
+        if result is EXIT:
+            return False
+
     add_to_history(command)
     return True
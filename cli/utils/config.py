@@ -0,0 +1,185 @@
+# Layered configuration shared by the CLI and termina_runner.py
+#
+# Every tunable module constant can be overridden without editing source.
+# Sources, lowest to highest priority:
+#   1. the defaults written in utils/constants.py (or termina_runner.py)
+#   2. a JSON config file: ~/.termina/config.json, TERMINA_CONFIG, or --config PATH
+#   3. environment variables: TERMINA_<NAME>, e.g. TERMINA_API_READ_TIMEOUT=5
+#   4. command-line flags: --set api_read_timeout=5 (repeatable)
+# Keys are the constant names in lower case. The sources are read once per
+# process and cached.
+
+import argparse
+import json
+import os
+import sys
+
+CONFIG_ENV = "TERMINA_CONFIG"
+DEFAULT_CONFIG_FILE = os.path.join(os.path.expanduser("~"), ".termina", "config.json")
+ENV_PREFIX = "TERMINA_"
+# Names that are not settings even though they are upper-case module constants
+NOT_CONFIGURABLE_PREFIXES = ("ERROR_",)
+
+_config = None
+
+
+class ConfigError(ValueError):
+    pass
+
+
+def add_config_arguments(parser):
+    # Declares the flags read by load_config, so they show up in --help
+    parser.add_argument("--config", metavar="PATH",
+                        help=f"JSON settings file (default: ${CONFIG_ENV} or {DEFAULT_CONFIG_FILE})")
+    parser.add_argument("--set", dest="settings", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a setting, e.g. --set api_read_timeout=5 (repeatable)")
+
+
+def _scan_flags(argv):
+    # Settings are needed while modules are imported, before the entry point
+    # parses its own arguments, so only the config flags are picked out here
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False)
+    add_config_arguments(parser)
+    flags, _ = parser.parse_known_args(argv)
+    overrides = {}
+    for setting in flags.settings:
+        name, separator, value = setting.partition("=")
+        if not separator or not name.strip():
+            raise ConfigError(f"--set expects NAME=VALUE, got '{setting}'")
+        overrides[name.strip().lower()] = value
+    return flags.config, overrides
+
+
+def _read_file(path, required):
+    try:
+        with open(path, "r", encoding="utf-8") as config_file:
+            values = json.load(config_file)
+    except FileNotFoundError:
+        if required:
+            raise ConfigError(f"config file not found: {path}")
+        return {}
+    except (OSError, ValueError) as e:
+        raise ConfigError(f"cannot read config file {path}: {e}")
+    if not isinstance(values, dict):
+        raise ConfigError(f"config file {path} must hold a JSON object")
+    return {str(name).lower(): value for name, value in values.items()}
+
+
+def load_config(argv=None, environ=None):
+    """
+    Merge the config file, environment and flags into one dict.
+
+    The result is cached, so later calls (from any module) are free and
+    always agree.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+        environ: Environment mapping (default: os.environ)
+
+    Returns:
+        Dict of lower-case setting name -> raw value
+    """
+    global _config
+    if _config is not None:
+        return _config
+    environ = os.environ if environ is None else environ
+    config_path, flag_values = _scan_flags(sys.argv[1:] if argv is None else argv)
+    required = config_path is not None or CONFIG_ENV in environ
+    config_path = config_path or environ.get(CONFIG_ENV) or DEFAULT_CONFIG_FILE
+
+    values = _read_file(os.path.expanduser(config_path), required)
+    for name, value in environ.items():
+        if name.startswith(ENV_PREFIX) and name != CONFIG_ENV:
+            values[name[len(ENV_PREFIX):].lower()] = value
+    values.update(flag_values)
+    # An explicit file is handed on to child processes; the default one is
+    # found by them anyway
+    values["_sources"] = {"file": config_path if required else None, "flags": sorted(flag_values)}
+    _config = values
+    return _config
+
+
+def child_environment(names=None):
+    """
+    Environment variables that hand this process's flag settings to children.
+
+    The runner passes these to the CLI, so `--set` and `--config` given to the
+    runner reach the shell as well.
+
+    Args:
+        names: Extra settings to export as well, as {name: value}
+
+    Returns:
+        Dict of TERMINA_* variables
+    """
+    config = load_config()
+    environment = {}
+    sources = config["_sources"]
+    if sources["file"]:
+        environment[CONFIG_ENV] = sources["file"]
+    for name in sources["flags"]:
+        environment[ENV_PREFIX + name.upper()] = _to_text(config[name])
+    for name, value in (names or {}).items():
+        environment[ENV_PREFIX + name.upper()] = _to_text(value)
+    return environment
+
+
+def _to_text(value):
+    if isinstance(value, (list, tuple)):
+        return ",".join(str(item) for item in value)
+    return str(value)
+
+
+def _coerce(name, value, default):
+    # Convert a file/env/flag value to the type of the constant it replaces
+    try:
+        if isinstance(default, bool):
+            if isinstance(value, bool):
+                return value
+            text = str(value).strip().lower()
+            if text in ("1", "true", "yes", "on"):
+                return True
+            if text in ("0", "false", "no", "off"):
+                return False
+            raise ValueError
+        if isinstance(default, float):
+            return float(value)
+        if isinstance(default, int):
+            return int(str(value).strip())
+        if isinstance(default, (tuple, list)):
+            items = value if isinstance(value, (list, tuple)) else [
+                item.strip() for item in str(value).split(",") if item.strip()]
+            if default:
+                items = [_coerce(name, item, default[0]) for item in items]
+            return type(default)(items)
+        if isinstance(default, str):
+            text = str(value)
+            return os.path.expanduser(text) if text.startswith("~") else text
+    except (TypeError, ValueError):
+        raise ConfigError(f"setting '{name}' expects {type(default).__name__}, got {value!r}")
+    return value
+
+
+def apply_overrides(namespace):
+    """
+    Replace the module constants in `namespace` that have configured values.
+
+    Call it at the end of a constants module with globals(). Settings aimed at
+    other components (the runner's or the CLI's) are ignored.
+
+    Args:
+        namespace: Module globals to update in place
+
+    Returns:
+        Names that were overridden
+    """
+    config = load_config()
+    overridden = []
+    for name, default in list(namespace.items()):
+        if not name.isupper() or name.startswith(NOT_CONFIGURABLE_PREFIXES):
+            continue
+        key = name.lower()
+        if key in config and isinstance(default, (bool, int, float, str, tuple, list)):
+            namespace[name] = _coerce(key, config[key], default)
+            overridden.append(name)
+    return overridden
@@ -1,8 +1,109 @@
+import os
+from utils.config import apply_overrides
+
+# Every setting below can be overridden from ~/.termina/config.json, TERMINA_*
+# environment variables or --set flags; see utils/config.py
+
 # API URL
 API_URL = "http://localhost:5000/api/Music"
+# Several backends, primary first, e.g. TERMINA_API_URLS=http://a:5000/api/Music,http://b:5001/api/Music
+# (empty: API_URL only). Mutating calls always go to the primary.
+API_URLS = ()
+# Reads spread across healthy backends. Each backend has its own player, so
+# `current` stays on the primary, which takes the playback commands; add it
+# only when the backends share their player state.
+API_READ_ENDPOINTS = ("songs", "list")
+API_HEDGE_DELAY = 0.25       # seconds before a pending read is also sent to another backend (0: off)
+API_BREAKER_FAILURES = 3     # consecutive failures that take a backend out of rotation
+API_BREAKER_RESET = 5.0      # seconds before an ejected backend gets a trial request
+
+# HTTP client tuning
+API_CONNECT_TIMEOUT = 3.05   # seconds to establish a TCP connection
+API_READ_TIMEOUT = 10.0      # seconds to wait for the backend to respond
+API_POOL_CONNECTIONS = 4     # number of host pools kept by the session
+API_POOL_MAXSIZE = 8         # keep-alive connections retained per host
+API_MAX_RETRIES = 2          # bounded retries for failed connects / idempotent GETs
+API_RETRY_BACKOFF = 0.2      # exponential backoff factor between retries
+API_RETRY_STATUSES = (502, 503, 504)
+API_FANOUT_WORKERS = 4       # threads used to issue independent GETs in parallel
+API_STREAM_CHUNK_SIZE = 64 * 1024  # bytes read per chunk when streaming listings
+API_EVENT_READ_TIMEOUT = 60.0  # seconds without data before an event stream is dropped
+
+# Library listing cache
+LIBRARY_CACHE_TTL = 300.0    # seconds a listing is served without revalidation
+LIBRARY_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".termina", "library_cache.json")
+LIBRARY_CACHE_PERSIST = True # keep the cache on disk so a new shell starts warm
+LIBRARY_CACHE_SAVE_DELAY = 1.0  # seconds after a change before the cache file is rewritten
+CACHED_ENDPOINTS = ("songs", "list")
+# Transport POSTs that leave the library untouched; any other POST invalidates the cache
+LIBRARY_SAFE_MUTATIONS = ("play", "pause", "stop", "next", "previous")
+
+# Offline replica: the last-known library and current song in SQLite, served
+# with a staleness notice when the backend is unreachable or slow
+REPLICA_ENABLED = True
+REPLICA_FILE = os.path.join(os.path.expanduser("~"), ".termina", "library.db")
+REPLICA_ENDPOINTS = ("songs", "list", "current")
+REPLICA_SLOW_AFTER = 0.0     # seconds a read may take before the replica answers instead (0: off, wait)
+REPLICA_REFRESH_INTERVAL = 60.0  # seconds between background syncs in the interactive shell
+
+# Local player state: `current` is answered without a request for this many
+# seconds after the backend last confirmed what is playing (0: always ask)
+PLAYER_STATE_TTL = 15.0
+
+# Screen output
+INTRO_BANNER = "auto"        # "auto" (full banner if it fits, else compact), "full", "compact" or "off"
+ABOUT_MAX_WIDTH = 100        # `about` text is wrapped to this or the terminal width, whichever is less
+
+# Song listing output
+SONGS_PAGE_SIZE = 50         # rows per page (and per buffered write) in `songs`
+TABLE_TITLE_MIN = 16         # the title column follows the terminal width within these bounds
+TABLE_TITLE_MAX = 60
+
+# `find` search
+FIND_RESULT_LIMIT = 20       # best matches shown unless --limit says otherwise
+
+# Live `watch` view
+WATCH_EVENTS_ENDPOINT = "current/events"  # optional SSE push endpoint
+WATCH_MIN_INTERVAL = 1.0     # seconds between polls right after a change
+WATCH_MAX_INTERVAL = 15.0    # ceiling for the backed-off polling interval
+WATCH_BACKOFF = 1.5          # interval multiplier while nothing changes
+WATCH_BOUNDARY_WINDOW = 5.0  # seconds past a track's expected end to keep polling fast
+
+# Command history
+HISTORY_SIZE = 1000          # entries kept in memory (and in the compacted log)
+HISTORY_FILE = os.path.join(os.path.expanduser("~"), ".termina", "history.log")
+HISTORY_COMPACT_FACTOR = 2   # rewrite the log once it holds this many times HISTORY_SIZE lines
+
+# Logging
+LOG_DIR = os.path.join(os.path.expanduser("~"), ".termina", "logs")
+LOG_FILE_NAME = "termina.log"
+LOG_LEVEL = "INFO"           # INFO records one structured line per command
+LOG_FORMAT = "json"          # "json" (one object per line) or "text"
+LOG_ROTATION = "size"        # "size" (LOG_MAX_BYTES) or "time" (LOG_ROTATE_WHEN)
+LOG_MAX_BYTES = 1024 * 1024
+LOG_ROTATE_WHEN = "midnight"
+LOG_BACKUP_COUNT = 5         # rotated files kept before the oldest is deleted
+
+# Launcher handshake: when started by termina_runner.py, the shell warms up and
+# then waits for the runner to write this file before showing its prompt
+LAUNCHER_READY_ENV = "TERMINA_READY_FILE"
+LAUNCHER_READY_TIMEOUT = 60.0  # seconds
+LAUNCHER_READY_POLL = 0.02  # seconds
+
+# Interactive shell: commands run as tasks so the prompt never waits on the backend
+REPL_ASYNC = True            # False: the plain input() loop, one command at a time
+REPL_COMMAND_TIMEOUT = 30.0  # seconds before a command is cancelled (0: never)
+REPL_DETACH_AFTER = 2.0      # a command that printed nothing yet is backgrounded after this many seconds
+
+# Batch mode
+BATCH_WORKERS = 4            # read-only commands run side by side in a batch
 
 # Error Messages
 ERROR_UNABLE_TO_CONNECT = "Error: Unable to connect to the backend API. Please make sure it is running."
+ERROR_TIMEOUT = "Error: The backend API did not respond in time."
 ERROR_HTTP = "HTTP error occurred: {0}"
 ERROR_REQUEST = "Error: {0}"
 ERROR_COMMAND_FAILED = "Failed to execute '{0}' command. Please try again."
+
+# Replace the defaults above with configured values
+apply_overrides(globals())
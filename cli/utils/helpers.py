@@ -1,18 +1,30 @@
 import json
+from utils.models import Song, to_json
 
 def pretty_print_json(data):
     try:
         print("\n", end="")  # Add a newline before the output
         if "message" in data:
             print(data["message"])
-        elif "title" in data and "filePath" in data and "duration" in data and "artist" in data:
-            print(f"Title: {data['title']}")
-            print(f"FilePath: {data['filePath']}")
-            print(f"Duration: {data['duration']}")
-            print(f"Artist: {data['artist']}")
+        elif isinstance(data, Song) or ("title" in data and "filePath" in data and "duration" in data and "artist" in data):
+            song = Song.from_dict(data)
+            print(f"Title: {song.title}")
+            print(f"FilePath: {song.file_path}")
+            print(f"Duration: {song.duration}")
+            print(f"Artist: {song.artist}")
         else:
-            print(json.dumps(data, indent=4, sort_keys=True))
+            print(json.dumps(data, indent=4, sort_keys=True, default=to_json))
         print("\n", end="")  # Add a newline after the output
     except (TypeError, ValueError) as e:
         print(f"Error processing response: {e}")
         print("\n", end="")  # Add a newline after the error message
+
+def parse_duration(duration):
+    # "mm:ss" or "hh:mm:ss" -> seconds, or None if it cannot be parsed
+    try:
+        seconds = 0
+        for part in str(duration).split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+    except ValueError:
+        return None
@@ -1,12 +1,183 @@
 # Module for managing command history
 
-command_history = []
+import os
+import sys
+import threading
+from collections import deque
+from utils.constants import HISTORY_SIZE, HISTORY_FILE, HISTORY_COMPACT_FACTOR
+from utils.outcome import fail
+
+try:
+    import readline  # up/down recall in input(); not available on every platform
+except ImportError:
+    readline = None
+
+
+class CommandHistory:
+    """
+    Bounded command history with a token index and an append-only log.
+
+    Entries live in a deque capped at `size`, so adding is O(1) and the oldest
+    entry falls off automatically. Every entry gets a sequence number (shown
+    by `history`, resolved by `!n` through a dict). A token -> sequence-number index, pruned as
+    entries are evicted, keeps `history grep` proportional to the vocabulary
+    and the matches rather than to the whole history.
+
+    Once persistence is enabled, each command is appended to a log file, which
+    is rewritten with only the retained entries when it grows past
+    `compact_factor` times the history size.
+    """
+
+    def __init__(self, size=HISTORY_SIZE, path=None, compact_factor=HISTORY_COMPACT_FACTOR):
+        self.size = size
+        self.path = path
+        self.compact_factor = compact_factor
+        self.entries = deque()
+        self.by_seq = {}
+        self.index = {}
+        self.next_seq = 1
+        self.log_lines = 0
+        self._lock = threading.Lock()
+
+    # --- persistence ---
+
+    def enable_persistence(self, path=HISTORY_FILE):
+        self.path = path
+        retained = deque(maxlen=self.size)
+        try:
+            with open(path, "r", encoding="utf-8") as log:
+                for line in log:
+                    retained.append(line.rstrip("\n"))
+                    self.log_lines += 1
+        except OSError:
+            pass  # no history yet
+        for command in retained:
+            if command:
+                self._append(command)
+        if readline is not None:
+            readline.set_history_length(self.size)
+            for _, command in self.entries:
+                readline.add_history(command)
+
+    def _write_log(self, command):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as log:
+                log.write(command + "\n")
+            self.log_lines += 1
+            if self.log_lines > self.size * self.compact_factor:
+                self._compact()
+        except OSError:
+            pass  # history still works in memory
+
+    def _compact(self):
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as log:
+            log.writelines(command + "\n" for _, command in self.entries)
+        os.replace(temp_path, self.path)
+        self.log_lines = len(self.entries)
+
+    # --- entries and index ---
+
+    def add(self, command):
+        if not command:
+            return
+        with self._lock:
+            self._append(command)
+            if self.path:
+                self._write_log(command)
+
+    def _append(self, command):
+        if len(self.entries) >= self.size:
+            self._evict()
+        seq = self.next_seq
+        self.next_seq += 1
+        self.entries.append((seq, command))
+        self.by_seq[seq] = command
+        for token in set(command.split()):
+            self.index.setdefault(token, deque()).append(seq)
+
+    def _evict(self):
+        # The evicted entry is the oldest, so its sequence number sits at the
+        # front of every posting list it appears in
+        seq, command = self.entries.popleft()
+        del self.by_seq[seq]
+        for token in set(command.split()):
+            postings = self.index[token]
+            postings.popleft()
+            if not postings:
+                del self.index[token]
+
+    def get(self, seq):
+        return self.by_seq.get(seq)
+
+    def last(self):
+        return self.entries[-1][1] if self.entries else None
+
+    def search(self, term):
+        # Candidates come from index tokens containing each word of the term;
+        # the full term is then checked against those candidates only
+        words = term.split()
+        if not words:
+            return []
+        candidates = None
+        for word in words:
+            matches = set()
+            for token, postings in self.index.items():
+                if word in token:
+                    matches.update(postings)
+            candidates = matches if candidates is None else candidates & matches
+            if not candidates:
+                return []
+        results = ((seq, self.get(seq)) for seq in sorted(candidates))
+        return [(seq, command) for seq, command in results if term in command]
+
+    def tail(self, count=None):
+        if count is None or count >= len(self.entries):
+            return list(self.entries)
+        if count <= 0:
+            return []  # [-0:] would be everything
+        return list(self.entries)[-count:]
+
+
+history = CommandHistory()
+
+def enable_persistence(path=HISTORY_FILE):
+    history.enable_persistence(path)
 
 def add_to_history(command):
-    if len(command_history) >= 100:
-        command_history.pop(0)
-    command_history.append(command)
+    history.add(command)
+
+def expand_history(command):
+    # Resolve "!!" and "!n" to the stored command; anything else is returned
+    # unchanged. Returns None when the reference does not exist.
+    if not command.startswith("!"):
+        return command
+    reference = command[1:].strip()
+    if reference == "!":
+        return history.last()
+    if reference.isdigit():
+        return history.get(int(reference))
+    return None
+
+def _write_entries(entries):
+    sys.stdout.write("".join(f"{seq}: {command}\n" for seq, command in entries))
 
-def print_history():
-    for index, command in enumerate(command_history, 1):
-        print(f"{index}: {command}")
+def print_history(args=None):
+    args = args or []
+    if not args:
+        _write_entries(history.tail())
+    elif args[0] == "grep" and len(args) > 1:
+        matches = history.search(" ".join(args[1:]))
+        if matches:
+            _write_entries(matches)
+        else:
+            print("No matching commands.")
+    elif len(args) == 1 and args[0].lstrip("-").isdigit():
+        count = int(args[0])
+        if count < 0:
+            fail("History count must be 0 or more.")
+        else:
+            _write_entries(history.tail(count))
+    else:
+        fail("Usage: history [N] | history grep <term>")
@@ -0,0 +1,66 @@
+# Incremental decoding of JSON array responses
+
+import codecs
+import json
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]"
+
+
+def _skip_whitespace(buffer, pos):
+    while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def iter_json_array(chunks):
+    """
+    Yield the elements of a top-level JSON array as its bytes arrive.
+
+    Args:
+        chunks: Iterable of byte strings (e.g. response.iter_content())
+
+    Yields:
+        Each decoded array element, in order
+
+    Raises:
+        ValueError: If the payload is not an array or ends before the closing ']'
+    """
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    pos = 0
+    started = False
+
+    for chunk in chunks:
+        # Only the unconsumed tail is carried over, so the buffer stays about
+        # one element plus one chunk long regardless of the payload size
+        buffer = buffer[pos:] + text_decoder.decode(chunk)
+        pos = 0
+        while True:
+            pos = _skip_whitespace(buffer, pos)
+            if pos >= len(buffer):
+                break
+            if not started:
+                if buffer[pos] != "[":
+                    raise ValueError("Expected a JSON array in the response.")
+                started = True
+                pos += 1
+                continue
+            char = buffer[pos]
+            if char == ",":
+                pos += 1
+                continue
+            if char == "]":
+                return
+            try:
+                item, end = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # element is split across chunks; wait for more bytes
+            if not isinstance(item, (dict, list, str)) and (
+                    end == len(buffer) or buffer[end] not in _DELIMITERS):
+                break  # a bare number may continue in the next chunk ("2" of "2.5")
+            yield item
+            pos = end
+
+    raise ValueError("Response ended before the JSON array was complete.")
@@ -0,0 +1,72 @@
+# Constant-time position lookups over a fetched library listing
+
+
+class LibraryIndex:
+    """
+    Maps stable song keys to their positions in one listing.
+
+    Accepts either the full `songs` payload (dicts with title/filePath/artist)
+    or the title-only `list` payload. File paths are unique, so they resolve
+    exactly; title+artist and bare titles can repeat, so every position is kept
+    and lookups that match more than one row are reported as ambiguous rather
+    than guessed.
+    """
+
+    def __init__(self, listing):
+        self.size = len(listing)
+        self._by_path = {}
+        self._by_title_artist = {}
+        self._by_title = {}
+        for position, song in enumerate(listing):
+            if isinstance(song, str):
+                title, artist, file_path = song, None, None
+            else:
+                title, artist, file_path = song.get('title'), song.get('artist'), song.get('filePath')
+            if file_path:
+                self._by_path.setdefault(file_path, position)
+            if artist is not None:
+                self._by_title_artist.setdefault((title, artist), []).append(position)
+            self._by_title.setdefault(title, []).append(position)
+
+    def __len__(self):
+        return self.size
+
+    def find_by_path(self, file_path):
+        return self._by_path.get(file_path)
+
+    def positions_for(self, title, artist=None):
+        if artist is not None and self._by_title_artist:
+            return self._by_title_artist.get((title, artist), [])
+        return self._by_title.get(title, [])
+
+    def is_ambiguous(self, song):
+        return self.position_of(song) is None and len(self._candidates(song)) > 1
+
+    def position_of(self, song):
+        # Resolve a song record (e.g. the current track) to its row, or None
+        if not song:
+            return None
+        position = self.find_by_path(song.get('filePath'))
+        if position is not None:
+            return position
+        candidates = self._candidates(song)
+        return candidates[0] if len(candidates) == 1 else None
+
+    def _candidates(self, song):
+        return self.positions_for(song.get('title'), song.get('artist'))
+
+
+# Indexes for the most recently seen listings. The cached listing object is
+# reused until it is refetched, so this builds each index exactly once.
+_recent_indexes = {}
+_MAX_RECENT_INDEXES = 4
+
+def index_for(listing):
+    cached = _recent_indexes.get(id(listing))
+    if cached is not None and cached[0] is listing:
+        return cached[1]
+    index = LibraryIndex(listing)
+    if len(_recent_indexes) >= _MAX_RECENT_INDEXES:
+        _recent_indexes.pop(next(iter(_recent_indexes)))
+    _recent_indexes[id(listing)] = (listing, index)
+    return index
@@ -0,0 +1,75 @@
+# In-place terminal block that repaints only the lines that changed
+
+import sys
+import unicodedata
+from utils.render import terminal_width
+
+CLEAR_LINE = "\r\x1b[2K"
+
+
+class LiveView:
+    """
+    A fixed-height block of lines redrawn in place with ANSI cursor movement.
+
+    Each update compares the new lines against what is on screen and rewrites
+    only those that differ, in a single buffered write. Lines are cut to the
+    terminal width, since a wrapped line would take more rows than the cursor
+    movement accounts for. When stdout is not a terminal, every update is
+    appended as plain text instead.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream or sys.stdout
+        self.interactive = self.stream.isatty()
+        self.lines = []
+
+    def update(self, lines):
+        lines = list(lines)
+        if not self.interactive:
+            if lines != self.lines:
+                self.stream.write("\n".join(lines) + "\n")
+                self.stream.flush()
+            self.lines = lines
+            return
+
+        width = terminal_width() - 1  # the last column would wrap on some terminals
+        lines = [_fit(line, width) for line in lines]
+        if len(lines) != len(self.lines):
+            self._redraw(lines)
+        else:
+            # The cursor rests on the line below the block; hop up to each
+            # changed line, rewrite it, and come back down
+            frame = []
+            height = len(lines)
+            for row, (old, new) in enumerate(zip(self.lines, lines)):
+                if old != new:
+                    up = height - row
+                    frame.append(f"\x1b[{up}A{CLEAR_LINE}{new}\x1b[{up}B\r")
+            if frame:
+                self.stream.write("".join(frame))
+                self.stream.flush()
+        self.lines = lines
+
+    def _redraw(self, lines):
+        frame = []
+        if self.lines:
+            frame.append(f"\x1b[{len(self.lines)}A")
+        frame.extend(f"{CLEAR_LINE}{line}\n" for line in lines)
+        # Wipe leftovers when the block got shorter
+        frame.extend(f"{CLEAR_LINE}\n" for _ in range(len(self.lines) - len(lines)))
+        if len(self.lines) > len(lines):
+            frame.append(f"\x1b[{len(self.lines) - len(lines)}A")
+        self.stream.write("".join(frame))
+        self.stream.flush()
+
+
+def _fit(line, width):
+    # `line` cut to at most `width` terminal columns (wide characters take two)
+    if len(line) * 2 <= width:
+        return line  # fits even if every character is wide
+    used = 0
+    for position, char in enumerate(line):
+        used += 2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+        if used > width:
+            return line[:position]
+    return line
@@ -1,20 +1,99 @@
+import atexit
+import json
 import logging
 import os
-from datetime import datetime
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from utils.constants import (
+    LOG_DIR,
+    LOG_FILE_NAME,
+    LOG_LEVEL,
+    LOG_FORMAT,
+    LOG_ROTATION,
+    LOG_MAX_BYTES,
+    LOG_ROTATE_WHEN,
+    LOG_BACKUP_COUNT,
+)
 
-# Create logs directory if it doesn't exist
-if not os.path.exists('logs'):
-    os.makedirs('logs')
+# Extra fields that structured records may carry, e.g.
+# logger.info("command finished", extra={"command": "songs", "latency_ms": 12.5})
+STRUCTURED_FIELDS = ("command", "endpoint", "method", "http_status", "latency_ms", "bytes")
 
-# Generate log file name with current time
-log_filename = datetime.now().strftime("logs/termina_%m%d%Y%H.%M.%S_debug_log.log")
 
-# Configure logging
-logging.basicConfig(
-    filename=log_filename,
-    level=logging.ERROR,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+class JsonFormatter(logging.Formatter):
+    # One JSON object per line, with any structured fields present on the record
+    def format(self, record):
+        payload = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                payload[field] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False)
+
+
+class _CreateDirMixin:
+    # The log directory is only created when the first record is written, so a
+    # session that logs nothing leaves nothing behind
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+class LazyRotatingFileHandler(_CreateDirMixin, RotatingFileHandler):
+    pass
+
+
+class LazyTimedRotatingFileHandler(_CreateDirMixin, TimedRotatingFileHandler):
+    pass
+
+
+def build_file_handler(log_dir=LOG_DIR, rotation=LOG_ROTATION, log_format=LOG_FORMAT):
+    path = os.path.join(log_dir, LOG_FILE_NAME)
+    if rotation == "time":
+        handler = LazyTimedRotatingFileHandler(path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT,
+                                               encoding="utf-8", delay=True)
+    else:
+        handler = LazyRotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                          encoding="utf-8", delay=True)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    return handler
+
+
+def setup_logging(log_dir=LOG_DIR, level=LOG_LEVEL):
+    """
+    Route the Termina logger through a queue to a background writer thread.
+
+    Callers on the REPL thread only enqueue records; formatting and disk I/O
+    happen on the QueueListener thread, which is flushed and stopped at exit.
+
+    Args:
+        log_dir: Directory for the rotating log file (created on first write)
+        level: Minimum level name, e.g. "INFO" or "ERROR"
+
+    Returns:
+        The configured logger
+    """
+    termina_logger = logging.getLogger('TerminaLogger')
+    termina_logger.setLevel(level)
+    termina_logger.propagate = False
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, build_file_handler(log_dir), respect_handler_level=True)
+    termina_logger.handlers[:] = [QueueHandler(log_queue)]
+    listener.start()
+    atexit.register(listener.stop)
+    return termina_logger
+
 
 # Create a logger
-logger = logging.getLogger('TerminaLogger')
+logger = setup_logging()
@@ -0,0 +1,188 @@
+# In-process latency histograms and counters for API requests and commands
+
+import json
+import math
+import threading
+from bisect import bisect_left
+
+# Geometric bucket upper bounds in milliseconds: 0.25 ms up to ~2 minutes,
+# each 25% wider than the last, so quantile estimates stay within one bucket
+BUCKET_BOUNDS_MS = tuple(0.25 * 1.25 ** i for i in range(int(math.log(480000) / math.log(1.25)) + 1))
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram: O(1) memory and O(log buckets) per sample.
+
+    Quantiles are estimated by linear interpolation inside the bucket that
+    holds the requested rank, and the buckets map directly onto a Prometheus
+    histogram for export.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "min_ms", "max_ms")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # last bucket is +Inf
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = math.inf
+        self.max_ms = 0.0
+
+    def record(self, latency_ms):
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.min_ms = min(self.min_ms, latency_ms)
+        self.max_ms = max(self.max_ms, latency_ms)
+
+    def merge(self, other):
+        for bucket, bucket_count in enumerate(other.counts):
+            self.counts[bucket] += bucket_count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.min_ms = min(self.min_ms, other.min_ms)
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bucket, bucket_count in enumerate(self.counts):
+            if bucket_count and seen + bucket_count >= rank:
+                lower = BUCKET_BOUNDS_MS[bucket - 1] if bucket else 0.0
+                upper = BUCKET_BOUNDS_MS[bucket] if bucket < len(BUCKET_BOUNDS_MS) else self.max_ms
+                estimate = lower + (upper - lower) * (rank - seen) / bucket_count
+                return min(max(estimate, self.min_ms), self.max_ms)
+            seen += bucket_count
+        return self.max_ms
+
+    def cumulative_buckets(self):
+        running = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS_MS + (math.inf,), self.counts):
+            running += bucket_count
+            yield bound, running
+
+
+class Series:
+    __slots__ = ("latency", "errors", "bytes_received", "bytes_sent")
+
+    def __init__(self):
+        self.latency = LatencyHistogram()
+        self.errors = 0
+        self.bytes_received = 0
+        self.bytes_sent = 0
+
+    def summary(self):
+        return {
+            "count": self.latency.count,
+            "errors": self.errors,
+            "p50_ms": _round(self.latency.quantile(0.50)),
+            "p95_ms": _round(self.latency.quantile(0.95)),
+            "p99_ms": _round(self.latency.quantile(0.99)),
+            "max_ms": _round(self.latency.max_ms),
+            "mean_ms": _round(self.latency.total_ms / self.latency.count if self.latency.count else None),
+            "bytes_received": self.bytes_received,
+            "bytes_sent": self.bytes_sent,
+        }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+class MetricsRegistry:
+    """Thread-safe store of per-endpoint and per-command series."""
+
+    def __init__(self):
+        self.requests = {}
+        self.commands = {}
+        self._lock = threading.Lock()
+
+    def record_request(self, method, endpoint, latency_ms, error=False, bytes_received=0, bytes_sent=0):
+        with self._lock:
+            series = self.requests.get((method, endpoint))
+            if series is None:
+                series = self.requests[(method, endpoint)] = Series()
+            series.latency.record(latency_ms)
+            series.errors += error
+            series.bytes_received += bytes_received
+            series.bytes_sent += bytes_sent
+
+    def record_command(self, command, latency_ms, error=False):
+        with self._lock:
+            series = self.commands.get(command)
+            if series is None:
+                series = self.commands[command] = Series()
+            series.latency.record(latency_ms)
+            series.errors += error
+
+    def reset(self):
+        with self._lock:
+            self.requests.clear()
+            self.commands.clear()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": [dict(method=method, endpoint=endpoint, **series.summary())
+                             for (method, endpoint), series in sorted(self.requests.items())],
+                "commands": [dict(command=command, **series.summary())
+                             for command, series in sorted(self.commands.items())],
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self):
+        lines = []
+        with self._lock:
+            request_series = [({"method": method, "endpoint": endpoint}, series)
+                              for (method, endpoint), series in sorted(self.requests.items())]
+            command_series = [({"command": command}, series)
+                              for command, series in sorted(self.commands.items())]
+            _prometheus_histogram(lines, "termina_request_duration_seconds",
+                                  "Backend API request latency.", request_series)
+            _prometheus_counter(lines, "termina_request_errors_total",
+                                "Failed backend API requests.", request_series, "errors")
+            _prometheus_counter(lines, "termina_request_received_bytes_total",
+                                "Response bytes received from the backend.", request_series, "bytes_received")
+            _prometheus_counter(lines, "termina_request_sent_bytes_total",
+                                "Request bytes sent to the backend.", request_series, "bytes_sent")
+            _prometheus_histogram(lines, "termina_command_duration_seconds",
+                                  "Shell command latency.", command_series)
+            _prometheus_counter(lines, "termina_command_errors_total",
+                                "Shell commands that failed.", command_series, "errors")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels, **extra):
+    pairs = {**labels, **extra}
+    return "{" + ",".join(f'{key}="{value}"' for key, value in pairs.items()) + "}"
+
+
+def _prometheus_histogram(lines, name, help_text, series_list):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for labels, series in series_list:
+        for bound, running in series.latency.cumulative_buckets():
+            le = "+Inf" if bound == math.inf else f"{bound / 1000:.6g}"
+            lines.append(f"{name}_bucket{_labels(labels, le=le)} {running}")
+        lines.append(f"{name}_sum{_labels(labels)} {series.latency.total_ms / 1000:.6f}")
+        lines.append(f"{name}_count{_labels(labels)} {series.latency.count}")
+
+
+def _prometheus_counter(lines, name, help_text, series_list, attribute):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} counter")
+    for labels, series in series_list:
+        lines.append(f"{name}{_labels(labels)} {getattr(series, attribute)}")
+
+
+metrics = MetricsRegistry()
+
+def export_metrics(path, output_format="json"):
+    # Write the current metrics to a file; used for the export-on-exit option
+    text = metrics.to_prometheus() if output_format == "prometheus" else metrics.to_json()
+    with open(path, "w", encoding="utf-8") as export_file:
+        export_file.write(text)
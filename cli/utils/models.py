@@ -0,0 +1,225 @@
+# Typed song records and a column-wise library listing, decoded from API payloads
+
+import json
+from collections.abc import Mapping, Sequence
+
+try:
+    import orjson  # optional; decodes large listings several times faster
+except ImportError:
+    orjson = None
+
+# API field name -> attribute, in the order the backend sends them
+SONG_FIELDS = {"title": "title", "filePath": "file_path", "duration": "duration", "artist": "artist"}
+
+
+def loads(content):
+    # bytes or str -> decoded JSON; raises ValueError on malformed input
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+class Song(Mapping):
+    """
+    One track. Fields are attributes (title, file_path, duration, artist);
+    unknown fields sent by the backend are kept in `extra`.
+
+    A Song is also a read-only mapping under the API's field names, so code
+    written against the JSON objects (song["filePath"], song.get("title"))
+    keeps working.
+    """
+
+    __slots__ = ("title", "file_path", "duration", "artist", "extra")
+
+    def __init__(self, title=None, file_path=None, duration=None, artist=None, extra=None):
+        self.title = title
+        self.file_path = file_path
+        self.duration = duration
+        self.artist = artist
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data):
+        if isinstance(data, Song):
+            return data
+        if not isinstance(data, dict):
+            raise ValueError(f"expected a song object, got {type(data).__name__}")
+        extra = {key: value for key, value in data.items() if key not in SONG_FIELDS}
+        return cls(data.get("title"), data.get("filePath"), data.get("duration"), data.get("artist"), extra)
+
+    def __getitem__(self, key):
+        attribute = SONG_FIELDS.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        # Mapping.get goes through a KeyError; this is on every lookup path
+        attribute = SONG_FIELDS.get(key)
+        if attribute is not None:
+            return getattr(self, attribute)
+        return self.extra.get(key, default) if self.extra is not None else default
+
+    def __iter__(self):
+        yield from SONG_FIELDS
+        if self.extra is not None:
+            yield from self.extra
+
+    def __len__(self):
+        return len(SONG_FIELDS) + (len(self.extra) if self.extra is not None else 0)
+
+    def __repr__(self):
+        return f"Song({self.title!r}, {self.file_path!r}, {self.duration!r}, {self.artist!r})"
+
+    def to_json(self):
+        return dict(self.items())
+
+
+class SongList(Sequence):
+    """
+    A library listing stored column-wise.
+
+    Titles, file paths, durations and artists live in one list each instead
+    of one dict per track, and repeated artists and durations share a single
+    string, which for a large library is most of the memory a list of dicts
+    takes. Indexing and iteration hand out Song records built on demand;
+    slices are SongLists. Renderers can read the columns directly.
+    """
+
+    __slots__ = ("titles", "file_paths", "durations", "artists", "extras")
+
+    def __init__(self, titles=None, file_paths=None, durations=None, artists=None, extras=None):
+        self.titles = titles if titles is not None else []
+        self.file_paths = file_paths if file_paths is not None else []
+        self.durations = durations if durations is not None else []
+        self.artists = artists if artists is not None else []
+        self.extras = extras or None  # position -> extra fields, for the rare song that has any
+
+    @classmethod
+    def from_dicts(cls, items):
+        """
+        Build a listing from decoded JSON song objects.
+
+        The schema is checked once, on the first song; when it has exactly
+        the known fields the columns are filled with plain indexing, and only
+        if some later song turns out to differ is the listing rebuilt one
+        song at a time. Raises ValueError if `items` is not a list of objects.
+        """
+        if isinstance(items, SongList):
+            return items
+        if not isinstance(items, list):
+            raise ValueError(f"expected a list of songs, got {type(items).__name__}")
+        first = items[0] if items else None
+        if isinstance(first, dict) and first.keys() == SONG_FIELDS.keys():
+            try:
+                return cls._from_uniform(items)
+            except (KeyError, TypeError):
+                pass  # a song further down has another shape
+        listing = cls()
+        for song in map(Song.from_dict, items):
+            listing.append(song)
+        return listing
+
+    @classmethod
+    def _from_uniform(cls, items):
+        shared = {}
+        share = shared.setdefault
+        listing = cls(
+            [item["title"] for item in items],
+            [item["filePath"] for item in items],
+            [share(item["duration"], item["duration"]) for item in items],
+            [share(item["artist"], item["artist"]) for item in items],
+        )
+        if any(len(item) != len(SONG_FIELDS) for item in items):
+            listing.extras = {position: {key: value for key, value in item.items() if key not in SONG_FIELDS}
+                              for position, item in enumerate(items) if len(item) != len(SONG_FIELDS)}
+        return listing
+
+    def extend(self, other):
+        # Append another SongList, column by column
+        if other.extras:
+            if self.extras is None:
+                self.extras = {}
+            self.extras.update((position + len(self), extra) for position, extra in other.extras.items())
+        self.titles.extend(other.titles)
+        self.file_paths.extend(other.file_paths)
+        self.durations.extend(other.durations)
+        self.artists.extend(other.artists)
+
+    def append(self, song):
+        if song.extra is not None:
+            if self.extras is None:
+                self.extras = {}
+            self.extras[len(self.titles)] = song.extra
+        self.titles.append(song.title)
+        self.file_paths.append(song.file_path)
+        self.durations.append(song.duration)
+        self.artists.append(song.artist)
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            extras = None
+            if self.extras:
+                positions = range(len(self.titles))[index]
+                extras = {new: self.extras[old] for new, old in enumerate(positions) if old in self.extras}
+            return SongList(self.titles[index], self.file_paths[index], self.durations[index],
+                            self.artists[index], extras)
+        song = Song(self.titles[index], self.file_paths[index], self.durations[index], self.artists[index])
+        if self.extras:
+            song.extra = self.extras.get(index if index >= 0 else index + len(self.titles))
+        return song
+
+    def __iter__(self):
+        extras = self.extras or {}
+        for position, fields in enumerate(zip(self.titles, self.file_paths, self.durations, self.artists)):
+            yield Song(*fields, extras.get(position))
+
+    def __add__(self, other):
+        if not isinstance(other, SongList):
+            return NotImplemented
+        combined = self[:]
+        combined.extend(other)
+        return combined
+
+    def __eq__(self, other):
+        if isinstance(other, SongList):
+            return (self.titles == other.titles and self.file_paths == other.file_paths
+                    and self.durations == other.durations and self.artists == other.artists
+                    and (self.extras or None) == (other.extras or None))
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(mine == theirs for mine, theirs in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<SongList of {len(self)} songs>"
+
+    def to_json(self):
+        return [song.to_json() for song in self]
+
+
+def from_payload(endpoint, payload):
+    # Typed form of a decoded answer: the `songs` listing becomes a SongList,
+    # the `current` song a Song; anything else is returned as decoded
+    if endpoint == "songs" and payload is not None:
+        return SongList.from_dicts(payload)
+    if endpoint == "current" and isinstance(payload, dict) and "title" in payload:
+        return Song.from_dict(payload)
+    return payload
+
+
+def decode_payload(endpoint, content):
+    return from_payload(endpoint, loads(content))
+
+
+def to_json(value):
+    # `default` hook for json.dump(s), which cannot encode these on its own
+    if isinstance(value, (Song, SongList)):
+        return value.to_json()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,75 @@
+# Per-command success tracking. Handlers print their errors rather than
+# raise them, so they (and the API layer) report failures here, and whoever
+# runs the command reads the outcome back.
+
+import contextvars
+import threading
+from contextlib import contextmanager
+
+_outcome = contextvars.ContextVar("termina_command_outcome", default=None)
+_lock = threading.Lock()  # worker threads of one command share its Outcome
+
+
+class Outcome:
+    """
+    Whether the command running in this context (and in worker threads that
+    copy it) has failed, and the first error it reported; and whether any of
+    its data came from the offline replica, why, and as of when.
+    """
+
+    __slots__ = ("failed", "error", "offline", "synced_at", "offline_endpoints")
+
+    def __init__(self):
+        self.failed = False
+        self.error = None
+        self.offline = None       # reason the replica answered, e.g. "backend unreachable"
+        self.synced_at = None     # oldest replica data used (epoch seconds)
+        self.offline_endpoints = set()
+
+
+@contextmanager
+def track():
+    # Give the code run in this block an Outcome of its own, which is yielded
+    token = _outcome.set(Outcome())
+    try:
+        yield _outcome.get()
+    finally:
+        _outcome.reset(token)
+
+
+def report_failure(error=None):
+    # Mark the running command as failed; a no-op outside track()
+    outcome = _outcome.get()
+    if outcome is not None:
+        if not outcome.failed:
+            outcome.error = error
+        outcome.failed = True
+
+
+def fail(message):
+    # Print a command's error message and mark the command as failed
+    print(message)
+    report_failure(message)
+
+
+def report_offline(endpoint, reason, synced_at):
+    # Note that `endpoint` was answered from the replica. Returns True when
+    # the running command has not been told yet (always outside track()), so
+    # each command prints one staleness notice however many reads it makes.
+    outcome = _outcome.get()
+    if outcome is None:
+        return True
+    with _lock:
+        first = outcome.offline is None
+        if first:
+            outcome.offline = reason
+        if outcome.synced_at is None or synced_at < outcome.synced_at:
+            outcome.synced_at = synced_at
+        outcome.offline_endpoints.add(endpoint)
+    return first
+
+
+def served_offline(endpoint):
+    # True when the running command got `endpoint` from the replica
+    outcome = _outcome.get()
+    return outcome is not None and endpoint in outcome.offline_endpoints
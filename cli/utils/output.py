@@ -0,0 +1,110 @@
+# Per-context stdout capture, so commands can run side by side on threads
+
+import contextvars
+import io
+import sys
+import threading
+from contextlib import contextmanager
+
+_capture_buffer = contextvars.ContextVar("termina_capture_buffer", default=None)
+
+
+class ContextStdout:
+    """
+    sys.stdout replacement that routes writes to the buffer captured by the
+    current context, or to the real stream when nothing is capturing.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, text):
+        buffer = _capture_buffer.get()
+        return (buffer if buffer is not None else self.stream).write(text)
+
+    def flush(self):
+        buffer = _capture_buffer.get()
+        (buffer if buffer is not None else self.stream).flush()
+
+    def isatty(self):
+        # Captured output is never a terminal (keeps pagers non-interactive),
+        # unless the capturing target says otherwise
+        buffer = _capture_buffer.get()
+        return (buffer if buffer is not None else self.stream).isatty()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def install():
+    if not isinstance(sys.stdout, ContextStdout):
+        sys.stdout = ContextStdout(sys.stdout)
+    return sys.stdout
+
+
+class TaskOutput:
+    """
+    Output of one shell command: passed straight to the terminal while the
+    command runs in the foreground, collected once it is sent to the
+    background, and dropped after it is cancelled.
+    """
+
+    def __init__(self, stream, foreground=True):
+        self.stream = stream
+        self.foreground = foreground
+        self.discard = False
+        self.written = False  # anything printed yet, in either mode
+        self._buffer = io.StringIO()
+        self._lock = threading.Lock()
+
+    def write(self, text):
+        with self._lock:
+            self.written = self.written or bool(text)
+            if self.discard:
+                return len(text)
+            if self.foreground:
+                return self.stream.write(text)
+            return self._buffer.write(text)
+
+    def flush(self):
+        if self.foreground and not self.discard:
+            self.stream.flush()
+
+    def isatty(self):
+        return self.foreground and not self.discard and self.stream.isatty()
+
+    def to_background(self):
+        with self._lock:
+            self.foreground = False
+
+    def close(self):
+        # Drop anything printed from now on
+        with self._lock:
+            self.discard = True
+
+    def take(self):
+        # The output collected in the background so far
+        with self._lock:
+            text = self._buffer.getvalue()
+            self._buffer = io.StringIO()
+            return text
+
+
+@contextmanager
+def redirect(target):
+    # Route everything printed in this context (and in worker threads that
+    # copy it) to `target`, any object with write/flush/isatty
+    install()
+    token = _capture_buffer.set(target)
+    try:
+        yield target
+    finally:
+        _capture_buffer.reset(token)
+
+
+@contextmanager
+def capture():
+    # Collect everything printed in this context into a StringIO, which is
+    # yielded to the caller
+    with redirect(io.StringIO()) as buffer:
+        yield buffer
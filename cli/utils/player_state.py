@@ -0,0 +1,168 @@
+# Local model of the backend's player, so `current` rarely needs a round trip
+
+import threading
+import time
+from utils.constants import PLAYER_STATE_TTL
+from utils.helpers import parse_duration
+from utils.library_index import index_for
+
+PLAYING = "playing"
+PAUSED = "paused"
+STOPPED = "stopped"
+
+# Transport endpoints that move the player
+ACTIONS = ("play", "pause", "stop", "next", "previous")
+
+# Replies of the backend's transport endpoints (MusicService)
+PLAYING_PREFIX = "Playing: "
+PAUSED_MESSAGE = "Music paused."
+STOPPED_MESSAGE = "Music stopped."
+
+# current() result when only the backend can tell
+UNKNOWN = object()
+
+
+class Intent:
+    __slots__ = ("action", "version")
+
+    def __init__(self, action, version):
+        self.action = action
+        self.version = version
+
+
+class PlayerState:
+    """
+    What the backend's player is doing, as far as this client knows.
+
+    The backend keeps a selected position in the library: play restarts that
+    track, next/previous move it with wrap-around, and a playing track moves
+    on by itself when it ends. Transport commands update the model before
+    their request is sent (begin) and are settled by the reply (settle);
+    answers from `current` replace it (observe).
+
+    The model is fresh for `ttl` seconds after the backend last confirmed it,
+    and never past the predicted end of the playing track; current() only
+    answers while it is fresh. Each command gets a sequence number, and a
+    reply only settles the state if no newer command has been issued since,
+    so replies arriving out of order cannot undo a later command.
+    """
+
+    def __init__(self, ttl=PLAYER_STATE_TTL, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self.status = None      # PLAYING, PAUSED, STOPPED, or None when unknown
+        self.index = None       # selected position in `listing`
+        self.song = None
+        self.listing = None     # the `songs` listing positions refer to
+        self.version = 0
+        self.confirmed_at = None
+        self.started_at = None  # when the playing track (re)started
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def begin(self, action, listing=None):
+        # Apply the expected outcome of `action` now; returns the Intent to settle
+        with self._lock:
+            self.version += 1
+            self._in_flight += 1
+            self._use_listing(listing)
+            if action == "pause":
+                if self.status == PLAYING:
+                    self.status = PAUSED
+            elif action == "stop":
+                self.status = STOPPED
+            elif action in ("play", "next", "previous"):
+                if action != "play":
+                    step = 1 if action == "next" else -1
+                    if self.index is not None and self.listing:
+                        self._select((self.index + step) % len(self.listing))
+                    else:
+                        self.index, self.song = None, None
+                self.status = PLAYING
+                self.started_at = self.clock()
+            return Intent(action, self.version)
+
+    def settle(self, intent, reply):
+        # Reconcile with the backend's reply to an intent (None if it failed)
+        with self._lock:
+            self._in_flight -= 1
+            message = reply.get("message") if isinstance(reply, dict) else None
+            if message is None:
+                self.status = None  # the command may or may not have taken effect
+                return
+            if intent.version != self.version:
+                return  # a newer command's reply will settle the state
+            if message.startswith(PLAYING_PREFIX):
+                title = message[len(PLAYING_PREFIX):]
+                if self.song is None or self.song.get("title") != title:
+                    self._select_title(title)
+                self.status = PLAYING if self.song is not None else None
+            elif message == PAUSED_MESSAGE:
+                if self.status not in (PLAYING, PAUSED, STOPPED):
+                    return
+                if self.status == PLAYING:
+                    self.status = PAUSED
+            elif message == STOPPED_MESSAGE:
+                self.status = STOPPED
+            else:
+                self.status = None  # "Playback locked - try again.", errors, ...
+                return
+            self.confirmed_at = self.clock()
+
+    def observe(self, song, listing=None):
+        # The backend's answer to `current`: the song, or None when stopped
+        with self._lock:
+            if self._in_flight:
+                return  # may predate a command still in flight
+            self._use_listing(listing)
+            now = self.clock()
+            if song is None:
+                self.status = STOPPED
+            else:
+                same_track = self.song is not None and self.song.get("filePath") == song.get("filePath")
+                if not same_track:
+                    self.started_at = now  # real start unknown; the TTL bounds the error
+                    position = index_for(self.listing).position_of(song) if self.listing else None
+                    self.index = position
+                self.song = song
+                self.status = PAUSED if same_track and self.status == PAUSED else PLAYING
+            self.confirmed_at = now
+
+    def current(self):
+        # The current song, None when stopped, or UNKNOWN when not fresh
+        with self._lock:
+            if not self._fresh(self.clock()):
+                return UNKNOWN
+            if self.status == STOPPED:
+                return None
+            return self.song if self.song is not None else UNKNOWN
+
+    def invalidate(self):
+        with self._lock:
+            self.status = None
+
+    def _fresh(self, now):
+        if self.status is None or self.confirmed_at is None or now - self.confirmed_at >= self.ttl:
+            return False
+        if self.status == PLAYING and self.song is not None:
+            length = parse_duration(self.song.get("duration"))
+            if length and now >= self.started_at + length:
+                return False  # the backend has moved on to the next track
+        return True
+
+    def _use_listing(self, listing):
+        if listing is None or listing is self.listing:
+            return
+        self.listing = listing
+        self.index = index_for(listing).position_of(self.song) if self.song else None
+
+    def _select(self, index):
+        self.index = index
+        self.song = self.listing[index]
+
+    def _select_title(self, title):
+        positions = index_for(self.listing).positions_for(title) if self.listing else []
+        if len(positions) == 1:
+            self._select(positions[0])
+        else:
+            self.index, self.song = None, None
@@ -0,0 +1,54 @@
+# Terminal-size-aware screen output. Blocks such as the banner are rendered
+# once per terminal width (functools.lru_cache on a width argument) and sent
+# with write_screen() as a single write.
+
+import shutil
+import signal
+import sys
+
+# Width used when stdout is not a terminal; keeps piped output stable
+DEFAULT_WIDTH = 80
+
+# Terminal width as of the last resize; None until measured or after SIGWINCH
+_width = None
+_watching = False
+
+
+def _measure():
+    return shutil.get_terminal_size((DEFAULT_WIDTH, 24)).columns
+
+
+def terminal_width():
+    global _width
+    if not _watching:
+        return _measure()  # nothing would tell us about a resize, so always ask
+    if _width is None:
+        _width = _measure()
+    return _width
+
+
+def _on_resize(signum, frame):
+    global _width
+    _width = None
+
+
+def watch_resize():
+    """
+    Track the terminal width through SIGWINCH instead of asking the terminal
+    on every render. Call from the main thread before readline is imported:
+    readline chains its own resize handling to the handler it finds.
+    """
+    global _watching
+    if not hasattr(signal, "SIGWINCH") or not sys.stdout.isatty():
+        return
+    try:
+        signal.signal(signal.SIGWINCH, _on_resize)
+    except ValueError:
+        return  # not the main thread
+    _watching = True
+
+
+def write_screen(text):
+    # One write and one flush, so a slow link gets the screen in one piece
+    sys.stdout.write(text)
+    sys.stdout.flush()
@@ -0,0 +1,310 @@
+# asyncio-driven interactive shell: every command runs as a task, so a
+# stalled backend call never holds the prompt
+
+import asyncio
+import select
+import signal
+import sys
+import threading
+from utils.cancellation import Cancelled, cancellable, check
+from utils.command_handler import handle_command, lookup
+from utils.constants import REPL_COMMAND_TIMEOUT, REPL_DETACH_AFTER
+from utils.logging_config import logger
+from utils.outcome import fail
+from utils.output import TaskOutput, install, redirect
+from utils.sanitization import sanitize_input
+
+try:
+    import readline  # current input line, for redrawing it under background output
+except ImportError:
+    readline = None
+
+try:
+    import termios  # restored on exit, in case a prompt was abandoned mid-read
+except ImportError:
+    termios = None
+
+PROMPT = "Termina> "
+CLEAR_LINE = "\r\x1b[2K"
+ASK_POLL_INTERVAL = 0.1  # seconds between checks for input in ask()
+
+# The running shell, for the `jobs` and `cancel` commands
+_shell = None
+
+
+class Job:
+    __slots__ = ("number", "command", "output", "future", "thread", "background", "timer", "cancelled",
+                 "prompting")
+
+    def __init__(self, command, output, future):
+        self.number = None  # assigned once it runs in the background
+        self.command = command
+        self.output = output
+        self.future = future  # resolves to handle_command's result
+        self.thread = None
+        self.background = False
+        self.timer = None
+        self.cancelled = threading.Event()  # checked by the command at its checkpoints
+        self.prompting = False  # reading a line through ask()
+
+
+class Shell:
+    """
+    The interactive prompt.
+
+    Commands run on their own threads and are awaited as futures, each with a
+    deadline (REPL_COMMAND_TIMEOUT, or the command's own). A command ending in
+    `&` runs in the background from the start; a foreground command that has
+    printed nothing after REPL_DETACH_AFTER seconds (typically one waiting on
+    the backend) is moved there too, so `pause` or `stop` can be issued while
+    a `songs` call is stalled. Ctrl+C cancels the foreground command: the
+    shell drops it at once, and its thread stops at its next checkpoint (see
+    utils/cancellation.py), or when a blocking request times out. Output
+    of background commands is collected and printed above the prompt when
+    they finish, and the line being typed is redrawn below it.
+    """
+
+    def __init__(self, terminal=None):
+        self.terminal = terminal or install().stream
+        self.jobs = {}  # background jobs by number
+        self.foreground = None
+        self.loop = None
+        self._pending_input = None
+        self._closing = False
+
+    # --- terminal output ---
+
+    def notify(self, text):
+        # Print above the prompt without corrupting the line being typed
+        if self._pending_input is not None and self.terminal.isatty():
+            line = readline.get_line_buffer() if readline is not None else ""
+            self.terminal.write(f"{CLEAR_LINE}{text}{PROMPT}{line}")
+        else:
+            self.terminal.write(text)
+        self.terminal.flush()
+
+    # --- jobs ---
+
+    def start(self, command, background=False):
+        entry, _ = lookup(command)
+        timeout = entry.timeout if entry is not None and entry.timeout is not None else REPL_COMMAND_TIMEOUT
+        job = Job(command, TaskOutput(self.terminal, foreground=not background), self.loop.create_future())
+        if background:
+            self._adopt(job)
+
+        def run():
+            keep_running = True
+            with redirect(job.output), cancellable(job.cancelled):
+                try:
+                    keep_running = handle_command(command)
+                except Cancelled:
+                    pass  # already reported by cancel()
+                except Exception as e:
+                    print(f"An unexpected error occurred: {e}")
+                    logger.error(f"An unexpected error occurred: {e}")
+            try:
+                self.loop.call_soon_threadsafe(self._finish, job, keep_running)
+            except RuntimeError:
+                pass  # the shell has already exited
+
+        job.thread = threading.Thread(target=run, name=f"termina-job-{job.number}", daemon=True)
+        job.thread.start()
+        if timeout:
+            job.timer = self.loop.call_later(timeout, self.cancel, job, f"timed out after {timeout:g}s")
+        return job
+
+    def _finish(self, job, keep_running):
+        if job.timer is not None:
+            job.timer.cancel()
+        self._forget(job)
+        if job.future.done():
+            return  # cancelled earlier; its thread has only now wound down
+        job.future.set_result(keep_running)
+        if job.background:
+            self.notify(f"[{job.number}] done: {job.command}\n{job.output.take()}")
+        if not keep_running:
+            self.close()
+
+    def _adopt(self, job):
+        # Numbered like shell jobs: the lowest number not in use
+        job.background = True
+        job.number = next(number for number in range(1, len(self.jobs) + 2) if number not in self.jobs)
+        self.jobs[job.number] = job
+
+    def _forget(self, job):
+        # Its number may already belong to a newer job
+        if self.jobs.get(job.number) is job:
+            del self.jobs[job.number]
+
+    def to_background(self, job):
+        self._adopt(job)
+        job.output.to_background()
+        self.notify(f"[{job.number}] '{job.command}' is still waiting; moved to the background "
+                    f"(see 'jobs').\n")
+
+    def cancel(self, job, reason="cancelled"):
+        if job.future.done():
+            return
+        job.output.close()
+        job.future.set_result(True)
+        self._forget(job)
+        if job.timer is not None:
+            job.timer.cancel()
+        job.cancelled.set()
+        label = f"[{job.number}] " if job.background else ""
+        self.notify(f"{label}'{job.command}' {reason}.\n")
+        logger.warning("command cancelled", extra={"command": job.command, "reason": reason})
+
+    async def run_foreground(self, job):
+        # Returns False when the command ended the shell
+        self.foreground = job
+        try:
+            done, _ = await asyncio.wait({job.future}, timeout=REPL_DETACH_AFTER or None)
+            if not done and not job.output.written:
+                self.to_background(job)
+                return True
+            return await job.future
+        finally:
+            self.foreground = None
+            if job.prompting:
+                # A cancelled ask() ends within a poll interval; prompting
+                # before it has would race it for the next line typed
+                await asyncio.to_thread(job.thread.join, 10 * ASK_POLL_INTERVAL)
+
+    # --- input ---
+
+    async def read_line(self):
+        # input() runs on a daemon thread: the loop stays free to finish
+        # background jobs, and an abandoned read does not hold up exit
+        future = self._pending_input = self.loop.create_future()
+
+        def read():
+            try:
+                line = input(PROMPT)
+            except BaseException as e:
+                self.loop.call_soon_threadsafe(_settle, future, None, e)
+            else:
+                self.loop.call_soon_threadsafe(_settle, future, line, None)
+
+        threading.Thread(target=read, name="termina-input", daemon=True).start()
+        try:
+            return await future
+        finally:
+            self._pending_input = None
+
+    def interrupt(self):
+        # Ctrl+C: cancel the foreground command, or leave the shell at the prompt
+        if self.foreground is not None:
+            self.terminal.write("\n")
+            self.cancel(self.foreground)
+        elif self._pending_input is not None:
+            _settle(self._pending_input, None, KeyboardInterrupt())
+
+    def close(self):
+        self._closing = True
+        if self._pending_input is not None:
+            _settle(self._pending_input, None, None)
+
+    async def run(self):
+        self.loop = asyncio.get_running_loop()
+        try:
+            self.loop.add_signal_handler(signal.SIGINT, self.interrupt)
+        except NotImplementedError:
+            signal.signal(signal.SIGINT, lambda *_: self.loop.call_soon_threadsafe(self.interrupt))
+        while not self._closing:
+            try:
+                line = await self.read_line()
+            except EOFError:
+                print()
+                await asyncio.to_thread(handle_command, "exit")
+                break
+            except KeyboardInterrupt:
+                await asyncio.to_thread(handle_command, "exit")
+                print("\nInterrupted. Exiting Termina. Goodbye!")
+                logger.error("Interrupted by user.")
+                break
+            if line is None:
+                break  # a background command ended the shell
+            command = line.strip().lower()
+            background = command.endswith("&")
+            if background:
+                command = command[:-1].rstrip()
+            try:
+                command = sanitize_input(command)
+            except ValueError as ve:
+                print(f"Invalid input: {ve}")
+                logger.error(f"Invalid input: {ve}")
+                continue
+            job = self.start(command, background)
+            if background:
+                print(f"[{job.number}] {command}")
+            elif not await self.run_foreground(job):
+                break
+
+
+def _settle(future, result, exception):
+    if not future.done():
+        if exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
+
+
+def run_shell():
+    global _shell
+    saved_terminal = None
+    if termios is not None and sys.stdin.isatty():
+        saved_terminal = termios.tcgetattr(sys.stdin.fileno())
+    _shell = Shell()
+    try:
+        asyncio.run(_shell.run())
+    finally:
+        _shell = None
+        if saved_terminal is not None:
+            termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, saved_terminal)
+
+
+def ask(prompt):
+    # input() for a command that asks mid-way (the songs pager). In the shell
+    # a blocking input() would outlive a Ctrl+C and compete with the next
+    # prompt for the line typed, so the read polls stdin instead and sees a
+    # cancel within ASK_POLL_INTERVAL; the shell waits for that.
+    job = _shell.foreground if _shell is not None else None
+    if job is None or job.thread is not threading.current_thread() or not hasattr(select, "poll"):
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    job.prompting = True
+    try:
+        poller = select.poll()
+        poller.register(sys.stdin.fileno(), select.POLLIN)
+        while not poller.poll(ASK_POLL_INTERVAL * 1000):
+            check()
+        line = sys.stdin.readline()
+    finally:
+        job.prompting = False
+    if not line:
+        raise EOFError
+    return line.rstrip("\n")
+
+
+def list_jobs():
+    jobs = sorted(_shell.jobs.values(), key=lambda job: job.number) if _shell is not None else []
+    if not jobs:
+        print("No background commands.")
+        return
+    for job in jobs:
+        print(f"[{job.number}] running  {job.command}")
+
+
+def cancel_job(args=None):
+    if _shell is None:
+        fail("Background commands only exist in the interactive shell.")
+        return
+    number = args[0].lstrip("%") if args else ""
+    job = _shell.jobs.get(int(number)) if number.isdigit() else None
+    if job is None:
+        fail("No such background command. Type 'jobs' to see them.")
+        return
+    # Called from the job's own thread; the shell's state belongs to the loop
+    _shell.loop.call_soon_threadsafe(_shell.cancel, job)
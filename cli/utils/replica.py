@@ -0,0 +1,170 @@
+# Local SQLite replica of the library, used when the backend cannot answer
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from utils.models import SongList, from_payload, to_json
+
+# Song fields stored in their own columns; anything else goes to `extra`
+SONG_COLUMNS = (("title", "title"), ("filePath", "file_path"),
+                ("duration", "duration"), ("artist", "artist"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS songs (
+    position INTEGER PRIMARY KEY,
+    title TEXT,
+    file_path TEXT,
+    duration,
+    artist TEXT,
+    extra TEXT
+);
+CREATE INDEX IF NOT EXISTS songs_title ON songs (title);
+CREATE INDEX IF NOT EXISTS songs_file_path ON songs (file_path);
+CREATE TABLE IF NOT EXISTS snapshots (
+    endpoint TEXT PRIMARY KEY,
+    digest TEXT,
+    payload TEXT,
+    synced_at REAL
+);
+"""
+
+
+def _digest(payload):
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=to_json).encode("utf-8")).hexdigest()
+
+
+def _song_row(position, song):
+    known = [song.get(key) for key, _ in SONG_COLUMNS]
+    extra = {key: value for key, value in song.items() if key not in dict(SONG_COLUMNS)}
+    return (position, *known, json.dumps(extra) if extra else None)
+
+
+def _song_dict(row):
+    song = {key: value for (key, _), value in zip(SONG_COLUMNS, row)}
+    if row[-1]:
+        song.update(json.loads(row[-1]))
+    return song
+
+
+class LibraryReplica:
+    """
+    Last-known copy of the library (and the current song) in a SQLite file.
+
+    Every answer the API client gets for `songs` or `current` is handed to
+    record(), which writes it on a background thread; a songs listing is only
+    rewritten when its content changed, otherwise just its sync time moves.
+    When the backend cannot answer, read() serves the copy together with the
+    time it was last confirmed, so callers can say how stale it is.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._connection = None
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="termina-replica")
+        self._recorded = {}  # endpoint -> payload object last queued
+
+    def _connect(self):
+        # Opened on first use; callers hold self._lock
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.executescript(SCHEMA)
+        return self._connection
+
+    def record(self, endpoint, payload, synced_at=None):
+        # Queue an answer from the backend; returns immediately
+        if endpoint not in ("songs", "current"):
+            return
+        synced_at = time.time() if synced_at is None else synced_at
+        # The cache hands back the same object until it changes, so an
+        # unchanged listing skips the digest as well as the rewrite
+        unchanged = payload is not None and self._recorded.get(endpoint) is payload
+        self._recorded[endpoint] = payload
+        try:
+            self._writer.submit(self._write, endpoint, payload, synced_at, unchanged)
+        except RuntimeError:
+            pass  # closed while the shell exits
+
+    def _write(self, endpoint, payload, synced_at, unchanged):
+        try:
+            digest = None if unchanged else _digest(payload)
+            with self._lock:
+                connection = self._connect()
+                with connection:
+                    stored = connection.execute(
+                        "SELECT digest FROM snapshots WHERE endpoint = ?", (endpoint,)).fetchone()
+                    if stored is not None and (unchanged or stored[0] == digest):
+                        connection.execute("UPDATE snapshots SET synced_at = ? WHERE endpoint = ?",
+                                           (synced_at, endpoint))
+                        return
+                    if endpoint == "songs":
+                        connection.execute("DELETE FROM songs")
+                        connection.executemany(
+                            "INSERT INTO songs VALUES (?, ?, ?, ?, ?, ?)",
+                            (_song_row(position, song) for position, song in enumerate(payload or [])))
+                        stored_payload = None
+                    else:
+                        stored_payload = json.dumps(payload, default=to_json)
+                    connection.execute("INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?)",
+                                       (endpoint, digest, stored_payload, synced_at))
+        except (sqlite3.Error, OSError, TypeError, ValueError, AttributeError):
+            pass  # the replica is best-effort; the live API is unaffected
+
+    def read(self, endpoint):
+        """
+        Return (payload, synced_at) for an endpoint, or None when the replica
+        holds nothing for it.
+        """
+        source = "songs" if endpoint == "list" else endpoint
+        try:
+            with self._lock:
+                connection = self._connect()
+                snapshot = connection.execute(
+                    "SELECT payload, synced_at FROM snapshots WHERE endpoint = ?", (source,)).fetchone()
+                if snapshot is None:
+                    return None
+                if endpoint == "list":
+                    payload = [title for (title,) in connection.execute(
+                        "SELECT title FROM songs ORDER BY position")]
+                elif endpoint == "songs":
+                    payload = SongList.from_dicts([_song_dict(row) for row in connection.execute(
+                        "SELECT title, file_path, duration, artist, extra FROM songs ORDER BY position")])
+                else:
+                    payload = from_payload(endpoint, json.loads(snapshot[0]) if snapshot[0] else None)
+        except (sqlite3.Error, OSError, ValueError):
+            return None
+        return payload, snapshot[1]
+
+    def has(self, endpoint):
+        source = "songs" if endpoint == "list" else endpoint
+        try:
+            with self._lock:
+                return self._connect().execute(
+                    "SELECT 1 FROM snapshots WHERE endpoint = ?", (source,)).fetchone() is not None
+        except (sqlite3.Error, OSError):
+            return False
+
+    def flush(self):
+        # Wait for the writes queued so far
+        self._writer.submit(lambda: None).result()
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+def format_age(seconds):
+    # 42 -> "42s", 300 -> "5m", 7200 -> "2h", 172800 -> "2d"
+    seconds = max(0, int(seconds))
+    for unit, size in (("d", 86400), ("h", 3600), ("m", 60)):
+        if seconds >= size:
+            return f"{seconds // size}{unit}"
+    return f"{seconds}s"
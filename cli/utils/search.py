@@ -0,0 +1,257 @@
+# Client-side search over a library listing: inverted index plus trigram fuzzy matching
+
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from utils.helpers import parse_duration
+from utils.models import SongList
+
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+FIELDS = ("title", "artist")
+FIELD_ALIASES = {"title": "title", "t": "title", "artist": "artist", "a": "artist", "by": "artist"}
+# Query terms: runs of non-space text, where "double quotes" may span spaces.
+# Apostrophes are ordinary characters ("don't stop"); an unclosed quote runs
+# to the end of the query.
+QUERY_TERM = re.compile(r'(?:[^\s"]+|"[^"]*"?)+')
+DURATION_FILTER = re.compile(r"^(?:duration|dur|length|len)(<=|>=|<|>|=)(.+)$")
+
+# Match quality per query word; a fuzzy match also scales with its similarity
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+FUZZY_MIN_SIMILARITY = 0.3  # shared trigrams / all trigrams of the two words
+PREFIX_MAX_TOKENS = 200     # a very short prefix stops expanding after this many words
+
+
+def normalize(text):
+    # Case- and accent-insensitive form used for indexing and for queries
+    text = str(text)
+    if text.isascii():
+        return text.lower()  # nothing to decompose; the common case
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text):
+    return TOKEN_PATTERN.findall(normalize(text)) if text else []
+
+
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _FieldIndex:
+    """Postings, sorted vocabulary and trigram index for one song field."""
+
+    __slots__ = ("postings", "trigram_words", "_vocabulary")
+
+    def __init__(self):
+        self.postings = {}       # word -> ascending positions
+        self.trigram_words = {}  # trigram -> words containing it
+        self._vocabulary = None  # sorted words for prefix lookups, rebuilt after additions
+
+    def add(self, position, words):
+        for word in set(words):
+            positions = self.postings.get(word)
+            if positions is None:
+                self.postings[word] = [position]
+                self._vocabulary = None
+                for trigram in trigrams(word):
+                    self.trigram_words.setdefault(trigram, []).append(word)
+            else:
+                positions.append(position)
+
+    def matches(self, word):
+        # position -> score for one query word: exact, else prefix, else fuzzy
+        scores = {}
+        exact = self.postings.get(word)
+        if exact:
+            scores.update(dict.fromkeys(exact, EXACT_SCORE))
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self.postings)
+        start = bisect_left(self._vocabulary, word)
+        for candidate in self._vocabulary[start:start + PREFIX_MAX_TOKENS]:
+            if not candidate.startswith(word):
+                break
+            if candidate != word:
+                for position in self.postings[candidate]:
+                    scores.setdefault(position, PREFIX_SCORE)
+        if scores:
+            return scores
+        for candidate, similarity in self._similar(word):
+            score = FUZZY_SCORE * similarity
+            for position in self.postings[candidate]:
+                if score > scores.get(position, 0.0):
+                    scores[position] = score
+        return scores
+
+    def _similar(self, word):
+        wanted = trigrams(word)
+        shared = {}
+        for trigram in wanted:
+            for candidate in self.trigram_words.get(trigram, ()):
+                shared[candidate] = shared.get(candidate, 0) + 1
+        for candidate, count in shared.items():
+            similarity = count / (len(wanted) + len(trigrams(candidate)) - count)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                yield candidate, similarity
+
+
+class Query:
+    __slots__ = ("words", "phrases", "duration_filters")
+
+    def __init__(self):
+        self.words = []             # (field or None for any, word)
+        self.phrases = []           # (field or None, words joined by spaces) that must appear in order
+        self.duration_filters = []  # (operator, seconds)
+
+    def __bool__(self):
+        return bool(self.words or self.duration_filters)
+
+
+def parse_query(text):
+    """
+    Parse a `find` query.
+
+    Free words match title or artist; `artist:` / `title:` restrict a word or
+    a quoted phrase to one field; `duration>3:00` (also <, <=, >=, =) filters
+    by length. Raises ValueError for malformed input.
+    """
+    query = Query()
+    for term in (match.replace('"', '') for match in QUERY_TERM.findall(text)):
+        duration = DURATION_FILTER.match(term)
+        if duration:
+            seconds = parse_duration(duration.group(2))
+            if seconds is None:
+                raise ValueError(f"'{duration.group(2)}' is not a duration (use M:SS or seconds)")
+            query.duration_filters.append((duration.group(1), seconds))
+            continue
+        field, separator, value = term.partition(":")
+        if separator and field in FIELD_ALIASES:
+            field = FIELD_ALIASES[field]
+        else:
+            field, value = None, term
+        words = tokenize(value)
+        if not words:
+            continue
+        query.words.extend((field, word) for word in words)
+        if len(words) > 1:
+            query.phrases.append((field, " ".join(words)))
+    return query
+
+
+class SearchIndex:
+    """
+    Inverted index over the title and artist words of a listing.
+
+    Each field keeps word -> positions postings, a sorted vocabulary for
+    prefix matches and a trigram index over that vocabulary, so a misspelt
+    word is matched against the distinct words of the library rather than
+    every song. Songs are added with extend(), which is how a grown listing
+    reuses the index of the one before it.
+    """
+
+    def __init__(self, songs=()):
+        self.songs = SongList()
+        self.fields = {field: _FieldIndex() for field in FIELDS}
+        self._durations = []   # (seconds, position), sorted on first use
+        self._durations_sorted = True
+        self.extend(songs)
+
+    def __len__(self):
+        return len(self.songs)
+
+    def extend(self, songs):
+        songs = SongList.from_dicts(songs if isinstance(songs, (list, SongList)) else list(songs))
+        start = len(self.songs)
+        self.songs.extend(songs)
+        # Column by column, without building a Song per track
+        for field, column in zip(FIELDS, (songs.titles, songs.artists)):
+            index = self.fields[field]
+            for position, value in enumerate(column, start):
+                index.add(position, tokenize(value))
+        for position, duration in enumerate(songs.durations, start):
+            seconds = parse_duration(duration or "")
+            if seconds is not None:
+                self._durations.append((seconds, position))
+                self._durations_sorted = False
+
+    def search(self, query, limit=None):
+        """
+        Find the songs matching every part of `query`.
+
+        Returns (number of matches, [(position, song)] for the best `limit`
+        of them, best first and then in library order).
+        """
+        scores = None
+        for field, word in query.words:
+            matched = self._word_matches(field, word)
+            if scores is None:
+                scores = matched
+            else:
+                scores = {position: score + matched[position]
+                          for position, score in scores.items() if position in matched}
+            if not scores:
+                return 0, []
+        for operator, seconds in query.duration_filters:
+            allowed = self._duration_positions(operator, seconds)
+            if scores is None:
+                scores = dict.fromkeys(allowed, 0.0)
+            else:
+                scores = {position: score for position, score in scores.items() if position in allowed}
+        if scores is None:
+            return 0, []
+        for field, phrase in query.phrases:
+            # Whole words in sequence; only the songs left after the word
+            # matches are re-tokenized
+            fields = FIELDS if field is None else (field,)
+            phrase = f" {phrase} "
+            scores = {position: score for position, score in scores.items()
+                      if any(phrase in f" {' '.join(tokenize(self.songs[position].get(name)))} " for name in fields)}
+        rank = lambda position: (-scores[position], position)
+        ranked = sorted(scores, key=rank) if limit is None else heapq.nsmallest(limit, scores, key=rank)
+        return len(scores), [(position, self.songs[position]) for position in ranked]
+
+    def _word_matches(self, field, word):
+        if field is not None:
+            return self.fields[field].matches(word)
+        # Any field: the better score per song
+        combined = {}
+        for index in self.fields.values():
+            for position, score in index.matches(word).items():
+                if score > combined.get(position, 0.0):
+                    combined[position] = score
+        return combined
+
+    def _duration_positions(self, operator, seconds):
+        if not self._durations_sorted:
+            self._durations.sort()
+            self._durations_sorted = True
+        durations = self._durations
+        # Durations are whole seconds: [low, high) holds exactly `seconds`
+        low = bisect_left(durations, (seconds, -1))
+        high = bisect_left(durations, (seconds + 1, -1))
+        start, stop = {"<": (0, low), "<=": (0, high), ">": (high, None),
+                       ">=": (low, None), "=": (low, high)}[operator]
+        return {position for _, position in durations[start:stop]}
+
+
+# The index for the most recent listing. A listing that only grew at the end
+# (new songs appended) extends it instead of rebuilding from scratch.
+_recent = None
+
+def search_index_for(listing):
+    global _recent
+    if _recent is not None:
+        source, index = _recent
+        if source is listing:
+            return index
+        if len(index) <= len(listing) and listing[:len(index)] == index.songs:
+            index.extend(listing[len(index):])
+            _recent = (listing, index)
+            return index
+    index = SearchIndex(listing)
+    _recent = (listing, index)
+    return index
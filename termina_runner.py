@@ -18,23 +18,35 @@ License: MIT
 Version: 2.0.0
 """
 
+import argparse
 import subprocess
 import os
+import socket
+import tempfile
+import threading
 import time
+from dataclasses import dataclass
 import requests
 import psutil
 import platform
+import shutil
+import sys
 import ctypes
 from ctypes import wintypes
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
 
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
 
-REPO_ROOT = r"C:\SYS00-Desktop\Development\termina"
-BACKEND_DIR = os.path.join(REPO_ROOT, "backend", "MusicShellApi")
-CLI_DIR = os.path.join(REPO_ROOT, "cli")
+# Settings are shared with the CLI (cli/utils/config.py): a JSON config file,
+# TERMINA_* environment variables and --set flags override the defaults below,
+# e.g. --set backend_port=5050 or TERMINA_REPO_ROOT=/srv/termina
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli"))
+from utils.config import ConfigError, add_config_arguments, apply_overrides, child_environment
+
+REPO_ROOT = os.path.dirname(os.path.abspath(__file__))
 
 # Windows Console API Constants
 STD_OUTPUT_HANDLE = -11
@@ -45,35 +57,307 @@ CLI_COLS = 170
 CLI_ROWS = 50
 
 # API Health Check
-BACKEND_API_ENDPOINT = "http://localhost:5000/api/music/list"
-BACKEND_STARTUP_TIMEOUT = 30  # seconds
+BACKEND_HOST = "localhost"
+BACKEND_PORT = 5000
+# Cheap probe: answers 200 or 404 (nothing playing) without enumerating the library
+BACKEND_PROBE_PATH = "/api/music/current"
+BACKEND_STARTUP_TIMEOUT = 30.0  # seconds
+
+# Readiness polling: exponential backoff while the port is closed (dotnet is
+# still building/booting), then fast HTTP probes once it accepts connections
+READINESS_INITIAL_DELAY = 0.05  # seconds
+READINESS_MAX_DELAY = 0.25  # seconds
+READINESS_BACKOFF = 2.0
+READINESS_FAST_INTERVAL = 0.05  # seconds
+READINESS_PROBE_TIMEOUT = 1.0  # seconds
+
+# The CLI is started while the backend boots; it shows its banner and then
+# waits for this file (named in the environment variable) before prompting
+CLI_READY_ENV = "TERMINA_READY_FILE"
 
+# Supervisor mode
+SUPERVISOR_INTERVAL = 1.0  # seconds between health/resource samples
+SUPERVISOR_REPORT_INTERVAL = 0.0  # seconds between status tables; 0 = events only
+RESTART_BACKOFF_INITIAL = 1.0  # seconds before the first restart
+RESTART_BACKOFF_MAX = 30.0  # seconds
+RESTART_STABLE_AFTER = 60.0  # a process that ran this long gets its backoff reset
+BACKEND_MAX_RSS_MB = 1024  # per backend process tree
+CLI_MAX_RSS_MB = 512
+
+# Shutdown
+SHUTDOWN_GRACE_PERIOD = 5.0  # seconds between SIGTERM and SIGKILL
+SHUTDOWN_KILL_TIMEOUT = 2.0  # seconds to wait after SIGKILL
+SHUTDOWN_POLL_INTERVAL = 0.05  # seconds per wait_procs round
+
+try:
+    apply_overrides(globals())
+except ConfigError as config_error:
+    sys.exit(f"Configuration error: {config_error}")
+
+BACKEND_DIR = os.path.join(REPO_ROOT, "backend", "MusicShellApi")
+CLI_DIR = os.path.join(REPO_ROOT, "cli")
 
-def wait_for_backend(timeout: int = BACKEND_STARTUP_TIMEOUT) -> bool:
+
+@dataclass
+class ReadinessReport:
+    """Outcome and measured timings of a readiness check."""
+    ready: bool
+    elapsed: float  # seconds until ready (or until giving up)
+    tcp_open_after: Optional[float] = None  # seconds until the port accepted a connection
+    probes: int = 0  # HTTP probes sent
+    reason: str = ""
+
+
+def tcp_port_open(host: str, port: int, timeout: float = READINESS_PROBE_TIMEOUT) -> bool:
     """
-    Poll backend API health endpoint until responsive or timeout.
-    
+    Check whether a TCP connection to host:port can be established.
+
+    Args:
+        host: Host name or address
+        port: TCP port
+        timeout: Connect timeout in seconds
+
+    Returns:
+        True if the connection was accepted
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def check_readiness(host: str = BACKEND_HOST, port: int = BACKEND_PORT,
+                    probe_path: str = BACKEND_PROBE_PATH,
+                    timeout: float = BACKEND_STARTUP_TIMEOUT,
+                    proc: Optional[subprocess.Popen] = None) -> ReadinessReport:
+    """
+    Wait until the backend answers HTTP on its probe path.
+
+    Phase 1 retries a plain TCP connect with exponential backoff, which costs
+    the backend nothing while it is still starting. Phase 2 sends HTTP probes
+    at a short fixed interval over one keep-alive session. Any response below
+    500 counts as ready, since 404 is the normal answer of /current when
+    nothing is playing.
+
+    Args:
+        host: Backend host
+        port: Backend port
+        probe_path: Path probed once the port is open
+        timeout: Maximum seconds to wait
+        proc: Backend process; if it exits, waiting stops immediately
+
+    Returns:
+        ReadinessReport with the measured timings
+    """
+    start = time.perf_counter()
+    deadline = start + timeout
+    report = ReadinessReport(ready=False, elapsed=0.0)
+
+    def exited() -> bool:
+        return proc is not None and proc.poll() is not None
+
+    # Phase 1: wait for the port
+    delay = READINESS_INITIAL_DELAY
+    while not tcp_port_open(host, port):
+        if exited():
+            report.reason = f"backend process exited with code {proc.returncode}"
+            report.elapsed = time.perf_counter() - start
+            return report
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            report.reason = f"port {port} not open after {timeout}s"
+            report.elapsed = time.perf_counter() - start
+            return report
+        time.sleep(min(delay, remaining))
+        delay = min(delay * READINESS_BACKOFF, READINESS_MAX_DELAY)
+    report.tcp_open_after = time.perf_counter() - start
+
+    # Phase 2: fast HTTP probes on a reused connection
+    url = f"http://{host}:{port}{probe_path}"
+    with requests.Session() as session:
+        while True:
+            report.probes += 1
+            try:
+                response = session.get(url, timeout=READINESS_PROBE_TIMEOUT)
+                if response.status_code < 500:
+                    report.ready = True
+                    break
+            except requests.RequestException:
+                pass  # Kestrel may accept connections before the app is ready
+            if exited():
+                report.reason = f"backend process exited with code {proc.returncode}"
+                break
+            if time.perf_counter() + READINESS_FAST_INTERVAL >= deadline:
+                report.reason = f"no healthy response from {url} after {timeout}s"
+                break
+            time.sleep(READINESS_FAST_INTERVAL)
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def wait_for_backend(timeout: float = BACKEND_STARTUP_TIMEOUT,
+                     proc: Optional[subprocess.Popen] = None,
+                     port: int = BACKEND_PORT) -> bool:
+    """
+    Wait for the backend API and report how long it took.
+
     Args:
         timeout: Maximum seconds to wait for backend startup
-        
+        proc: Backend process, to stop waiting early if it exits
+        port: Backend port
+
     Returns:
-        True if backend API responds 200 OK, False on timeout
+        True if the backend became ready, False otherwise
     """
-    print("Waiting for backend API (http://localhost:5000)...")
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
+    print(f"Waiting for backend API (http://{BACKEND_HOST}:{port})...")
+    report = check_readiness(port=port, timeout=timeout, proc=proc)
+    if report.ready:
+        print(f"Backend ready in {report.elapsed:.2f}s "
+              f"(port open after {report.tcp_open_after:.2f}s, {report.probes} HTTP probe(s))")
+    else:
+        print(f"Backend not ready after {report.elapsed:.2f}s: {report.reason}")
+    return report.ready
+
+
+def signal_cli_ready(ready_file: str, ready: bool) -> None:
+    """
+    Release a CLI that is waiting for the backend.
+
+    Args:
+        ready_file: Path handed to the CLI through CLI_READY_ENV
+        ready: Whether the backend came up; the CLI warns if not
+    """
+    temp_path = f"{ready_file}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as handle:
+        handle.write("ready" if ready else "unavailable")
+    os.replace(temp_path, ready_file)  # the CLI never sees a half-written file
+
+
+@dataclass
+class ExitRecord:
+    """How and when one process ended during shutdown."""
+    pid: int
+    name: str
+    outcome: str  # "terminated", "killed", "already gone" or "survived"
+    seconds: float  # time from the start of shutdown until the exit was seen
+    returncode: Optional[int] = None
+
+
+def _await_exit(procs: List[psutil.Process], timeout: float,
+                on_exit: Callable[[psutil.Process], None]) -> List[psutil.Process]:
+    """
+    psutil.wait_procs in short rounds, also counting zombies as exited.
+
+    An orphaned grandchild stays a zombie until init reaps it, which
+    wait_procs would report as still running until the deadline.
+
+    Returns:
+        Processes still running at the deadline
+    """
+    deadline = time.monotonic() + timeout
+    alive = procs
+    while alive:
+        remaining = deadline - time.monotonic()
+        _, alive = psutil.wait_procs(alive, timeout=max(0.0, min(SHUTDOWN_POLL_INTERVAL, remaining)),
+                                     callback=on_exit)
+        running = []
+        for proc in alive:
+            try:
+                if proc.status() != psutil.STATUS_ZOMBIE:
+                    running.append(proc)
+                    continue
+            except psutil.NoSuchProcess:
+                pass
+            on_exit(proc)
+        alive = running
+        if remaining <= 0:
+            break
+    return alive
+
+
+def shutdown_process_trees(pids: List[int], grace_period: float = SHUTDOWN_GRACE_PERIOD,
+                           kill_timeout: float = SHUTDOWN_KILL_TIMEOUT,
+                           verbose: bool = True) -> List[ExitRecord]:
+    """
+    Stop several process trees at once: terminate everything, then kill stragglers.
+
+    Every process in every tree is sent SIGTERM (TerminateProcess on Windows)
+    in one pass, and all of them are awaited together with psutil.wait_procs,
+    so the total time is bounded by grace_period + kill_timeout however many
+    processes there are. Only processes still alive at the deadline are
+    killed.
+
+    Args:
+        pids: Root PIDs of the trees to stop
+        grace_period: Seconds to wait for processes to exit after SIGTERM
+        kill_timeout: Seconds to wait for processes to exit after SIGKILL
+        verbose: Print a line per process and a summary
+
+    Returns:
+        One ExitRecord per process that was found
+    """
+    start = time.monotonic()
+    records: Dict[int, ExitRecord] = {}
+    procs: List[psutil.Process] = []
+    names: Dict[int, str] = {}
+
+    # Snapshot every tree before signalling, as children are reparented once
+    # their parent exits and could no longer be found
+    for pid in pids:
         try:
-            response = requests.get(BACKEND_API_ENDPOINT, timeout=1)
-            if response.status_code == 200:
-                print("Backend ready!")
-                return True
-        except requests.RequestException:
-            pass  # Network/timeout errors expected during startup
-        time.sleep(0.5)
-    
-    print(f"Backend startup timeout after {timeout}s")
-    return False
+            root = psutil.Process(pid)
+            members = root.children(recursive=True) + [root]
+        except psutil.NoSuchProcess:
+            continue
+        for member in members:
+            if member.pid in names:
+                continue
+            try:
+                names[member.pid] = member.name()
+            except psutil.Error:
+                names[member.pid] = "?"
+            procs.append(member)
+
+    def exited(outcome: str) -> Callable[[psutil.Process], None]:
+        def record(proc: psutil.Process) -> None:
+            records[proc.pid] = ExitRecord(proc.pid, names[proc.pid], outcome,
+                                           time.monotonic() - start, getattr(proc, "returncode", None))
+        return record
+
+    signalled = []
+    for proc in procs:
+        try:
+            proc.terminate()
+            signalled.append(proc)
+        except psutil.NoSuchProcess:
+            records[proc.pid] = ExitRecord(proc.pid, names[proc.pid], "already gone", 0.0)
+        except psutil.Error as e:
+            print(f"Failed to terminate PID {proc.pid}: {e}")
+            signalled.append(proc)  # still awaited, and killed if it stays
+
+    alive = _await_exit(signalled, grace_period, exited("terminated"))
+    if alive:
+        for proc in alive:
+            try:
+                proc.kill()
+            except psutil.NoSuchProcess:
+                pass
+            except psutil.Error as e:
+                print(f"Failed to kill PID {proc.pid}: {e}")
+        alive = _await_exit(alive, kill_timeout, exited("killed"))
+        for proc in alive:
+            records[proc.pid] = ExitRecord(proc.pid, names[proc.pid], "survived", time.monotonic() - start)
+
+    ordered = sorted(records.values(), key=lambda record: record.seconds)
+    if verbose:
+        for record in ordered:
+            code = "" if record.returncode is None else f", exit code {record.returncode}"
+            print(f"  PID {record.pid:>7} {record.name:<20} {record.outcome:<12} after {record.seconds:.2f}s{code}")
+        killed = sum(record.outcome == "killed" for record in ordered)
+        print(f"Stopped {len(ordered)} processes in {time.monotonic() - start:.2f}s"
+              f"{f' ({killed} needed SIGKILL)' if killed else ''}")
+    return ordered
 
 
 def kill_process_tree(pid: int) -> None:
@@ -84,29 +368,13 @@ def kill_process_tree(pid: int) -> None:
         pid: Process ID to terminate
         
     Notes:
-        - Uses psutil for recursive child enumeration
-        - Handles NoSuchProcess exceptions gracefully
+        - See shutdown_process_trees; the tree gets SIGTERM and a grace period
+          before any remaining process is killed
         - Windows/Linux/macOS compatible
     """
-    try:
-        parent = psutil.Process(pid)
-        children = parent.children(recursive=True)
-        
-        # Kill children first (bottom-up termination)
-        for child in children:
-            try:
-                child.kill()
-            except psutil.NoSuchProcess:
-                continue  # Process already terminated
-        
-        # Kill parent last
-        parent.kill()
+    records = shutdown_process_trees([pid], verbose=False)
+    if records:
         print(f"Terminated process tree: PID {pid}")
-        
-    except psutil.NoSuchProcess:
-        pass  # Process already gone
-    except Exception as e:
-        print(f"Failed to terminate PID {pid}: {e}")
 
 
 def resize_windows_console(pid: int, cols: int = CLI_COLS, rows: int = CLI_ROWS) -> bool:
@@ -156,46 +424,73 @@ def resize_windows_console(pid: int, cols: int = CLI_COLS, rows: int = CLI_ROWS)
         return False
 
 
-def launch_backend() -> Optional[subprocess.Popen]:
+def launch_backend(port: int = BACKEND_PORT, build: bool = True,
+                   supervised: bool = False) -> Optional[subprocess.Popen]:
     """
     Platform-aware backend launcher.
     
+    Args:
+        port: Port the backend listens on
+        build: Build before running; instances started while another one is
+            running use the existing build, since the build output is in use
+        supervised: Close the Windows console when the backend exits, so the
+            supervisor sees the exit (cmd /k would keep the process alive)
+
     Returns:
         Popen process object or None on failure
     """
     system = platform.system().lower()
+    run = f"dotnet run{'' if build else ' --no-build'} -- --urls http://{BACKEND_HOST}:{port}"
     
     if system == "windows":
         return subprocess.Popen([
-            "cmd", "/k", 
-            f"cd /d {BACKEND_DIR} && echo Starting Termina Backend... && dotnet run"
+            "cmd", "/c" if supervised else "/k", 
+            f"cd /d {BACKEND_DIR} && echo Starting Termina Backend on port {port}... && {run}"
         ], creationflags=subprocess.CREATE_NEW_CONSOLE)
     else:  # Linux/macOS
         return subprocess.Popen([
             "bash", "-c", 
-            f"cd '{BACKEND_DIR}' && echo 'Starting Termina Backend...' && dotnet run"
+            f"cd '{BACKEND_DIR}' && echo 'Starting Termina Backend on port {port}...' && {run}"
         ])
 
 
-def launch_cli() -> Optional[subprocess.Popen]:
+def launch_cli(ready_file: Optional[str] = None, supervised: bool = False,
+               ports: Optional[List[int]] = None) -> Optional[subprocess.Popen]:
     """
     Platform-aware CLI launcher with automatic window/terminal resize.
     
+    Args:
+        ready_file: If given, the CLI warms up and then waits for this file
+            (see signal_cli_ready) before showing its prompt
+        supervised: Close the Windows console when the CLI exits
+        ports: Ports of the backends the CLI should talk to, primary first
+            (default: BACKEND_PORT)
+
     Returns:
         Popen process object or None on failure
     """
     system = platform.system().lower()
+    env = dict(os.environ)
+    # The runner's settings flags, plus the URLs of the backends it started
+    urls = [f"http://{BACKEND_HOST}:{port}/api/Music" for port in (ports or [BACKEND_PORT])]
+    env.update(child_environment({"api_url": urls[0], "api_urls": urls}))
+    if ready_file:
+        env[CLI_READY_ENV] = ready_file
     
     if system == "windows":
         # Windows: CMD with buffer resize
         proc = subprocess.Popen([
-            "cmd", "/k", 
+            "cmd", "/c" if supervised else "/k", 
             f"mode con: cols={CLI_COLS} lines={CLI_ROWS} && cd /d {CLI_DIR} && echo CLI ready at {CLI_COLS} columns && python termina_cli.py"
-        ], creationflags=subprocess.CREATE_NEW_CONSOLE)
+        ], creationflags=subprocess.CREATE_NEW_CONSOLE, env=env)
         
-        # Attempt physical resize after window creation
-        time.sleep(2)  # Allow window creation
-        resize_windows_console(proc.pid)
+        # Attempt physical resize once the window exists, without holding up
+        # the rest of the startup sequence
+        def resize_later() -> None:
+            time.sleep(2)  # Allow window creation
+            resize_windows_console(proc.pid)
+
+        threading.Thread(target=resize_later, daemon=True).start()
         return proc
         
     else:  # Linux/macOS
@@ -204,17 +499,217 @@ def launch_cli() -> Optional[subprocess.Popen]:
         return subprocess.Popen([
             "bash", "-c", 
             f"echo -e '{resize_seq}' && cd '{CLI_DIR}' && echo 'CLI ready at {CLI_COLS} columns' && python3 termina_cli.py"
-        ])
+        ], env=env)
+
+
+# =============================================================================
+# SUPERVISOR
+# =============================================================================
+
+class ManagedProcess:
+    """
+    A supervised process tree: launched, sampled for CPU/RSS, and restarted
+    with exponential backoff when it exits or outgrows its memory ceiling.
+    """
+
+    def __init__(self, name: str, launch: Callable[[bool], Optional[subprocess.Popen]],
+                 max_rss_mb: float, clean_exit_ends_session: bool = False):
+        """
+        Args:
+            name: Label used in reports
+            launch: Starts the process; receives True when it is a restart
+            max_rss_mb: Memory ceiling for the whole tree, 0 for none
+            clean_exit_ends_session: Exit code 0 means the user is done (the
+                CLI's `exit`), so supervision stops instead of restarting
+        """
+        self.name = name
+        self.launch = launch
+        self.max_rss = max_rss_mb * 1024 * 1024
+        self.clean_exit_ends_session = clean_exit_ends_session
+        self.proc: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = RESTART_BACKOFF_INITIAL
+        self.restart_at: Optional[float] = None
+        self.cpu_percent = 0.0
+        self.rss = 0
+        self.peak_rss = 0
+        # psutil needs the same Process object across samples for cpu_percent
+        self._tracked: Dict[int, psutil.Process] = {}
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.proc.pid if self.proc is not None else None
+
+    def start(self, restart: bool = False) -> None:
+        self.proc = self.launch(restart)
+        self.started_at = time.monotonic()
+        self.restart_at = None
+        self.cpu_percent, self.rss = 0.0, 0
+        self._tracked = {}
+
+    def sample(self) -> None:
+        """Refresh CPU and RSS totals for the process and all its descendants."""
+        try:
+            root = psutil.Process(self.proc.pid)
+            members = [root] + root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            self.cpu_percent, self.rss = 0.0, 0
+            return
+        tracked: Dict[int, psutil.Process] = {}
+        cpu_percent, rss = 0.0, 0
+        for member in members:
+            member = self._tracked.get(member.pid, member)
+            try:
+                cpu_percent += member.cpu_percent(interval=None)  # 0.0 on the first sample
+                rss += member.memory_info().rss
+            except psutil.NoSuchProcess:
+                continue
+            tracked[member.pid] = member
+        self._tracked = tracked
+        self.cpu_percent, self.rss = cpu_percent, rss
+        self.peak_rss = max(self.peak_rss, rss)
+
+    def schedule_restart(self, now: float) -> float:
+        """Pick the restart time; returns the delay in seconds."""
+        if now - self.started_at >= RESTART_STABLE_AFTER:
+            self.backoff = RESTART_BACKOFF_INITIAL
+        delay = self.backoff
+        self.backoff = min(self.backoff * 2, RESTART_BACKOFF_MAX)
+        self.restart_at = now + delay
+        return delay
+
 
+class Supervisor:
+    """
+    Watches managed process trees until interrupted or the session ends.
+
+    Every SUPERVISOR_INTERVAL it restarts processes whose backoff has elapsed,
+    notices exits, samples CPU/RSS per tree, and kills and restarts trees
+    that exceed their memory ceiling.
+    """
+
+    def __init__(self, managed: List[ManagedProcess], report_interval: float = SUPERVISOR_REPORT_INTERVAL):
+        self.managed = managed
+        self.report_interval = report_interval
+
+    def run(self) -> None:
+        last_report = time.monotonic()
+        while True:
+            now = time.monotonic()
+            for item in self.managed:
+                if item.restart_at is not None:
+                    if now >= item.restart_at:
+                        item.restarts += 1
+                        item.start(restart=True)
+                        print(f"[supervisor] {item.name}: restarted (restart #{item.restarts}, PID {item.pid})")
+                    continue
+                code = item.proc.poll()
+                if code is not None:
+                    if code == 0 and item.clean_exit_ends_session:
+                        print(f"[supervisor] {item.name} exited; ending the session")
+                        return
+                    delay = item.schedule_restart(now)
+                    print(f"[supervisor] {item.name}: exited with code {code}, restarting in {delay:.1f}s")
+                    continue
+                item.sample()
+                if item.max_rss and item.rss > item.max_rss:
+                    print(f"[supervisor] {item.name}: RSS {item.rss / 2**20:.0f} MiB over the "
+                          f"{item.max_rss / 2**20:.0f} MiB ceiling, restarting")
+                    kill_process_tree(item.pid)
+                    item.proc.wait()
+                    item.schedule_restart(now)
+            if self.report_interval and now - last_report >= self.report_interval:
+                self.print_report()
+                last_report = now
+            time.sleep(SUPERVISOR_INTERVAL)
+
+    def print_report(self) -> None:
+        print(f"{'process':<16} {'PID':>7} {'CPU %':>7} {'RSS MiB':>8} {'peak MiB':>9} {'restarts':>9}")
+        for item in self.managed:
+            pid = "-" if item.restart_at is not None else item.pid
+            print(f"{item.name:<16} {pid:>7} {item.cpu_percent:>7.1f} {item.rss / 2**20:>8.1f} "
+                  f"{item.peak_rss / 2**20:>9.1f} {item.restarts:>9}")
+
+
+def run_supervisor(backend_count: int = 1, base_port: int = BACKEND_PORT,
+                   backend_max_rss_mb: float = BACKEND_MAX_RSS_MB,
+                   cli_max_rss_mb: float = CLI_MAX_RSS_MB,
+                   report_interval: float = SUPERVISOR_REPORT_INTERVAL) -> None:
+    """
+    Start N backends and the CLI and keep them running until Ctrl+C or `exit`.
+
+    Backends listen on consecutive ports from base_port. The CLI sends
+    mutating calls to the first one and spreads reads over all of them. Only the first backend builds the project, and the others are
+    started once it is ready.
+
+    Args:
+        backend_count: Number of backend instances
+        base_port: Port of the first backend
+        backend_max_rss_mb: Memory ceiling per backend tree (0 for none)
+        cli_max_rss_mb: Memory ceiling for the CLI tree (0 for none)
+        report_interval: Seconds between status tables (0 for events only)
+    """
+    print("Termina Cross-Platform Runner v2.0.0 - SUPERVISOR MODE")
+    print(f"Detected OS: {platform.system()} {platform.release()}")
+    print("-" * 60)
+
+    ready_dir = tempfile.mkdtemp(prefix="termina-")
+    ready_file = os.path.join(ready_dir, "backend.ready")
+    ports = [base_port + i for i in range(backend_count)]
+
+    def backend_launcher(port: int, build_first: bool) -> Callable[[bool], Optional[subprocess.Popen]]:
+        return lambda restart: launch_backend(port, build=build_first and not restart, supervised=True)
+
+    backends = [ManagedProcess(f"backend:{port}", backend_launcher(port, i == 0), backend_max_rss_mb)
+                for i, port in enumerate(ports)]
+    cli = ManagedProcess("cli", lambda restart: launch_cli(None if restart else ready_file, supervised=True,
+                                                          ports=ports),
+                         cli_max_rss_mb, clean_exit_ends_session=True)
+    started: List[ManagedProcess] = []
 
-def main() -> None:
+    try:
+        backends[0].start()
+        started.append(backends[0])
+        cli.start()
+        started.append(cli)
+        ready = wait_for_backend(proc=backends[0].proc, port=ports[0])
+        signal_cli_ready(ready_file, ready)
+
+        if len(backends) > 1:
+            for backend in backends[1:]:
+                backend.start()
+                started.append(backend)
+            with ThreadPoolExecutor(max_workers=len(backends) - 1) as pool:
+                reports = list(pool.map(lambda port, backend: check_readiness(port=port, proc=backend.proc),
+                                        ports[1:], backends[1:]))
+            for backend, report in zip(backends[1:], reports):
+                status = f"ready in {report.elapsed:.2f}s" if report.ready else f"not ready: {report.reason}"
+                print(f"{backend.name}: {status}")
+
+        print(f"Supervising {len(started)} process trees (Ctrl+C to stop)...")
+        supervisor = Supervisor(started, report_interval)
+        supervisor.run()
+
+    finally:
+        print("\nShutting down supervised processes...")
+        shutdown_process_trees([item.pid for item in started
+                                if item.proc is not None and item.restart_at is None])
+        shutil.rmtree(ready_dir, ignore_errors=True)
+        if started:
+            Supervisor(started).print_report()
+        print("Termina shutdown complete.")
+
+
+def run_launcher() -> None:
     """
     Main orchestrator for Termina multi-process startup.
     
     Startup Sequence:
     1. Launch backend API in separate window/process
-    2. Poll /api/music/list until responsive
-    3. Launch CLI with platform-specific window sizing
+    2. Launch CLI with platform-specific window sizing; it warms up (imports,
+       banner) and holds its prompt until the backend is ready
+    3. Wait for the backend port, then probe it over HTTP, and release the CLI
     4. Wait for user interrupt
     5. Graceful process tree termination
     """
@@ -224,6 +719,8 @@ def main() -> None:
     print("-" * 60)
     
     pids_to_kill: List[int] = []
+    ready_dir = tempfile.mkdtemp(prefix="termina-")
+    ready_file = os.path.join(ready_dir, "backend.ready")
     
     try:
         # Phase 1: Backend startup
@@ -234,24 +731,26 @@ def main() -> None:
             return
         pids_to_kill.append(backend_proc.pid)
         
-        # Phase 2: Backend health check
-        print("2/3 PHASE 2: Health checking backend...")
-        if not wait_for_backend():
-            print("ERROR: Backend failed to become responsive")
-            return
-        
-        # Phase 3: CLI startup
-        print("3/3 PHASE 3: Starting CLI...")
-        cli_proc = launch_cli()
+        # Phase 2: CLI startup, overlapped with the backend boot
+        print("2/3 PHASE 2: Starting CLI (warming up while the backend boots)...")
+        cli_proc = launch_cli(ready_file)
         if not cli_proc:
             print("ERROR: CLI launch failed")
             return
         pids_to_kill.append(cli_proc.pid)
         
+        # Phase 3: Backend health check
+        print("3/3 PHASE 3: Health checking backend...")
+        ready = wait_for_backend(proc=backend_proc)
+        signal_cli_ready(ready_file, ready)
+        if not ready:
+            print("ERROR: Backend failed to become responsive")
+            return
+        
         print("\n" + "="*60)
         print("TERMINA READY - LAUNCHER MODE")
         print("="*60)
-        print(f"• Backend: http://localhost:5000 ✓")
+        print(f"• Backend: http://{BACKEND_HOST}:{BACKEND_PORT} ✓")
         print(f"• CLI:    {CLI_COLS} columns x {CLI_ROWS} rows ✓")
         print(f"• PIDs:   {', '.join(map(str, pids_to_kill))} ✓")
         print("="*60)
@@ -263,13 +762,42 @@ def main() -> None:
     finally:
         # Phase 4: Graceful shutdown
         print("\nPHASE 4: Graceful shutdown initiated...")
-        for i, pid in enumerate(pids_to_kill, 1):
-            print(f"Terminating PID {pid} ({i}/{len(pids_to_kill)})...")
-            kill_process_tree(pid)
+        print(f"Terminating PIDs {', '.join(map(str, pids_to_kill))} and their children...")
+        shutdown_process_trees(pids_to_kill)
+        shutil.rmtree(ready_dir, ignore_errors=True)
         
         print("Termina shutdown complete.")
 
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Launch the Termina backend and CLI.")
+    parser.add_argument("--supervise", action="store_true",
+                        help="keep the processes under watch and restart them when they fail")
+    parser.add_argument("--backends", type=int, default=1, metavar="N",
+                        help="supervisor mode: number of backend instances (default: 1)")
+    parser.add_argument("--base-port", type=int, default=BACKEND_PORT,
+                        help=f"supervisor mode: port of the first backend (default: {BACKEND_PORT})")
+    parser.add_argument("--backend-max-rss", type=float, default=BACKEND_MAX_RSS_MB, metavar="MB",
+                        help=f"supervisor mode: memory ceiling per backend (default: {BACKEND_MAX_RSS_MB}, 0 = none)")
+    parser.add_argument("--cli-max-rss", type=float, default=CLI_MAX_RSS_MB, metavar="MB",
+                        help=f"supervisor mode: memory ceiling for the CLI (default: {CLI_MAX_RSS_MB}, 0 = none)")
+    parser.add_argument("--report-interval", type=float, default=SUPERVISOR_REPORT_INTERVAL, metavar="S",
+                        help="supervisor mode: seconds between status tables (default: events only)")
+    add_config_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Dispatch to launcher mode (default) or supervisor mode."""
+    args = parse_args(argv)
+    if args.supervise:
+        run_supervisor(backend_count=max(1, args.backends), base_port=args.base_port,
+                       backend_max_rss_mb=args.backend_max_rss, cli_max_rss_mb=args.cli_max_rss,
+                       report_interval=args.report_interval)
+    else:
+        run_launcher()
+
+
 if __name__ == "__main__":
     """
     Entry point with exception handling for production reliability.